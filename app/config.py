@@ -4,21 +4,62 @@ from functools import lru_cache
 
 class Settings(BaseSettings):
     # MongoDB Settings
-    MONGODB_URL: str
-    MONGODB_DB_NAME: str
+    MONGODB_URL: Optional[str] = None
+    MONGODB_DB_NAME: Optional[str] = None
 
     # JWT Settings
-    JWT_SECRET_KEY: str
+    JWT_SECRET_KEY: Optional[str] = None
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
+    JWT_ACCEPT_LEGACY_TOKENS: bool = True  # Turn off once pre-compact tokens have expired
+    BCRYPT_ROUNDS: int = 12  # Calibrate with benchmarks/bcrypt_cost.py; hashes are migrated on sign-in
+    BULK_PROVISION_MAX_ROWS: int = 10000
+    PROFILE_CACHE_TTL_SECONDS: float = 30.0
+    PROFILE_CACHE_MAX_ENTRIES: int = 10000
+    REVOCATION_POLL_SECONDS: float = 5.0  # How quickly other workers see a sign-out
+    BULK_HASH_CHUNK_SIZE: int = 16  # Passwords per process-pool task
+
+    # Sign-in Admission Control
+    SIGNIN_IP_LIMIT: int = 30  # Attempts per client IP per window
+    SIGNIN_EMAIL_LIMIT: int = 10  # Attempts per email per window
+    SIGNIN_WINDOW_SECONDS: float = 60.0
+    SIGNIN_MAX_CONCURRENT_VERIFICATIONS: Optional[int] = None  # Defaults to the CPU count
+    SIGNIN_MAX_QUEUED_VERIFICATIONS: int = 64
+    SIGNIN_QUEUE_TIMEOUT_SECONDS: float = 2.0
+    SIGNIN_TRUST_FORWARDED_FOR: bool = False  # Key on X-Forwarded-For behind a trusted proxy
+
+    # Company Settings
+    COMPANY_BATCH_GET_MAX_IDS: int = 500
+    COMPANY_BULK_MAX_IDS: int = 10000
+    COMPANY_BULK_CHUNK_SIZE: int = 1000  # Documents per update_many/delete_many call
+    COMPANY_FACET_REBUILD_SECONDS: float = 3600.0  # Full recount of the facet rollup to fix drift
+
+    # Batch API Settings
+    BATCH_MAX_OPERATIONS: int = 50
 
     # Email Settings
-    FROM_EMAIL_ID: str
-    POSTMARK_SERVER_API_TOKEN: str
+    FROM_EMAIL_ID: Optional[str] = None
+    POSTMARK_SERVER_API_TOKEN: Optional[str] = None
 
     # Azure Storage Settings
     AZURE_STORAGE_CONNECTION_STRING: Optional[str] = None
     AZURE_CONTAINER_NAME: Optional[str] = None
+    AZURE_MAX_CONNECTIONS: int = 64
+    AZURE_MAX_CONCURRENT_OPERATIONS: int = 32
+    AZURE_BLOCK_SIZE: int = 4 * 1024 * 1024  # 4 MB blocks
+    AZURE_UPLOAD_CONCURRENCY: int = 4  # Blocks in flight per upload
+    AZURE_DELETE_CONCURRENCY: int = 4  # Batch delete requests in flight per folder clear
+    COPY_POLL_INITIAL_SECONDS: float = 0.5
+    COPY_POLL_MAX_SECONDS: float = 10.0
+    COPY_TIMEOUT_SECONDS: float = 300.0  # Copies still pending after this are aborted
+    COPY_JOB_HISTORY_SIZE: int = 500
+
+    # File Storage Settings
+    STORAGE_BACKEND: Optional[str] = None  # "azure" or "local"; defaults to azure when configured
+    STORAGE_LOCAL_ROOT: str = "storage"
+    STORAGE_PUBLIC_BASE_URL: str = ""
+    STORAGE_FSYNC_BATCH_MS: int = 5
+    PROFILE_PICTURE_MAX_BYTES: int = 5 * 1024 * 1024
 
     # CORS Settings
     CORS_ORIGINS: str = "*"
@@ -27,7 +68,29 @@ class Settings(BaseSettings):
     
     # Image Processing Settings
     IMG_MAX_EDGE: int = 1024
+    IMG_THUMBNAIL_SIZES: str = "64,128,256"
+    IMG_MAX_PIXELS: int = 40_000_000  # Decompression bomb guard
     CACHE_DIR: str = "cache"
+    CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    PROCESS_POOL_WORKERS: Optional[int] = None  # Defaults to the CPU count
+
+    # Logging Settings
+    LOG_LEVEL: str = "INFO"
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_SAMPLED_LOGGERS: str = "app.middleware.JWTVerification,app.middleware.GlobalErrorHandling"
+    LOG_SAMPLE_BURST: int = 20
+    LOG_SAMPLE_WINDOW_SECONDS: float = 10.0
+    LOG_SAMPLE_RATE: int = 100
+
+    # Diagnostics Settings
+    DEBUG: bool = False
+    LOOP_MONITOR_ENABLED: bool = False
+    LOOP_SLOW_CALLBACK_MS: int = 100
+    LOOP_MONITOR_MAX_SITES: int = 200
+    PROFILING_ENABLED: bool = True
+    PROFILE_MIN_INTERVAL_SECONDS: float = 10.0
+    PROFILE_HISTORY_SIZE: int = 20
+    TRACEMALLOC_MAX_SNAPSHOTS: int = 5
 
     class Config:
         env_file = ".env"
@@ -1,16 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import csv
+import io
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import JSONResponse
 from pydantic import ValidationError
-from app.middleware.JWTVerification import jwt_validator
+from app.middleware.JWTVerification import admin_validator, jwt_validator
 from app.schemas.User import UpdateUserSchema
 from app.schemas.ServerResponse import ServerResponse
 from app.schemas.User import GetUserSchema, UserSchema, CreateUserSchema, AdminUpdateUserSchema, AdminCreateUserSchema
 from app.helpers.Utilities import Utils
-from app.dependencies import get_auth_service
+from app.config import get_settings
+from app.helpers.DbMetrics import DbRoundTripBudget
+from app.helpers.AdmissionControl import AdmissionRejected
+from app.dependencies import get_auth_service, get_signin_admission
 
 router = APIRouter(prefix="/api/v1/auth", tags=["Auth"])
+
+
+def client_ip(request: Request) -> str:
+    if get_settings().SIGNIN_TRUST_FORWARDED_FOR:
+        forwarded_for = request.headers.get("x-forwarded-for")
+        if forwarded_for:
+            return forwarded_for.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
     
-@router.post("/signup", response_model=ServerResponse, status_code=201)
+@router.post("/signup", response_model=ServerResponse, status_code=201, dependencies=[Depends(DbRoundTripBudget(1))])
 async def signup(user_data: CreateUserSchema, auth_service = Depends(get_auth_service)):
     try:
         data = await auth_service.signup(user_data)
@@ -19,32 +33,100 @@ async def signup(user_data: CreateUserSchema, auth_service = Depends(get_auth_se
         raise HTTPException(status_code=400, detail={"data": None, "error":str(e),"success": False})
 
     
-@router.post("/signin", response_model=ServerResponse)
-async def signin_user(body: GetUserSchema, service = Depends(get_auth_service)):
+@router.post("/signin", response_model=ServerResponse, dependencies=[Depends(DbRoundTripBudget(2))])
+async def signin_user(
+    body: GetUserSchema,
+    request: Request,
+    service = Depends(get_auth_service),
+    admission = Depends(get_signin_admission)
+):
     try:
+        # Shed over-limit clients before the user lookup and password hash
+        admission.admit(client_ip(request), body.email)
         data = await service.get_user(body.email, body.password)
         return Utils.create_response(data["data"],data["success"],data.get("error", "") )
+    except AdmissionRejected as e:
+        return JSONResponse(
+            status_code=e.status_code,
+            content={"data": None, "error": str(e), "success": False},
+            headers={"Retry-After": str(e.retry_after)}
+        )
     except Exception as e:
         return JSONResponse(status_code=400, content={"data":None, "error":str(e), "success":False}) 
 
 
-@router.get("/users/get-all-users", response_model=ServerResponse)
+@router.post("/signout", response_model=ServerResponse, dependencies=[Depends(DbRoundTripBudget(2))])
+async def signout_user(service = Depends(get_auth_service), jwt_payload: dict = Depends(jwt_validator)):
+    try:
+        data = await service.signout(jwt_payload)
+        if not data["success"]:
+            raise HTTPException(
+                status_code=400,
+                detail={"data": None, "error": data.get("error"), "success": False}
+            )
+        return Utils.create_response(data["data"], data["success"], data.get("error", ""))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail={"data": None, "error": str(e), "success": False})
+
+
+@router.post("/revoke-all", response_model=ServerResponse, dependencies=[Depends(DbRoundTripBudget(3))])
+async def revoke_all_tokens(service = Depends(get_auth_service), jwt_payload: dict = Depends(jwt_validator)):
+    """
+    Sign out everywhere: revoke every token issued to the caller so far
+    """
+    try:
+        data = await service.revoke_user_tokens(str(jwt_payload.get("id")))
+        if not data["success"]:
+            status_code = 404 if data.get("error") == "User not found" else 400
+            raise HTTPException(
+                status_code=status_code,
+                detail={"data": None, "error": data.get("error"), "success": False}
+            )
+        return Utils.create_response(data["data"], data["success"], data.get("error", ""))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail={"data": None, "error": str(e), "success": False})
+
+
+@router.post("/admin/users/{user_id}/revoke-tokens", response_model=ServerResponse, dependencies=[Depends(DbRoundTripBudget(3))])
+async def revoke_user_tokens(user_id: str, service = Depends(get_auth_service), jwt_payload: dict = Depends(admin_validator)):
+    try:
+        data = await service.revoke_user_tokens(user_id)
+        if not data["success"]:
+            status_code = 404 if data.get("error") == "User not found" else 400
+            raise HTTPException(
+                status_code=status_code,
+                detail={"data": None, "error": data.get("error"), "success": False}
+            )
+        return Utils.create_response(data["data"], data["success"], data.get("error", ""))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail={"data": None, "error": str(e), "success": False})
+
+
+@router.get("/users/get-all-users", response_model=ServerResponse, dependencies=[Depends(DbRoundTripBudget(2))])
 async def get_all_users(
     page: int=1,
     limit: int=10,
+    fields: str = Query(None, description="Comma-separated fields to return, e.g. fullName,email"),
     service = Depends(get_auth_service),
     jwt_payload: dict = Depends(jwt_validator)
 ):
     try:
-        data = await service.get_all_users(page=page, limit=limit)
+        data = await service.get_all_users(page=page, limit=limit, fields=fields)
         return Utils.create_response(data["data"], data["success"], data.get("error", ""))
     except Exception as e:
         raise HTTPException(status_code=400, detail={"data": None, "error": str(e), "success": False})
 
-@router.get("/admin/users", response_model=ServerResponse)
+@router.get("/admin/users", response_model=ServerResponse, dependencies=[Depends(DbRoundTripBudget(2))])
 async def get_users_by_admin(
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=100, description="Items per page"),
+    fields: str = Query(None, description="Comma-separated fields to return, e.g. fullName,email"),
     service = Depends(get_auth_service),
     jwt_payload: dict = Depends(jwt_validator)
 ):
@@ -65,7 +147,7 @@ async def get_users_by_admin(
                 detail={"data": None, "error": "Only admins can access this resource", "success": False}
             )
         
-        data = await service.get_users_by_admin(admin_id, page, limit)
+        data = await service.get_users_by_admin(admin_id, page, limit, fields)
         if not data["success"]:
             raise HTTPException(
                 status_code=400,
@@ -77,7 +159,7 @@ async def get_users_by_admin(
     except Exception as e:
         raise HTTPException(status_code=400, detail={"data": None, "error": str(e), "success": False})
 
-@router.post("/admin/create-user", response_model=ServerResponse, status_code=201)
+@router.post("/admin/create-user", response_model=ServerResponse, status_code=201, dependencies=[Depends(DbRoundTripBudget(1))])
 async def create_user_by_admin(
     user_data: AdminCreateUserSchema,
     service = Depends(get_auth_service),
@@ -113,7 +195,69 @@ async def create_user_by_admin(
     except Exception as e:
         raise HTTPException(status_code=400, detail={"data": None, "error": str(e), "success": False})
 
-@router.get("/admin/users/{user_id}", response_model=ServerResponse)
+@router.post("/admin/bulk-create-users", response_model=ServerResponse, dependencies=[Depends(DbRoundTripBudget(2))])
+async def bulk_create_users_by_admin(
+    request: Request,
+    service = Depends(get_auth_service),
+    jwt_payload: dict = Depends(jwt_validator)
+):
+    """
+    Create up to BULK_PROVISION_MAX_ROWS users in one request.
+    The body is a JSON array of create-user objects, or CSV (Content-Type: text/csv)
+    with a header row of fullName,email,phone,password. Returns a result per row.
+    """
+    try:
+        admin_id = jwt_payload.get("user_id") or jwt_payload.get("id") or str(jwt_payload.get("_id"))
+        if not admin_id:
+            raise HTTPException(
+                status_code=400,
+                detail={"data": None, "error": "Admin ID not found in JWT token", "success": False}
+            )
+
+        if jwt_payload.get("userType") != "admin":
+            raise HTTPException(
+                status_code=403,
+                detail={"data": None, "error": "Only admins can create users", "success": False}
+            )
+
+        body = await request.body()
+        content_type = request.headers.get("content-type", "")
+        try:
+            if content_type.startswith("text/csv"):
+                reader = csv.DictReader(io.StringIO(body.decode("utf-8-sig")))
+                rows = [{key: value for key, value in row.items() if value not in (None, "")} for row in reader]
+            else:
+                rows = json.loads(body)
+        except (ValueError, csv.Error) as e:
+            raise HTTPException(
+                status_code=400,
+                detail={"data": None, "error": f"Malformed request body: {e}", "success": False}
+            )
+        if not isinstance(rows, list) or not rows:
+            raise HTTPException(
+                status_code=400,
+                detail={"data": None, "error": "Expected a non-empty list of users", "success": False}
+            )
+        max_rows = get_settings().BULK_PROVISION_MAX_ROWS
+        if len(rows) > max_rows:
+            raise HTTPException(
+                status_code=413,
+                detail={"data": None, "error": f"Too many rows (limit {max_rows})", "success": False}
+            )
+
+        data = await service.bulk_create_users_by_admin(rows, admin_id)
+        if not data["success"]:
+            raise HTTPException(
+                status_code=400,
+                detail={"data": None, "error": data.get("error"), "success": False}
+            )
+        return Utils.create_response(data["data"], data["success"], data.get("error", ""))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail={"data": None, "error": str(e), "success": False})
+
+@router.get("/admin/users/{user_id}", response_model=ServerResponse, dependencies=[Depends(DbRoundTripBudget(1))])
 async def get_user_by_id(
     user_id: str,
     service = Depends(get_auth_service),
@@ -149,7 +293,7 @@ async def get_user_by_id(
     except Exception as e:
         raise HTTPException(status_code=400, detail={"data": None, "error": str(e), "success": False})
 
-@router.put("/users/{user_id}", response_model=ServerResponse)
+@router.put("/users/{user_id}", response_model=ServerResponse, dependencies=[Depends(DbRoundTripBudget(3))])
 async def update_user_profile(
     user_id: str,
     body: UpdateUserSchema,
@@ -175,7 +319,7 @@ async def update_user_profile(
         raise HTTPException(status_code=400, detail={"data": None, "error": str(e), "success": False})
 
 
-@router.delete("/users/delete-user/{user_id}", response_model=ServerResponse)
+@router.delete("/users/delete-user/{user_id}", response_model=ServerResponse, dependencies=[Depends(DbRoundTripBudget(1))])
 async def delete_user(user_id: str, service = Depends(get_auth_service), jwt_payload: dict = Depends(jwt_validator)):
     try:
         data = await service.delete_user(user_id)
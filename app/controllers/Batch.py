@@ -0,0 +1,46 @@
+from fastapi import APIRouter, HTTPException, Depends, Request, status
+from app.middleware.JWTVerification import jwt_validator
+from app.schemas.ServerResponse import ServerResponse
+from app.schemas.Batch import BatchRequestSchema
+from app.helpers.Utilities import Utils
+from app.config import get_settings
+from app.dependencies import get_batch_service
+
+router = APIRouter(prefix="/api/v1/batch", tags=["Batch"])
+
+@router.post("", response_model=ServerResponse)
+async def execute_batch(
+    body: BatchRequestSchema,
+    request: Request,
+    service = Depends(get_batch_service),
+    jwt_payload: dict = Depends(jwt_validator)
+):
+    """
+    Execute several auth, profile and company operations in one request.
+    The token is verified once for the whole batch. Each result carries the
+    status and body the operation would have returned on its own; with
+    stopOnError, operations after the first failure are skipped (status 424).
+    """
+    try:
+        max_operations = get_settings().BATCH_MAX_OPERATIONS
+        if len(body.operations) > max_operations:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail={"data": None, "error": f"Too many operations (limit {max_operations})", "success": False}
+            )
+
+        result = await service.execute(request, body.operations, body.stopOnError)
+        if not result["success"]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
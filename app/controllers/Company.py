@@ -1,18 +1,21 @@
+from typing import List
 from fastapi import APIRouter, HTTPException, Depends, Query, status
 from fastapi.responses import JSONResponse
 from pydantic import ValidationError
-from app.middleware.JWTVerification import jwt_validator
+from app.middleware.JWTVerification import admin_validator, jwt_validator
 from app.schemas.ServerResponse import ServerResponse
 from app.helpers.Utilities import Utils
-from app.schemas.Company import CreateCompanySchema, UpdateCompanySchema
+from app.helpers.DbMetrics import DbRoundTripBudget
+from app.schemas.Company import (
+    BatchGetCompaniesSchema, BulkDeleteCompaniesSchema, BulkUpdateCompaniesSchema, CreateCompanySchema, UpdateCompanySchema
+)
 from app.services.Company import CompanyService
+from app.config import get_settings
+from app.dependencies import get_company_service
 
 router = APIRouter(prefix="/api/v1/companies", tags=["Companies"])
 
-def get_company_service() -> CompanyService:
-    return CompanyService()
-
-@router.post("/", response_model=ServerResponse)
+@router.post("/", response_model=ServerResponse, dependencies=[Depends(DbRoundTripBudget(3))])
 async def create_company(
     body: CreateCompanySchema,
     service: CompanyService = Depends(get_company_service),
@@ -43,7 +46,172 @@ async def create_company(
             detail={"data": None, "error": "Internal server error", "success": False}
         )
 
-@router.get("/{company_id}", response_model=ServerResponse)
+@router.post("/batch-get", response_model=ServerResponse, dependencies=[Depends(DbRoundTripBudget(1))])
+async def batch_get_companies(
+    body: BatchGetCompaniesSchema,
+    service: CompanyService = Depends(get_company_service),
+    jwt_payload: dict = Depends(jwt_validator)
+):
+    """
+    Get several companies by ID in one request.
+    Companies are returned in the requested order; unknown IDs are listed in "missing".
+    """
+    try:
+        max_ids = get_settings().COMPANY_BATCH_GET_MAX_IDS
+        if len(body.ids) > max_ids:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail={"data": None, "error": f"Too many ids (limit {max_ids})", "success": False}
+            )
+
+        result = await service.get_companies_by_ids(body.ids)
+        if not result["success"]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
+
+@router.get("/facets", response_model=ServerResponse, dependencies=[Depends(DbRoundTripBudget(2))])
+async def get_company_facets(
+    facet: List[str] = Query(["country", "jurisdiction"], description="Facets to count: country, jurisdiction"),
+    limit: int = Query(50, ge=1, le=1000, description="Buckets per facet, largest first"),
+    service: CompanyService = Depends(get_company_service),
+    jwt_payload: dict = Depends(jwt_validator)
+):
+    """
+    Get company counts by country and jurisdiction from the maintained rollup
+    """
+    try:
+        result = await service.get_facets(facet, limit)
+        if not result["success"]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
+
+@router.post("/facets/rebuild", response_model=ServerResponse)
+async def rebuild_company_facets(
+    service: CompanyService = Depends(get_company_service),
+    jwt_payload: dict = Depends(admin_validator)
+):
+    """
+    Recount the facet rollup from the companies collection
+    """
+    try:
+        result = await service.rebuild_facets()
+        if not result["success"]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
+
+@router.post("/normalized-fields/backfill", response_model=ServerResponse)
+async def backfill_normalized_fields(
+    service: CompanyService = Depends(get_company_service),
+    jwt_payload: dict = Depends(admin_validator)
+):
+    """
+    Fill in the normalized country/jurisdiction fields used by match=exact on existing companies
+    """
+    try:
+        result = await service.backfill_normalized_fields()
+        if not result["success"]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
+
+@router.post("/bulk-update", response_model=ServerResponse)
+async def bulk_update_companies(
+    body: BulkUpdateCompaniesSchema,
+    service: CompanyService = Depends(get_company_service),
+    jwt_payload: dict = Depends(admin_validator)
+):
+    """
+    Apply one update to the companies selected by "ids" or an exact-match "filter".
+    With dryRun only the number of matching companies is returned.
+    """
+    try:
+        result = await service.bulk_update_companies(body.ids, body.filter, body.update, body.dryRun)
+        if not result["success"]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
+
+@router.post("/bulk-delete", response_model=ServerResponse)
+async def bulk_delete_companies(
+    body: BulkDeleteCompaniesSchema,
+    service: CompanyService = Depends(get_company_service),
+    jwt_payload: dict = Depends(admin_validator)
+):
+    """
+    Permanently delete the companies selected by "ids" or an exact-match "filter".
+    With dryRun only the number of matching companies is returned.
+    """
+    try:
+        result = await service.bulk_delete_companies(body.ids, body.filter, body.dryRun)
+        if not result["success"]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
+
+@router.get("/{company_id}", response_model=ServerResponse, dependencies=[Depends(DbRoundTripBudget(1))])
 async def get_company(
     company_id: str,
     service: CompanyService = Depends(get_company_service),
@@ -70,13 +238,15 @@ async def get_company(
             detail={"data": None, "error": "Internal server error", "success": False}
         )
 
-@router.get("/", response_model=ServerResponse)
+@router.get("/", response_model=ServerResponse, dependencies=[Depends(DbRoundTripBudget(2))])
 async def get_companies(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(10, ge=1, le=100, description="Number of records to return"),
     company_name: str = Query(None, description="Filter by company name"),
     country: str = Query(None, description="Filter by country"),
     jurisdiction: str = Query(None, description="Filter by jurisdiction"),
+    match: str = Query("contains", pattern="^(contains|exact)$", description="country/jurisdiction matching: contains (substring) or exact (case-insensitive, indexed)"),
+    fields: str = Query(None, description="Comma-separated fields to return, e.g. companyName,country"),
     service: CompanyService = Depends(get_company_service),
     jwt_payload: dict = Depends(jwt_validator)
 ):
@@ -88,12 +258,19 @@ async def get_companies(
         filters = {}
         if company_name:
             filters["companyName"] = {"$regex": company_name, "$options": "i"}
-        if country:
-            filters["country"] = {"$regex": country, "$options": "i"}
-        if jurisdiction:
-            filters["jurisdiction"] = {"$regex": jurisdiction, "$options": "i"}
+        if match == "exact":
+            # Equality on the normalized shadow fields is served by their indexes
+            if country:
+                filters["countryNorm"] = Utils.normalize_match_value(country)
+            if jurisdiction:
+                filters["jurisdictionNorm"] = Utils.normalize_match_value(jurisdiction)
+        else:
+            if country:
+                filters["country"] = {"$regex": country, "$options": "i"}
+            if jurisdiction:
+                filters["jurisdiction"] = {"$regex": jurisdiction, "$options": "i"}
 
-        result = await service.get_companies(skip, limit, filters)
+        result = await service.get_companies(skip, limit, filters, fields)
         if not result["success"]:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -109,7 +286,7 @@ async def get_companies(
             detail={"data": None, "error": "Internal server error", "success": False}
         )
 
-@router.put("/{company_id}", response_model=ServerResponse)
+@router.put("/{company_id}", response_model=ServerResponse, dependencies=[Depends(DbRoundTripBudget(4))])
 async def update_company(
     company_id: str,
     body: UpdateCompanySchema,
@@ -142,7 +319,7 @@ async def update_company(
             detail={"data": None, "error": "Internal server error", "success": False}
         )
 
-@router.delete("/{company_id}", response_model=ServerResponse)
+@router.delete("/{company_id}", response_model=ServerResponse, dependencies=[Depends(DbRoundTripBudget(3))])
 async def delete_company(
     company_id: str,
     service: CompanyService = Depends(get_company_service),
@@ -0,0 +1,140 @@
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from fastapi.responses import StreamingResponse
+from app.middleware.JWTVerification import admin_validator
+from app.schemas.ServerResponse import ServerResponse
+from app.schemas.CopyJob import StartCopyJobSchema
+from app.helpers.CopyJobs import CopyJobNotFound
+from app.helpers.Utilities import Utils
+from app.dependencies import get_copy_job_service
+
+router = APIRouter(prefix="/api/v1/copy-jobs", tags=["Copy Jobs"])
+
+@router.post("", response_model=ServerResponse, status_code=status.HTTP_202_ACCEPTED)
+async def start_copy_job(
+    body: StartCopyJobSchema,
+    service = Depends(get_copy_job_service),
+    jwt_payload: dict = Depends(admin_validator)
+):
+    """
+    Start a server-side copy into blob storage; track it with the returned job id
+    """
+    try:
+        result = await service.start_copy(body.sourceUrl, body.containerName, body.folderName, body.fileType)
+        if not result["success"]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
+
+@router.get("", response_model=ServerResponse)
+async def list_copy_jobs(
+    job_status: str = Query(None, alias="status", description="pending, success, failed or aborted"),
+    service = Depends(get_copy_job_service),
+    jwt_payload: dict = Depends(admin_validator)
+):
+    """
+    List tracked copy jobs, newest first
+    """
+    try:
+        result = await service.list_copy_jobs(job_status)
+        if not result["success"]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
+
+@router.get("/{job_id}", response_model=ServerResponse)
+async def get_copy_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=60, description="Seconds to wait for the job to finish"),
+    service = Depends(get_copy_job_service),
+    jwt_payload: dict = Depends(admin_validator)
+):
+    """
+    Get a copy job's status; with wait > 0 this long-polls until the job finishes
+    """
+    try:
+        result = await service.get_copy_job(job_id, wait)
+        if not result["success"]:
+            status_code = status.HTTP_404_NOT_FOUND if "not found" in result.get("error", "").lower() else status.HTTP_400_BAD_REQUEST
+            raise HTTPException(
+                status_code=status_code,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
+
+@router.get("/{job_id}/events")
+async def copy_job_events(
+    job_id: str,
+    service = Depends(get_copy_job_service),
+    jwt_payload: dict = Depends(admin_validator)
+):
+    """
+    Subscribe to a copy job's status changes as server-sent events
+    """
+    try:
+        events = service.copy_job_events(job_id)
+        return StreamingResponse(events, media_type="text/event-stream", headers={"cache-control": "no-cache"})
+    except CopyJobNotFound:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"data": None, "error": "Copy job not found", "success": False}
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
+
+@router.post("/{job_id}/abort", response_model=ServerResponse)
+async def abort_copy_job(
+    job_id: str,
+    service = Depends(get_copy_job_service),
+    jwt_payload: dict = Depends(admin_validator)
+):
+    """
+    Abort a running copy job
+    """
+    try:
+        result = await service.abort_copy_job(job_id)
+        if not result["success"]:
+            status_code = status.HTTP_404_NOT_FOUND if "not found" in result.get("error", "").lower() else status.HTTP_400_BAD_REQUEST
+            raise HTTPException(
+                status_code=status_code,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
@@ -0,0 +1,497 @@
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from app.middleware.JWTVerification import admin_validator
+from app.schemas.ServerResponse import ServerResponse
+from app.helpers.Utilities import Utils
+from app.dependencies import get_diagnostics_service
+
+router = APIRouter(prefix="/api/v1/diagnostics", tags=["Diagnostics"])
+
+@router.get("/slow-callbacks", response_model=ServerResponse)
+async def get_slow_callbacks(
+    limit: int = Query(20, ge=1, le=200, description="Number of call sites to return"),
+    service = Depends(get_diagnostics_service),
+    jwt_payload: dict = Depends(admin_validator)
+):
+    """
+    Get the top event loop blocking call sites
+    """
+    try:
+        result = await service.get_slow_callbacks(limit)
+        if not result["success"]:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
+
+@router.delete("/slow-callbacks", response_model=ServerResponse)
+async def reset_slow_callbacks(
+    service = Depends(get_diagnostics_service),
+    jwt_payload: dict = Depends(admin_validator)
+):
+    """
+    Clear the slow-callback report
+    """
+    try:
+        result = await service.reset_slow_callbacks()
+        if not result["success"]:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
+
+@router.get("/profiles", response_model=ServerResponse)
+async def get_profiles(
+    service = Depends(get_diagnostics_service),
+    jwt_payload: dict = Depends(admin_validator)
+):
+    """
+    List request profiles captured with the X-Profile header
+    """
+    try:
+        result = await service.get_profiles()
+        if not result["success"]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
+
+@router.get("/profiles/{profile_id}", response_model=ServerResponse)
+async def get_profile(
+    profile_id: str,
+    service = Depends(get_diagnostics_service),
+    jwt_payload: dict = Depends(admin_validator)
+):
+    """
+    Get the call-tree summary of a captured request profile
+    """
+    try:
+        result = await service.get_profile(profile_id)
+        if not result["success"]:
+            status_code = status.HTTP_404_NOT_FOUND if "not found" in result.get("error", "").lower() else status.HTTP_400_BAD_REQUEST
+            raise HTTPException(
+                status_code=status_code,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
+
+@router.get("/allocations", response_model=ServerResponse)
+async def get_allocation_status(
+    service = Depends(get_diagnostics_service),
+    jwt_payload: dict = Depends(admin_validator)
+):
+    """
+    Get tracemalloc status and stored snapshots
+    """
+    try:
+        result = await service.get_allocation_status()
+        if not result["success"]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
+
+@router.post("/allocations/start", response_model=ServerResponse)
+async def start_allocation_tracing(
+    frames: int = Query(25, ge=1, le=100, description="Traceback depth to record"),
+    service = Depends(get_diagnostics_service),
+    jwt_payload: dict = Depends(admin_validator)
+):
+    """
+    Start allocation tracing
+    """
+    try:
+        result = await service.start_allocation_tracing(frames)
+        if not result["success"]:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
+
+@router.post("/allocations/stop", response_model=ServerResponse)
+async def stop_allocation_tracing(
+    service = Depends(get_diagnostics_service),
+    jwt_payload: dict = Depends(admin_validator)
+):
+    """
+    Stop allocation tracing
+    """
+    try:
+        result = await service.stop_allocation_tracing()
+        if not result["success"]:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
+
+@router.post("/allocations/snapshots", response_model=ServerResponse)
+async def take_allocation_snapshot(
+    label: str = Query(None, max_length=100, description="Optional snapshot label"),
+    service = Depends(get_diagnostics_service),
+    jwt_payload: dict = Depends(admin_validator)
+):
+    """
+    Take an allocation snapshot
+    """
+    try:
+        result = await service.take_allocation_snapshot(label)
+        if not result["success"]:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
+
+@router.delete("/allocations/snapshots", response_model=ServerResponse)
+async def clear_allocation_snapshots(
+    service = Depends(get_diagnostics_service),
+    jwt_payload: dict = Depends(admin_validator)
+):
+    """
+    Drop all stored allocation snapshots
+    """
+    try:
+        result = await service.clear_allocation_snapshots()
+        if not result["success"]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
+
+@router.get("/allocations/snapshots/{snapshot_id}", response_model=ServerResponse)
+async def get_allocation_top(
+    snapshot_id: str,
+    limit: int = Query(20, ge=1, le=200, description="Number of sites to return"),
+    group_by: str = Query("module", pattern="^(module|line)$", description="Group by app module or source line"),
+    service = Depends(get_diagnostics_service),
+    jwt_payload: dict = Depends(admin_validator)
+):
+    """
+    Get the top allocation sites of a snapshot
+    """
+    try:
+        result = await service.get_allocation_top(snapshot_id, limit, group_by)
+        if not result["success"]:
+            status_code = status.HTTP_404_NOT_FOUND if "not found" in result.get("error", "").lower() else status.HTTP_400_BAD_REQUEST
+            raise HTTPException(
+                status_code=status_code,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
+
+@router.get("/allocations/diff", response_model=ServerResponse)
+async def get_allocation_diff(
+    base: str = Query(..., description="Base snapshot ID"),
+    target: str = Query(..., description="Target snapshot ID"),
+    limit: int = Query(20, ge=1, le=200, description="Number of sites to return"),
+    group_by: str = Query("module", pattern="^(module|line)$", description="Group by app module or source line"),
+    service = Depends(get_diagnostics_service),
+    jwt_payload: dict = Depends(admin_validator)
+):
+    """
+    Get allocation changes between two snapshots
+    """
+    try:
+        result = await service.get_allocation_diff(base, target, limit, group_by)
+        if not result["success"]:
+            status_code = status.HTTP_404_NOT_FOUND if "not found" in result.get("error", "").lower() else status.HTTP_400_BAD_REQUEST
+            raise HTTPException(
+                status_code=status_code,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
+
+@router.get("/logging", response_model=ServerResponse)
+async def get_logging_stats(
+    service = Depends(get_diagnostics_service),
+    jwt_payload: dict = Depends(admin_validator)
+):
+    """
+    Get log pipeline queue depth and dropped record count
+    """
+    try:
+        result = await service.get_logging_stats()
+        if not result["success"]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
+
+@router.get("/db-round-trips", response_model=ServerResponse)
+async def get_db_round_trips(
+    service = Depends(get_diagnostics_service),
+    jwt_payload: dict = Depends(admin_validator)
+):
+    """
+    Get MongoDB round trips per request by route
+    """
+    try:
+        result = await service.get_db_round_trips()
+        if not result["success"]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
+
+@router.delete("/db-round-trips", response_model=ServerResponse)
+async def reset_db_round_trips(
+    service = Depends(get_diagnostics_service),
+    jwt_payload: dict = Depends(admin_validator)
+):
+    """
+    Clear the round-trip histogram
+    """
+    try:
+        result = await service.reset_db_round_trips()
+        if not result["success"]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
+
+@router.get("/signin-admission", response_model=ServerResponse)
+async def get_signin_admission(
+    service = Depends(get_diagnostics_service),
+    jwt_payload: dict = Depends(admin_validator)
+):
+    """
+    Get sign-in admission counters (admitted, shed by IP/email/concurrency)
+    """
+    try:
+        result = await service.get_signin_admission()
+        if not result["success"]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
+
+@router.delete("/signin-admission", response_model=ServerResponse)
+async def reset_signin_admission(
+    service = Depends(get_diagnostics_service),
+    jwt_payload: dict = Depends(admin_validator)
+):
+    """
+    Reset the sign-in admission counters
+    """
+    try:
+        result = await service.reset_signin_admission()
+        if not result["success"]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
+
+@router.get("/token-revocations", response_model=ServerResponse)
+async def get_token_revocations(
+    service = Depends(get_diagnostics_service),
+    jwt_payload: dict = Depends(admin_validator)
+):
+    """
+    Get this worker's token revocation list state (version, revoked tokens and users)
+    """
+    try:
+        result = await service.get_token_revocations()
+        if not result["success"]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
+
+@router.get("/read-coalescing", response_model=ServerResponse)
+async def get_read_coalescing(
+    service = Depends(get_diagnostics_service),
+    jwt_payload: dict = Depends(admin_validator)
+):
+    """
+    Get how many company reads were served by joining an identical query in flight
+    """
+    try:
+        result = await service.get_read_coalescing()
+        if not result["success"]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
+
+
+@router.delete("/read-coalescing", response_model=ServerResponse)
+async def reset_read_coalescing(
+    service = Depends(get_diagnostics_service),
+    jwt_payload: dict = Depends(admin_validator)
+):
+    """
+    Reset the read coalescing counters
+    """
+    try:
+        result = await service.reset_read_coalescing()
+        if not result["success"]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"data": None, "error": result.get("error"), "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
@@ -0,0 +1,36 @@
+import asyncio
+import os
+from fastapi import APIRouter, HTTPException, Depends, Request, status
+from app.helpers.RangeFileResponse import RangeFileResponse
+from app.helpers.Storage import FILES_ROUTE, LocalStorageBackend
+from app.dependencies import get_storage_backend
+
+router = APIRouter(prefix=FILES_ROUTE, tags=["Files"])
+
+@router.api_route("/{file_path:path}", methods=["GET", "HEAD"])
+async def get_file(
+    file_path: str,
+    request: Request,
+    storage = Depends(get_storage_backend)
+):
+    """
+    Serve a file from local storage, with support for range requests
+    """
+    not_found = HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail={"data": None, "error": "File not found", "success": False}
+    )
+    if not isinstance(storage, LocalStorageBackend) or os.path.basename(file_path).startswith("."):
+        raise not_found
+
+    path = storage.resolve(file_path)
+    if path is None:
+        raise not_found
+    try:
+        stat_result = await asyncio.to_thread(os.stat, path)
+    except OSError:
+        raise not_found
+    if not os.path.isfile(path):
+        raise not_found
+
+    return RangeFileResponse(path, stat_result, request.headers.get("range"), method=request.method)
@@ -0,0 +1,57 @@
+import re
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, status
+from app.helpers.ImageProcessing import DERIVATIVE_CONTENT_TYPE, IMAGES_ROUTE
+from app.helpers.RangeFileResponse import RangeFileResponse
+from app.dependencies import get_profile_service
+
+DIGEST_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+router = APIRouter(prefix=IMAGES_ROUTE, tags=["Images"])
+
+@router.api_route("/{digest}", methods=["GET", "HEAD"])
+async def get_image(
+    digest: str,
+    request: Request,
+    size: int = Query(None, description="Edge length in pixels; defaults to the display size"),
+    profile_service = Depends(get_profile_service)
+):
+    """
+    Serve a resized profile picture from the derivative cache
+    """
+    if not DIGEST_PATTERN.match(digest):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"data": None, "error": "Image not found", "success": False}
+        )
+    try:
+        result = await profile_service.get_picture_variant(digest, size)
+        if not result["success"]:
+            error = result.get("error", "")
+            if "not found" in error.lower():
+                status_code = status.HTTP_404_NOT_FOUND
+            elif "unsupported" in error.lower():
+                status_code = status.HTTP_400_BAD_REQUEST
+            else:
+                status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+            raise HTTPException(
+                status_code=status_code,
+                detail={"data": None, "error": error, "success": False}
+            )
+
+        response = RangeFileResponse(
+            result["data"]["path"],
+            result["data"]["stat"],
+            request.headers.get("range"),
+            media_type=DERIVATIVE_CONTENT_TYPE,
+            method=request.method
+        )
+        # The URL names the content hash, so the bytes never change
+        response.headers["cache-control"] = "public, max-age=31536000, immutable"
+        return response
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
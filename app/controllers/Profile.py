@@ -1,13 +1,18 @@
-from fastapi import APIRouter, Form, HTTPException, UploadFile, File, Depends, Header, status
+from fastapi import APIRouter, Form, HTTPException, UploadFile, File, Depends, Request, status
 from fastapi.responses import JSONResponse
 from pydantic import ValidationError
 from app.middleware.JWTVerification import jwt_validator
 from app.schemas.ServerResponse import ServerResponse
 from app.helpers.Utilities import Utils
+from app.helpers.DbMetrics import DbRoundTripBudget
 from app.schemas.User import UpdateUserSchema
+from app.helpers.StreamingUpload import StreamingUpload
+from app.config import get_settings
 
 from app.dependencies import get_profile_service
 
+PROFILE_PICTURE_TYPES = ("image/png", "image/jpeg", "image/gif", "image/webp")
+
 router = APIRouter(prefix="/api/v1/profile", tags=["Profile"])
     
 # @router.put("/update-user-info", response_model=ServerResponse)
@@ -45,23 +50,24 @@ router = APIRouter(prefix="/api/v1/profile", tags=["Profile"])
 #             detail={"data": None, "error": "Internal server error", "success": False}
 #         )
     
-@router.get("/me", response_model=ServerResponse)
+@router.get("/me", response_model=ServerResponse, dependencies=[Depends(DbRoundTripBudget(1))])
 async def get_me(
-    authorization: str = Header(..., description="Bearer <token>"),
-    profile_service = Depends(get_profile_service)
+    profile_service = Depends(get_profile_service),
+    jwt_payload: dict = Depends(jwt_validator)
 ):
     try:
-        if not authorization.startswith("Bearer "):
+        # jwt_validator already verified the token for this request
+        user_id = jwt_payload.get("user_id") or jwt_payload.get("id") or jwt_payload.get("_id")
+        if not user_id:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail={"data": None, "error": "Invalid Authorization header format", "success": False}
+                detail={"data": None, "error": "Invalid authentication token", "success": False}
             )
-        
-        token = authorization.split(" ")[1]
-        result = await profile_service.get_current_user(token)
+
+        result = await profile_service.get_current_user(str(user_id))
         
         if not result["success"]:
-            status_code = status.HTTP_401_UNAUTHORIZED if "Invalid credentials" in result.get("error", "") else status.HTTP_400_BAD_REQUEST
+            status_code = status.HTTP_404_NOT_FOUND if result.get("error") == "User not found" else status.HTTP_400_BAD_REQUEST
             raise HTTPException(
                 status_code=status_code,
                 detail={"data": None, "error": result.get("error"), "success": False}
@@ -80,4 +86,53 @@ async def get_me(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail={"data": None, "error": "Internal server error", "success": False}
         )
-    
\ No newline at end of file
+
+@router.put("/profile-picture", response_model=ServerResponse, dependencies=[Depends(DbRoundTripBudget(3))])
+async def change_profile_picture(
+    request: Request,
+    profile_service = Depends(get_profile_service),
+    jwt_payload: dict = Depends(jwt_validator)
+):
+    """
+    Upload a new profile picture (multipart/form-data, field "file").
+    The image is downscaled to IMG_MAX_EDGE and thumbnails are generated;
+    the response lists their /api/v1/images URLs.
+    """
+    try:
+        user_id = jwt_payload.get("user_id") or jwt_payload.get("id") or jwt_payload.get("_id")
+        if not user_id:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail={"data": None, "error": "Invalid authentication token", "success": False}
+            )
+
+        upload = StreamingUpload(
+            request,
+            field_name="file",
+            max_size=get_settings().PROFILE_PICTURE_MAX_BYTES,
+            allowed_types=PROFILE_PICTURE_TYPES
+        )
+        result = await profile_service.change_profile_picture(str(user_id), upload)
+        if not result["success"]:
+            error = result.get("error", "")
+            if "too large" in error.lower():
+                status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            elif "unsupported" in error.lower():
+                status_code = status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+            elif "not found" in error.lower():
+                status_code = status.HTTP_404_NOT_FOUND
+            else:
+                status_code = status.HTTP_400_BAD_REQUEST
+            raise HTTPException(
+                status_code=status_code,
+                detail={"data": None, "error": error, "success": False}
+            )
+
+        return Utils.create_response(result["data"], result["success"], result.get("error", ""))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"data": None, "error": "Internal server error", "success": False}
+        )
@@ -8,6 +8,18 @@ from typing import Optional
 _auth_service = None
 _profile_service = None
 _common_service = None
+_diagnostics_service = None
+_copy_job_service = None
+_company_service = None
+_batch_service = None
+
+# Global singletons - Clients
+_blob_uploader = None
+_storage_backend = None
+_process_pool = None
+_signin_admission = None
+_profile_cache = None
+_derivative_cache = None
 
 
 def get_auth_service():
@@ -37,13 +49,164 @@ def get_common_service():
     return _common_service
 
 
+def get_diagnostics_service():
+    """Get singleton DiagnosticsService instance"""
+    global _diagnostics_service
+    if _diagnostics_service is None:
+        from app.services.Diagnostics import DiagnosticsService
+        _diagnostics_service = DiagnosticsService()
+    return _diagnostics_service
+
+
+def get_copy_job_service():
+    """Get singleton CopyJobService instance"""
+    global _copy_job_service
+    if _copy_job_service is None:
+        from app.services.CopyJobs import CopyJobService
+        _copy_job_service = CopyJobService()
+    return _copy_job_service
+
+
+def get_company_service():
+    """Get singleton CompanyService instance (shares in-flight reads across requests)"""
+    global _company_service
+    if _company_service is None:
+        from app.services.Company import CompanyService
+        _company_service = CompanyService()
+    return _company_service
+
+
+def get_batch_service():
+    """Get singleton BatchService instance"""
+    global _batch_service
+    if _batch_service is None:
+        from app.services.Batch import BatchService
+        _batch_service = BatchService()
+    return _batch_service
+
+
+def get_blob_uploader():
+    """Get singleton AsyncAzureBlobUploader instance (shared connection pool)"""
+    global _blob_uploader
+    if _blob_uploader is None:
+        from app.helpers.AsyncAzureStorage import AsyncAzureBlobUploader
+        _blob_uploader = AsyncAzureBlobUploader()
+    return _blob_uploader
+
+
+def get_storage_backend():
+    """Get singleton StorageBackend selected by STORAGE_BACKEND"""
+    global _storage_backend
+    if _storage_backend is None:
+        import os
+        from app.config import get_settings
+        from app.helpers.Storage import AzureStorageBackend, LocalStorageBackend
+        settings = get_settings()
+        backend = settings.STORAGE_BACKEND or ("azure" if os.getenv("AZURE_STORAGE_CONNECTION_STRING") else "local")
+        if backend == "azure":
+            _storage_backend = AzureStorageBackend()
+        elif backend == "local":
+            _storage_backend = LocalStorageBackend(
+                settings.STORAGE_LOCAL_ROOT,
+                settings.STORAGE_PUBLIC_BASE_URL,
+                settings.STORAGE_FSYNC_BATCH_MS
+            )
+        else:
+            raise Exception(f"Unknown STORAGE_BACKEND '{backend}'. Use 'azure' or 'local'.")
+    return _storage_backend
+
+
+def get_signin_admission():
+    """Get singleton SigninAdmission limiter"""
+    global _signin_admission
+    if _signin_admission is None:
+        import os
+        from app.config import get_settings
+        from app.helpers.AdmissionControl import SigninAdmission
+        settings = get_settings()
+        _signin_admission = SigninAdmission(
+            ip_limit=settings.SIGNIN_IP_LIMIT,
+            email_limit=settings.SIGNIN_EMAIL_LIMIT,
+            window=settings.SIGNIN_WINDOW_SECONDS,
+            max_concurrent=settings.SIGNIN_MAX_CONCURRENT_VERIFICATIONS or os.cpu_count() or 1,
+            max_queued=settings.SIGNIN_MAX_QUEUED_VERIFICATIONS,
+            queue_timeout=settings.SIGNIN_QUEUE_TIMEOUT_SECONDS
+        )
+    return _signin_admission
+
+
+def get_profile_cache():
+    """Get singleton TTLCache of user profiles keyed by user id"""
+    global _profile_cache
+    if _profile_cache is None:
+        from app.config import get_settings
+        from app.helpers.TTLCache import TTLCache
+        settings = get_settings()
+        _profile_cache = TTLCache(settings.PROFILE_CACHE_MAX_ENTRIES, settings.PROFILE_CACHE_TTL_SECONDS)
+    return _profile_cache
+
+
+def get_process_pool():
+    """Get the shared ProcessPoolExecutor for CPU-bound work"""
+    global _process_pool
+    if _process_pool is None:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        from app.config import get_settings
+        # Never fork: the logging queue and loop watchdog threads may hold locks at fork time
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _process_pool = ProcessPoolExecutor(
+            max_workers=get_settings().PROCESS_POOL_WORKERS,
+            mp_context=multiprocessing.get_context(start_method)
+        )
+    return _process_pool
+
+
+def get_derivative_cache():
+    """Get singleton DerivativeCache for resized images"""
+    global _derivative_cache
+    if _derivative_cache is None:
+        from app.config import get_settings
+        from app.helpers.ImageProcessing import DerivativeCache
+        settings = get_settings()
+        _derivative_cache = DerivativeCache(settings.CACHE_DIR, settings.CACHE_MAX_BYTES)
+    return _derivative_cache
+
+
+async def close_clients():
+    """
+    Close singleton network clients. Call this on application shutdown.
+    """
+    global _blob_uploader, _storage_backend
+    if _blob_uploader is not None:
+        await _blob_uploader.close()
+        _blob_uploader = None
+    if _storage_backend is not None:
+        await _storage_backend.close()
+        _storage_backend = None
+
+
 def cleanup_resources():
     """
     Cleanup all singleton resources. Call this on application shutdown.
     """
-    global _auth_service, _profile_service, _common_service
+    global _auth_service, _profile_service, _common_service, _diagnostics_service, _copy_job_service, _company_service
+    global _batch_service
+    global _process_pool, _derivative_cache, _signin_admission, _profile_cache
     
     # Reset all services
     _auth_service = None
     _profile_service = None
-    _common_service = None
\ No newline at end of file
+    _common_service = None
+    _diagnostics_service = None
+    _copy_job_service = None
+    _company_service = None
+    _batch_service = None
+
+    # Stop worker processes
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+    _derivative_cache = None
+    _signin_admission = None
+    _profile_cache = None
\ No newline at end of file
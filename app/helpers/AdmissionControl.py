@@ -0,0 +1,151 @@
+"""
+Sign-in admission control.
+Attempts are rate limited per client IP and per email with sliding-window
+counters before any database lookup, and password verifications share a
+global concurrency cap so a burst queues briefly or is shed instead of
+saturating every core with bcrypt.
+"""
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Optional
+
+
+class AdmissionRejected(Exception):
+    """The request was shed; retry_after is a hint in seconds"""
+    def __init__(self, message: str, retry_after: int, status_code: int = 429):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.status_code = status_code
+
+
+class SlidingWindowLimiter:
+    """
+    Approximate sliding window: the previous fixed window's count is weighted
+    by how much of it still overlaps the sliding window. Memory is three
+    numbers per key, with at most max_keys keys kept (least recently seen
+    keys are dropped first).
+    """
+    def __init__(self, limit: int, window: float, max_keys: int = 100_000):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._keys: "OrderedDict[str, list]" = OrderedDict()
+
+    def _entry(self, key: str, now: float) -> list:
+        window_index = int(now // self.window)
+        entry = self._keys.get(key)
+        if entry is None:
+            entry = [window_index, 0, 0]  # window index, current count, previous count
+            self._keys[key] = entry
+            if len(self._keys) > self.max_keys:
+                self._keys.popitem(last=False)
+        else:
+            self._keys.move_to_end(key)
+            if window_index != entry[0]:
+                previous = entry[1] if window_index - entry[0] == 1 else 0
+                entry[:] = [window_index, 0, previous]
+        return entry
+
+    def retry_after(self, key: str, now: float) -> Optional[float]:
+        """Seconds until the next attempt fits, or None if it fits now"""
+        entry = self._entry(key, now)
+        window_end = (entry[0] + 1) * self.window
+        remaining = (window_end - now) / self.window
+        if entry[2] * remaining + entry[1] + 1 <= self.limit:
+            return None
+        if entry[1] + 1 > self.limit or not entry[2]:
+            return window_end - now
+        # Wait until enough of the previous window has slid out
+        needed = (entry[2] * remaining + entry[1] + 1 - self.limit) / entry[2]
+        return needed * self.window
+
+    def hit(self, key: str, now: float):
+        self._entry(key, now)[1] += 1
+
+    def __len__(self):
+        return len(self._keys)
+
+
+class SigninAdmission:
+    def __init__(self, ip_limit: int, email_limit: int, window: float, max_concurrent: int,
+                 max_queued: int, queue_timeout: float, max_keys: int = 100_000):
+        self.by_ip = SlidingWindowLimiter(ip_limit, window, max_keys)
+        self.by_email = SlidingWindowLimiter(email_limit, window, max_keys)
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self.in_flight = 0
+        self.queued = 0
+        self.metrics = {
+            "admitted": 0,
+            "shedByIp": 0,
+            "shedByEmail": 0,
+            "shedQueueFull": 0,
+            "shedQueueTimeout": 0,
+            "peakInFlight": 0,
+            "peakQueued": 0,
+        }
+
+    def admit(self, client_ip: str, email: str):
+        """
+        Record a sign-in attempt, or raise AdmissionRejected when the client IP
+        or the email is over its limit. Rejected attempts are not counted.
+        """
+        now = time.monotonic()
+        email_key = email.strip().lower()
+        wait = self.by_ip.retry_after(client_ip, now)
+        if wait is not None:
+            self.metrics["shedByIp"] += 1
+            raise AdmissionRejected("Too many sign-in attempts. Try again later.", math.ceil(wait))
+        wait = self.by_email.retry_after(email_key, now)
+        if wait is not None:
+            self.metrics["shedByEmail"] += 1
+            raise AdmissionRejected("Too many sign-in attempts. Try again later.", math.ceil(wait))
+        self.by_ip.hit(client_ip, now)
+        self.by_email.hit(email_key, now)
+        self.metrics["admitted"] += 1
+
+    @asynccontextmanager
+    async def verification(self):
+        """Hold one of the max_concurrent password verification slots"""
+        if self._slots.locked():
+            if self.queued >= self.max_queued:
+                self.metrics["shedQueueFull"] += 1
+                raise AdmissionRejected("Server is busy. Try again shortly.", 1, 503)
+            self.queued += 1
+            self.metrics["peakQueued"] = max(self.metrics["peakQueued"], self.queued)
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.metrics["shedQueueTimeout"] += 1
+                raise AdmissionRejected("Server is busy. Try again shortly.", 1, 503)
+            finally:
+                self.queued -= 1
+        else:
+            await self._slots.acquire()
+        self.in_flight += 1
+        self.metrics["peakInFlight"] = max(self.metrics["peakInFlight"], self.in_flight)
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            **self.metrics,
+            "inFlight": self.in_flight,
+            "queued": self.queued,
+            "maxConcurrent": self.max_concurrent,
+            "maxQueued": self.max_queued,
+            "trackedIps": len(self.by_ip),
+            "trackedEmails": len(self.by_email),
+        }
+
+    def reset_metrics(self):
+        for key in self.metrics:
+            self.metrics[key] = 0
@@ -0,0 +1,133 @@
+"""
+tracemalloc snapshots grouped by application module.
+Tracing is off unless started through the diagnostics API, so there is no
+allocation overhead in normal operation.
+"""
+import os
+import time
+import tracemalloc
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from app.helpers.Utilities import Utils
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIR = os.path.dirname(APP_DIR)
+IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _group_key(traceback: tracemalloc.Traceback, group_by: str) -> str:
+    """
+    Attribute an allocation to the innermost frame inside app/. Allocations
+    with no app frame are grouped by the external package that made them.
+    """
+    for frame in reversed(traceback):
+        if frame.filename.startswith(APP_DIR):
+            if group_by == "line":
+                return f"{os.path.relpath(frame.filename, PROJECT_DIR)}:{frame.lineno}"
+            module = os.path.splitext(os.path.relpath(frame.filename, PROJECT_DIR))[0]
+            return module.replace(os.sep, ".")
+    filename = traceback[-1].filename if len(traceback) else "<unknown>"
+    if "site-packages" + os.sep in filename:
+        package = filename.split("site-packages" + os.sep, 1)[1].split(os.sep, 1)[0]
+    else:
+        package = os.path.basename(filename)
+    return f"external:{package}"
+
+
+def _grouped(snapshot: tracemalloc.Snapshot, group_by: str) -> Dict[str, Tuple[int, int]]:
+    groups: Dict[str, Tuple[int, int]] = {}
+    for stat in snapshot.statistics("traceback"):
+        key = _group_key(stat.traceback, group_by)
+        size, count = groups.get(key, (0, 0))
+        groups[key] = (size + stat.size, count + stat.count)
+    return groups
+
+
+class AllocationTracker:
+    """Admin-driven tracemalloc sessions with a bounded snapshot store"""
+    max_snapshots: int = 5
+    _snapshots: "OrderedDict[str, dict]" = OrderedDict()
+
+    @classmethod
+    def is_tracing(cls) -> bool:
+        return tracemalloc.is_tracing()
+
+    @classmethod
+    def start(cls, nframes: int = 25):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(nframes)
+
+    @classmethod
+    def stop(cls):
+        """Stop tracing. Stored snapshots are kept until cleared."""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @classmethod
+    def status(cls) -> dict:
+        current, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        return {
+            "tracing": tracemalloc.is_tracing(),
+            "frames": tracemalloc.get_traceback_limit() if tracemalloc.is_tracing() else None,
+            "tracedBytes": current,
+            "peakBytes": peak,
+            "snapshots": [
+                {"id": snapshot_id, "label": entry["label"], "createdAt": entry["createdAt"]}
+                for snapshot_id, entry in cls._snapshots.items()
+            ],
+        }
+
+    @classmethod
+    def take_snapshot(cls, label: Optional[str] = None) -> str:
+        snapshot = tracemalloc.take_snapshot().filter_traces(IGNORED)
+        snapshot_id = Utils.generate_hex_string(12)
+        cls._snapshots[snapshot_id] = {"snapshot": snapshot, "label": label, "createdAt": time.time()}
+        while len(cls._snapshots) > cls.max_snapshots:
+            cls._snapshots.popitem(last=False)
+        return snapshot_id
+
+    @classmethod
+    def has_snapshot(cls, snapshot_id: str) -> bool:
+        return snapshot_id in cls._snapshots
+
+    @classmethod
+    def clear_snapshots(cls):
+        cls._snapshots.clear()
+
+    @classmethod
+    def top(cls, snapshot_id: str, limit: int = 20, group_by: str = "module") -> List[dict]:
+        """Largest allocation sites in a snapshot"""
+        groups = _grouped(cls._snapshots[snapshot_id]["snapshot"], group_by)
+        ranked = sorted(groups.items(), key=lambda item: item[1][0], reverse=True)
+        return [
+            {"site": key, "sizeBytes": size, "count": count}
+            for key, (size, count) in ranked[:limit]
+        ]
+
+    @classmethod
+    def diff(cls, base_id: str, target_id: str, limit: int = 20, group_by: str = "module") -> List[dict]:
+        """Allocation growth between two snapshots, largest change first"""
+        base = _grouped(cls._snapshots[base_id]["snapshot"], group_by)
+        target = _grouped(cls._snapshots[target_id]["snapshot"], group_by)
+        rows = []
+        for key in base.keys() | target.keys():
+            base_size, base_count = base.get(key, (0, 0))
+            size, count = target.get(key, (0, 0))
+            if size == base_size and count == base_count:
+                continue
+            rows.append({
+                "site": key,
+                "sizeBytes": size,
+                "sizeDiffBytes": size - base_size,
+                "count": count,
+                "countDiff": count - base_count,
+            })
+        rows.sort(key=lambda row: abs(row["sizeDiffBytes"]), reverse=True)
+        return rows[:limit]
@@ -0,0 +1,309 @@
+"""
+Async Azure Blob Storage helper.
+Uses the aio BlobServiceClient over one shared aiohttp connection pool so
+uploads, deletes and copies never block the event loop. Large payloads are
+split into blocks that are staged in parallel and committed at the end.
+Works against Azurite by pointing AZURE_STORAGE_CONNECTION_STRING at it
+(e.g. "UseDevelopmentStorage=true").
+"""
+import asyncio
+import logging
+import mimetypes
+import os
+import re
+import time
+import urllib.parse
+from typing import AsyncIterator, Optional
+
+import aiohttp
+from azure.core.pipeline.transport import AioHttpTransport
+from azure.storage.blob import ContentSettings
+from azure.storage.blob.aio import BlobServiceClient
+from app.config import get_settings
+from app.helpers.CopyJobs import SUCCESS, CopyJobManager
+from app.helpers.Utilities import Utils
+
+logger = logging.getLogger(__name__)
+
+DELETE_BATCH_SIZE = 256  # Service limit for blobs per batch request
+
+
+async def iter_file(file_path: str, chunk_size: int) -> AsyncIterator[bytes]:
+    """Read a local file in chunks without blocking the event loop"""
+    with open(file_path, "rb") as data:
+        while True:
+            chunk = await asyncio.to_thread(data.read, chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+class AsyncAzureBlobUploader:
+    def __init__(self):
+        try:
+            self.__connection_string = os.environ['AZURE_STORAGE_CONNECTION_STRING']
+            self.__container_name = os.environ['AZURE_STORAGE_CONTAINER']
+        except KeyError:
+            raise Exception("AZURE_STORAGE_CONNECTION_STRING and AZURE_STORAGE_CONTAINER must be set.")
+
+        settings = get_settings()
+        self.__max_connections = settings.AZURE_MAX_CONNECTIONS
+        self.__block_size = settings.AZURE_BLOCK_SIZE
+        self.__upload_concurrency = settings.AZURE_UPLOAD_CONCURRENCY
+        self.__delete_concurrency = settings.AZURE_DELETE_CONCURRENCY
+        self.__operations = asyncio.Semaphore(settings.AZURE_MAX_CONCURRENT_OPERATIONS)
+        self.__session: Optional[aiohttp.ClientSession] = None
+        self.__blob_service_client: Optional[BlobServiceClient] = None
+        self.copy_jobs = CopyJobManager(
+            self._get_client,
+            initial_delay=settings.COPY_POLL_INITIAL_SECONDS,
+            max_delay=settings.COPY_POLL_MAX_SECONDS,
+            timeout=settings.COPY_TIMEOUT_SECONDS,
+            history_size=settings.COPY_JOB_HISTORY_SIZE
+        )
+        self.__generate_random_hex_string = Utils.generate_hex_string
+
+    @property
+    def container_name(self) -> str:
+        return self.__container_name
+
+    def _get_client(self) -> BlobServiceClient:
+        """Create the shared client and connection pool on first use"""
+        if self.__blob_service_client is None:
+            self.__session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.__max_connections)
+            )
+            transport = AioHttpTransport(session=self.__session, session_owner=False)
+            self.__blob_service_client = BlobServiceClient.from_connection_string(
+                self.__connection_string,
+                transport=transport,
+                max_single_put_size=self.__block_size,
+                max_block_size=self.__block_size,
+            )
+        return self.__blob_service_client
+
+    async def close(self):
+        """Close the client and its connection pool"""
+        await self.copy_jobs.close()
+        if self.__blob_service_client is not None:
+            await self.__blob_service_client.close()
+            self.__blob_service_client = None
+        if self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+    def _destination_blob_name(self, file_extension: str, folder_name: str = None, file_name: str = None) -> str:
+        base_name = file_name or self.__generate_random_hex_string()
+        sanitized_filename = re.sub(r'[^a-zA-Z0-9_.-]', '_', base_name + file_extension)
+        if folder_name:
+            folder_name = re.sub(r'[^a-zA-Z0-9/_-]', '_', folder_name)
+            return f"{folder_name}/{sanitized_filename}"
+        return sanitized_filename
+
+    def blob_name_from_url(self, file_url: str) -> str:
+        """Extract the blob name from a full blob URL (account or emulator style)"""
+        path = urllib.parse.unquote(urllib.parse.urlparse(file_url).path)
+        marker = f"/{self.__container_name}/"
+        index = path.find(marker)
+        if index == -1:
+            raise ValueError("File URL does not belong to the configured container")
+        return path[index + len(marker):]
+
+    async def _upload_chunks(self, blob_client, chunks: AsyncIterator[bytes], content_settings: ContentSettings):
+        """
+        Upload a stream as a block blob. Small payloads go up in one request;
+        larger ones are cut into blocks with at most upload_concurrency blocks
+        in flight, so memory per upload stays bounded.
+        """
+        block_size = self.__block_size
+        buffer = bytearray()
+        block_ids = []
+        pending = set()
+
+        async def stage(block_id: str, data: bytes):
+            await blob_client.stage_block(block_id, data)
+
+        async def schedule(data: bytes):
+            nonlocal pending
+            while len(pending) >= self.__upload_concurrency:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task.result()
+            block_id = f"{len(block_ids):08d}"
+            block_ids.append(block_id)
+            pending.add(asyncio.ensure_future(stage(block_id, data)))
+
+        try:
+            async for chunk in chunks:
+                buffer += chunk
+                while len(buffer) >= block_size:
+                    data = bytes(buffer[:block_size])
+                    del buffer[:block_size]
+                    await schedule(data)
+
+            if not block_ids:
+                await blob_client.upload_blob(bytes(buffer), overwrite=True, content_settings=content_settings)
+                return
+
+            if buffer:
+                await schedule(bytes(buffer))
+            if pending:
+                await asyncio.gather(*pending)
+                pending = set()
+            await blob_client.commit_block_list(block_ids, content_settings=content_settings)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def upload_stream(self, chunks: AsyncIterator[bytes], file_extension: str = "", folder_name: str = None,
+                            content_type: str = None, file_name: str = None) -> str:
+        """
+        Upload an async stream of bytes and return the blob URL. Raises on failure.
+        """
+        destination_blob_name = self._destination_blob_name(file_extension, folder_name, file_name)
+        blob_client = self._get_client().get_blob_client(self.__container_name, destination_blob_name)
+        content_settings = ContentSettings(content_type=content_type or 'application/octet-stream')
+        async with self.__operations:
+            await self._upload_chunks(blob_client, chunks, content_settings)
+        return blob_client.url
+
+    async def upload_file_to_azure_blob(self, file_path, folder_name=None, file_type=".png"):
+        file_extension = os.path.splitext(file_path)[1]
+        mime_type, _ = mimetypes.guess_type(file_path)
+        try:
+            return await self.upload_stream(
+                iter_file(file_path, self.__block_size),
+                file_extension,
+                folder_name,
+                mime_type or 'application/octet-stream'
+            )
+        except Exception as e:
+            logger.error("Failed to upload %s to Azure Blob Storage. Error: %s", file_path, e)
+            return None
+
+    async def upload_excel_file_to_azure_blob(self, file_path, folder_name=None, file_name=None, file_type=".png"):
+        file_extension = os.path.splitext(file_path)[1]
+        mime_type, _ = mimetypes.guess_type(file_path)
+        try:
+            return await self.upload_stream(
+                iter_file(file_path, self.__block_size),
+                file_extension,
+                folder_name,
+                mime_type or 'application/octet-stream',
+                file_name=file_name
+            )
+        except Exception as e:
+            logger.error("Failed to upload %s to Azure Blob Storage. Error: %s", file_path, e)
+            return None
+
+    async def download(self, blob_name: str) -> bytes:
+        """Download a blob's content by name"""
+        blob_client = self._get_client().get_blob_client(container=self.__container_name, blob=blob_name)
+        async with self.__operations:
+            downloader = await blob_client.download_blob()
+            return await downloader.readall()
+
+    async def delete_file(self, file_url: str):
+        """Delete file from Azure Blob Storage using full file URL."""
+        blob_name = self.blob_name_from_url(file_url)
+        blob_client = self._get_client().get_blob_client(container=self.__container_name, blob=blob_name)
+        async with self.__operations:
+            await blob_client.delete_blob()
+
+    async def _delete_batch(self, container_client, blob_names) -> tuple:
+        """Delete up to DELETE_BATCH_SIZE blobs in one request; returns (deleted, failed)"""
+        deleted = failed = 0
+        async with self.__operations:
+            responses = await container_client.delete_blobs(
+                *blob_names, delete_snapshots="include", raise_on_any_failure=False
+            )
+            async for response in responses:
+                if response.status_code == 202:
+                    deleted += 1
+                elif response.status_code != 404:  # Already gone counts as neither
+                    failed += 1
+        return deleted, failed
+
+    async def clear_folder(self, prefix: str) -> dict:
+        """
+        Delete every blob under a folder prefix. Names are listed page by page
+        and deleted in batch requests of up to 256 blobs, with at most
+        AZURE_DELETE_CONCURRENCY batches in flight.
+        """
+        started = time.perf_counter()
+        prefix = prefix.strip("/")
+        if not prefix:
+            raise ValueError("Refusing to clear the whole container")
+        prefix += "/"
+        container_client = self._get_client().get_container_client(self.__container_name)
+        totals = {"deleted": 0, "failed": 0}
+        pending = set()
+
+        def collect(done):
+            for task in done:
+                deleted, failed = task.result()
+                totals["deleted"] += deleted
+                totals["failed"] += failed
+
+        async def schedule(blob_names):
+            nonlocal pending
+            while len(pending) >= self.__delete_concurrency:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                collect(done)
+            pending.add(asyncio.ensure_future(self._delete_batch(container_client, blob_names)))
+
+        try:
+            batch = []
+            async for blob_name in container_client.list_blob_names(name_starts_with=prefix):
+                batch.append(blob_name)
+                if len(batch) == DELETE_BATCH_SIZE:
+                    await schedule(batch)
+                    batch = []
+            if batch:
+                await schedule(batch)
+            if pending:
+                done, pending = await asyncio.wait(pending)
+                collect(done)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        logger.info("Cleared %s blobs under '%s' in %sms (%s failed)",
+                    totals["deleted"], prefix, elapsed_ms, totals["failed"])
+        return {**totals, "elapsedMs": elapsed_ms}
+
+    async def upload_file_to_operator_folder(self, file_path: str, operator_id: str, folder_name: str = None,
+                                             file_type=".png"):
+        """
+        Uploads a file after clearing existing operator folder if present.
+        """
+        if folder_name:
+            full_folder_path = f"{operator_id}/{folder_name}"
+            # Clear the folder name uploads are actually written under
+            await self.clear_folder(re.sub(r'[^a-zA-Z0-9/_-]', '_', full_folder_path))
+        else:
+            full_folder_path = operator_id
+
+        return await self.upload_file_to_azure_blob(file_path, folder_name=full_folder_path, file_type=file_type)
+
+    def copy_destination_blob_name(self, folder_name=None, file_type=".png") -> str:
+        destination_blob_name = self.__generate_random_hex_string() + file_type
+        if folder_name:
+            destination_blob_name = f"{folder_name}/{destination_blob_name}"
+        return destination_blob_name
+
+    async def copy_and_upload_to_azure_blob(self, image_url, container_name='temp', folder_name=None, file_type=".png"):
+        """
+        Copy a blob from a URL server-side and wait for it without blocking
+        the event loop. Returns the new blob URL, or None if the copy failed
+        or was aborted after COPY_TIMEOUT_SECONDS.
+        """
+        destination_blob_name = self.copy_destination_blob_name(folder_name, file_type)
+        async with self.__operations:
+            job = await self.copy_jobs.start(image_url, container_name, destination_blob_name)
+        result = await self.copy_jobs.wait(job.id)
+        if result["status"] == SUCCESS:
+            return result["destinationUrl"]
+        logger.error("Copy of %s ended with status %s: %s", image_url, result["status"], result["error"])
+        return None
@@ -6,6 +6,7 @@ from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo.errors import ConnectionFailure
 import os
 import certifi
+from app.helpers.DbMetrics import DbCommandListener
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -18,7 +19,7 @@ class AsyncMongoDB:
     @classmethod
     def connect(cls, uri: str):
         """Establish async MongoDB connection"""
-        cls.client = AsyncIOMotorClient(uri, tlsCAFile=certifi.where())
+        cls.client = AsyncIOMotorClient(uri, tlsCAFile=certifi.where(), event_listeners=[DbCommandListener()])
 
     @classmethod
     def get_database(cls, db_name: str):
@@ -1,4 +1,7 @@
 import os
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from azure.storage.blob import BlobServiceClient
 from app.helpers.Utilities import Utils
 import urllib.parse
@@ -8,6 +11,11 @@ import mimetypes
 import urllib
 from azure.storage.blob import ContentSettings
 
+logger = logging.getLogger(__name__)
+
+DELETE_BATCH_SIZE = 256  # Service limit for blobs per batch request
+DELETE_CONCURRENCY = 4
+
 
 class AzureBlobUploader:
     def __init__(self):
@@ -28,6 +36,53 @@ class AzureBlobUploader:
         blob_client = self.__blob_service_client.get_blob_client(container=self.__container_name, blob=blob_name)
         blob_client.delete_blob()
 
+    def _delete_batch(self, blob_names) -> tuple:
+        """Delete up to DELETE_BATCH_SIZE blobs in one request; returns (deleted, failed)"""
+        deleted = failed = 0
+        responses = self.__container_client.delete_blobs(
+            *blob_names, delete_snapshots="include", raise_on_any_failure=False
+        )
+        for response in responses:
+            if response.status_code == 202:
+                deleted += 1
+            elif response.status_code != 404:
+                failed += 1
+        return deleted, failed
+
+    def clear_folder(self, operator_id: str, folder_name: str) -> dict:
+        """
+        Delete every blob under {operator_id}/{folder_name}/ using batch
+        requests of up to 256 blobs, a few batches at a time.
+        """
+        started = time.perf_counter()
+        prefix = re.sub(r'[^a-zA-Z0-9/_-]', '_', f"{operator_id}/{folder_name}").strip("/") + "/"
+        totals = [0, 0]
+        with ThreadPoolExecutor(max_workers=DELETE_CONCURRENCY) as executor:
+            in_flight = deque()
+
+            def collect(future):
+                batch_deleted, batch_failed = future.result()
+                totals[0] += batch_deleted
+                totals[1] += batch_failed
+
+            batch = []
+            for blob_name in self.__container_client.list_blob_names(name_starts_with=prefix):
+                batch.append(blob_name)
+                if len(batch) == DELETE_BATCH_SIZE:
+                    if len(in_flight) >= DELETE_CONCURRENCY:
+                        collect(in_flight.popleft())
+                    in_flight.append(executor.submit(self._delete_batch, batch))
+                    batch = []
+            if batch:
+                in_flight.append(executor.submit(self._delete_batch, batch))
+            while in_flight:
+                collect(in_flight.popleft())
+        deleted, failed = totals
+
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        logger.info("Cleared %s blobs under '%s' in %sms (%s failed)", deleted, prefix, elapsed_ms, failed)
+        return {"deleted": deleted, "failed": failed, "elapsedMs": elapsed_ms}
+
     def copy_and_upload_to_azure_blob(self, image_url, container_name='temp', folder_name=None, file_type=".png"):
         container_client = self.__blob_service_client.get_container_client(container_name)
 
@@ -39,13 +94,19 @@ class AzureBlobUploader:
 
         copied_blob.start_copy_from_url(image_url)
 
-        for _ in range(60):
+        # Back off between polls; async callers should use the copy job manager instead
+        deadline = time.monotonic() + 60
+        delay = 0.25
+        while time.monotonic() < deadline:
             props = copied_blob.get_blob_properties()
             status = props.copy.status
             if status == "success":
                 copied_blob_url = f"https://{self.__blob_service_client.account_name}.blob.core.windows.net/{container_name}/{destination_blob_name}"
                 return copied_blob_url
-            time.sleep(1)
+            if status in ("failed", "aborted"):
+                return None
+            time.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+            delay = min(delay * 2, 8)
 
         props = copied_blob.get_blob_properties()
         copy_id = props.copy.id
@@ -83,7 +144,7 @@ class AzureBlobUploader:
             uploaded_blob_url = f"https://{self.__blob_service_client.account_name}.blob.core.windows.net/{container_name}/{destination_blob_name}"
             return uploaded_blob_url
         except Exception as e:
-            print(f"Failed to upload {file_path} to Azure Blob Storage. Error: {str(e)}")
+            logger.error("Failed to upload %s to Azure Blob Storage. Error: %s", file_path, e)
             return None
         
 
@@ -133,6 +194,6 @@ class AzureBlobUploader:
                 uploaded_blob_url = f"https://{self.__blob_service_client.account_name}.blob.core.windows.net/{container_name}/{destination_blob_name}"
                 return uploaded_blob_url
             except Exception as e:
-                print(f"Failed to upload {file_path} to Azure Blob Storage. Error: {str(e)}")
+                logger.error("Failed to upload %s to Azure Blob Storage. Error: %s", file_path, e)
                 return None
             
\ No newline at end of file
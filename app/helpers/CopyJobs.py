@@ -0,0 +1,218 @@
+"""
+Server-side blob copy jobs.
+Copies are started with start_copy_from_url and tracked on the event loop:
+each job polls its blob's copy status with exponential backoff, copies that
+exceed the timeout are aborted, and callers can await a job or subscribe to
+its status changes instead of blocking a worker.
+"""
+import asyncio
+import logging
+import random
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set
+
+from app.helpers.Utilities import Utils
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+SUCCESS = "success"
+FAILED = "failed"
+ABORTED = "aborted"
+TERMINAL_STATUSES = (SUCCESS, FAILED, ABORTED)
+
+
+class CopyJobNotFound(KeyError):
+    """No copy job with the given id"""
+
+
+class CopyJob:
+    def __init__(self, source_url: str, container_name: str, blob_name: str, destination_url: str):
+        self.id = Utils.generate_hex_string(16)
+        self.source_url = source_url
+        self.container_name = container_name
+        self.blob_name = blob_name
+        self.destination_url = destination_url
+        self.status = PENDING
+        self.copy_id: Optional[str] = None
+        self.bytes_copied: Optional[int] = None
+        self.total_bytes: Optional[int] = None
+        self.error: Optional[str] = None
+        self.polls = 0
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.done = asyncio.get_running_loop().create_future()
+        self.subscribers: Set[asyncio.Queue] = set()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def update(self, status: str, progress: Optional[str] = None, error: Optional[str] = None):
+        """Record a status change and notify waiters and subscribers"""
+        changed = status != self.status or error != self.error
+        if progress and "/" in progress:
+            copied, total = progress.split("/", 1)
+            if copied.isdigit() and total.isdigit():
+                changed = changed or int(copied) != self.bytes_copied
+                self.bytes_copied, self.total_bytes = int(copied), int(total)
+        self.status = status
+        self.error = error
+        self.updated_at = time.time()
+        if not changed:
+            return
+        snapshot = self.to_dict()
+        for queue in self.subscribers:
+            queue.put_nowait(snapshot)
+        if self.finished and not self.done.done():
+            self.done.set_result(snapshot)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "sourceUrl": self.source_url,
+            "destinationUrl": self.destination_url,
+            "containerName": self.container_name,
+            "blobName": self.blob_name,
+            "bytesCopied": self.bytes_copied,
+            "totalBytes": self.total_bytes,
+            "error": self.error,
+            "polls": self.polls,
+            "createdAt": self.created_at,
+            "updatedAt": self.updated_at,
+        }
+
+
+class CopyJobManager:
+    """
+    Tracks concurrent copy jobs for one BlobServiceClient. Poll delays start
+    at initial_delay and double (with jitter) up to max_delay, so a burst of
+    long copies costs a few requests per job per minute rather than one a second.
+    """
+    def __init__(self, client_factory: Callable, initial_delay: float = 0.5, max_delay: float = 10.0,
+                 timeout: float = 300.0, history_size: int = 500):
+        self._client_factory = client_factory
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.history_size = history_size
+        self._jobs: "OrderedDict[str, CopyJob]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def _blob_client(self, job: CopyJob):
+        return self._client_factory().get_blob_client(job.container_name, job.blob_name)
+
+    async def start(self, source_url: str, container_name: str, blob_name: str) -> CopyJob:
+        """Start a server-side copy and begin tracking it"""
+        blob_client = self._client_factory().get_blob_client(container_name, blob_name)
+        job = CopyJob(source_url, container_name, blob_name, blob_client.url)
+        result = await blob_client.start_copy_from_url(source_url)
+        job.copy_id = result.get("copy_id")
+        self._remember(job)
+        # Small blobs in the same account usually complete synchronously
+        job.update(result.get("copy_status") or PENDING)
+        if not job.finished:
+            task = asyncio.ensure_future(self._poll(job))
+            self._tasks[job.id] = task
+            task.add_done_callback(lambda _: self._tasks.pop(job.id, None))
+        return job
+
+    def _remember(self, job: CopyJob):
+        self._jobs[job.id] = job
+        if len(self._jobs) > self.history_size:
+            for job_id in [job_id for job_id, tracked in self._jobs.items() if tracked.finished]:
+                if len(self._jobs) <= self.history_size:
+                    break
+                del self._jobs[job_id]
+
+    async def _poll(self, job: CopyJob):
+        delay = self.initial_delay
+        deadline = job.created_at + self.timeout
+        blob_client = self._blob_client(job)
+        try:
+            while not job.finished:
+                jittered = delay * random.uniform(0.8, 1.2)
+                await asyncio.sleep(min(jittered, max(deadline - time.time(), 0)))
+                if time.time() >= deadline:
+                    await self._abort(job, "Copy timed out")
+                    return
+                job.polls += 1
+                try:
+                    props = await blob_client.get_blob_properties()
+                except Exception as e:
+                    logger.warning("Polling copy job %s failed: %s", job.id, e)
+                else:
+                    copy = props.copy
+                    job.update(copy.status or PENDING, copy.progress, copy.status_description)
+                delay = min(delay * 2, self.max_delay)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Copy job %s failed: %s", job.id, e)
+            job.update(FAILED, error=str(e))
+
+    async def _abort(self, job: CopyJob, reason: str):
+        blob_client = self._blob_client(job)
+        try:
+            if job.copy_id:
+                await blob_client.abort_copy(job.copy_id)
+        except Exception as e:
+            logger.warning("Aborting copy job %s failed: %s", job.id, e)
+            # The copy may have finished in the meantime; report what happened
+            try:
+                copy = (await blob_client.get_blob_properties()).copy
+                if copy.status in TERMINAL_STATUSES:
+                    job.update(copy.status, copy.progress, copy.status_description)
+                    return
+            except Exception:
+                pass
+        job.update(ABORTED, error=reason)
+
+    def get(self, job_id: str) -> CopyJob:
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise CopyJobNotFound(job_id)
+        return job
+
+    def list_jobs(self, status: Optional[str] = None) -> List[dict]:
+        return [job.to_dict() for job in reversed(self._jobs.values()) if status is None or job.status == status]
+
+    async def abort(self, job_id: str) -> CopyJob:
+        """Abort a running copy; finished jobs are returned unchanged"""
+        job = self.get(job_id)
+        if not job.finished:
+            task = self._tasks.pop(job_id, None)
+            if task is not None:
+                task.cancel()
+            await self._abort(job, "Aborted by request")
+        return job
+
+    async def wait(self, job_id: str, timeout: Optional[float] = None) -> dict:
+        """Wait for a job to finish; raises asyncio.TimeoutError after timeout seconds"""
+        job = self.get(job_id)
+        return await asyncio.wait_for(asyncio.shield(job.done), timeout)
+
+    async def subscribe(self, job_id: str) -> AsyncIterator[dict]:
+        """Yield the job's current state, then every change until it finishes"""
+        job = self.get(job_id)
+        queue: asyncio.Queue = asyncio.Queue()
+        job.subscribers.add(queue)
+        try:
+            snapshot = job.to_dict()
+            while True:
+                yield snapshot
+                if snapshot["status"] in TERMINAL_STATUSES:
+                    return
+                snapshot = await queue.get()
+        finally:
+            job.subscribers.discard(queue)
+
+    async def close(self):
+        """Stop polling; copies keep running server-side"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
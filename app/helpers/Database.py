@@ -2,6 +2,7 @@ from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo.errors import ConnectionFailure
 import os
 import certifi
+from app.helpers.DbMetrics import DbCommandListener
 
 from dotenv import load_dotenv
 
@@ -14,7 +15,7 @@ class MongoDB:
     @classmethod
     def connect(cls, uri: str):
         """Connect to MongoDB using Motor async client"""
-        cls.client = AsyncIOMotorClient(uri, tlsCAFile=certifi.where())
+        cls.client = AsyncIOMotorClient(uri, tlsCAFile=certifi.where(), event_listeners=[DbCommandListener()])
 
     @classmethod
     def get_database(cls, db_name: str):
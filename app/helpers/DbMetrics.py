@@ -0,0 +1,146 @@
+"""
+Per-request MongoDB round-trip accounting.
+A PyMongo command listener counts every command sent on behalf of the
+current request (Motor copies the context into its executor threads), and
+the per-route distribution is kept as a histogram.
+"""
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional, Tuple
+from pymongo import monitoring
+
+HISTOGRAM_BUCKETS = (0, 1, 2, 3, 4, 5, 6, 8, 10, 15, 20, 30, 50)
+REPEATED_COMMAND_THRESHOLD = 5
+
+
+class RequestDbStats:
+    """Round trips made while serving a single request"""
+    def __init__(self):
+        self.round_trips = 0
+        self.duration_ms = 0.0
+        self.budget: Optional[int] = None
+        self.commands: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def record_started(self, command_name: str, collection: str):
+        with self._lock:
+            self.round_trips += 1
+            key = (command_name, collection)
+            self.commands[key] = self.commands.get(key, 0) + 1
+
+    def record_finished(self, duration_micros: int):
+        with self._lock:
+            self.duration_ms += duration_micros / 1000
+
+    def repeated_commands(self, threshold: int = REPEATED_COMMAND_THRESHOLD) -> Dict[str, int]:
+        """Commands issued repeatedly against one collection, a typical N+1 pattern"""
+        return {
+            f"{command}:{collection}": count
+            for (command, collection), count in self.commands.items()
+            if count >= threshold and command != "getMore"
+        }
+
+
+db_stats_var: ContextVar[Optional[RequestDbStats]] = ContextVar("db_stats", default=None)
+
+
+class DbCommandListener(monitoring.CommandListener):
+    """Attributes PyMongo commands to the request in the current context"""
+    def started(self, event):
+        stats = db_stats_var.get()
+        if stats is not None:
+            collection = event.command.get(event.command_name)
+            stats.record_started(event.command_name, collection if isinstance(collection, str) else "")
+
+    def succeeded(self, event):
+        stats = db_stats_var.get()
+        if stats is not None:
+            stats.record_finished(event.duration_micros)
+
+    def failed(self, event):
+        stats = db_stats_var.get()
+        if stats is not None:
+            stats.record_finished(event.duration_micros)
+
+
+@contextmanager
+def track_round_trips() -> Iterator[RequestDbStats]:
+    """
+    Count round trips made inside the block, e.g. in tests:
+
+        with track_round_trips() as stats:
+            await service.signup(user)
+        assert stats.round_trips <= 1
+    """
+    stats = RequestDbStats()
+    token = db_stats_var.set(stats)
+    try:
+        yield stats
+    finally:
+        db_stats_var.reset(token)
+
+
+class DbRoundTripBudget:
+    """
+    Route dependency declaring how many round trips a request may make:
+
+        @router.get("/me", dependencies=[Depends(DbRoundTripBudget(1))])
+    """
+    def __init__(self, budget: int):
+        self.budget = budget
+
+    def __call__(self):
+        stats = db_stats_var.get()
+        if stats is not None:
+            stats.budget = self.budget
+
+
+class DbMetrics:
+    """Per-route histogram of round trips per request"""
+    _lock = threading.Lock()
+    _routes: Dict[str, dict] = {}
+
+    @classmethod
+    def observe(cls, route: str, stats: RequestDbStats):
+        index = bisect_left(HISTOGRAM_BUCKETS, stats.round_trips)
+        with cls._lock:
+            entry = cls._routes.get(route)
+            if entry is None:
+                entry = {
+                    "requests": 0,
+                    "roundTrips": 0,
+                    "maxRoundTrips": 0,
+                    "dbTimeMs": 0.0,
+                    "overBudget": 0,
+                    "budget": stats.budget,
+                    "buckets": [0] * (len(HISTOGRAM_BUCKETS) + 1),
+                }
+                cls._routes[route] = entry
+            entry["requests"] += 1
+            entry["roundTrips"] += stats.round_trips
+            entry["maxRoundTrips"] = max(entry["maxRoundTrips"], stats.round_trips)
+            entry["dbTimeMs"] += stats.duration_ms
+            entry["budget"] = stats.budget
+            entry["buckets"][index] += 1
+            if stats.budget is not None and stats.round_trips > stats.budget:
+                entry["overBudget"] += 1
+
+    @classmethod
+    def snapshot(cls) -> dict:
+        labels = [f"le_{bound}" for bound in HISTOGRAM_BUCKETS] + ["inf"]
+        with cls._lock:
+            return {
+                route: {
+                    **{key: value for key, value in entry.items() if key != "buckets"},
+                    "dbTimeMs": round(entry["dbTimeMs"], 3),
+                    "histogram": dict(zip(labels, entry["buckets"])),
+                }
+                for route, entry in cls._routes.items()
+            }
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._routes.clear()
@@ -0,0 +1,153 @@
+"""
+Profile picture derivatives.
+Images are decoded and resized in the shared process pool so the event loop
+never runs Pillow. Derivatives are stored in a content-addressed cache under
+CACHE_DIR, keyed by the SHA-256 of the uploaded image and the target edge,
+with least-recently-used eviction once the cache exceeds its size budget.
+"""
+import asyncio
+import io
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from PIL import Image, ImageOps
+
+DERIVATIVE_FORMAT = "WEBP"
+DERIVATIVE_EXTENSION = ".webp"
+DERIVATIVE_CONTENT_TYPE = "image/webp"
+IMAGES_ROUTE = "/api/v1/images"
+
+
+def parse_edges(value: str) -> Tuple[int, ...]:
+    """Parse a comma-separated list of edge lengths, e.g. "64,128,256" """
+    return tuple(sorted({int(edge) for edge in value.split(",") if edge.strip()}))
+
+
+def render_variants(data: bytes, edges: Iterable[int], max_pixels: int) -> Dict[int, bytes]:
+    """
+    Decode an image and encode one WebP per target edge, never upscaling.
+    Runs in a worker process; each variant is resized from the previous,
+    larger one to keep the work proportional to the output size.
+    """
+    Image.MAX_IMAGE_PIXELS = max_pixels
+    variants: Dict[int, bytes] = {}
+    with Image.open(io.BytesIO(data)) as opened:
+        image = ImageOps.exif_transpose(opened)
+        has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+        image = image.convert("RGBA" if has_alpha else "RGB")
+        for edge in sorted(set(edges), reverse=True):
+            image.thumbnail((edge, edge), Image.LANCZOS)
+            buffer = io.BytesIO()
+            image.save(buffer, DERIVATIVE_FORMAT, quality=85, method=4)
+            variants[edge] = buffer.getvalue()
+    return variants
+
+
+async def render_variants_async(executor, data: bytes, edges: Iterable[int], max_pixels: int) -> Dict[int, bytes]:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, render_variants, data, tuple(edges), max_pixels)
+
+
+class DerivativeCache:
+    """Content-addressed on-disk cache with LRU size eviction"""
+    def __init__(self, root: str, max_bytes: int):
+        self.root = os.path.realpath(root)
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._size = 0
+        self._loaded = False
+        self._lock = asyncio.Lock()
+
+    def path_for(self, digest: str, edge: int) -> str:
+        return os.path.join(self.root, digest[:2], f"{digest}-{edge}{DERIVATIVE_EXTENSION}")
+
+    def _scan(self):
+        """Index existing cache files, oldest first, so eviction order survives restarts"""
+        found = []
+        for directory, _, files in os.walk(self.root):
+            for name in files:
+                if name.startswith("."):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat_result = os.stat(path)
+                except OSError:
+                    continue
+                found.append((stat_result.st_mtime, path, stat_result.st_size))
+        found.sort()
+        return found
+
+    async def _ensure_loaded(self):
+        if self._loaded:
+            return
+        async with self._lock:
+            if self._loaded:
+                return
+            await asyncio.to_thread(os.makedirs, self.root, exist_ok=True)
+            for _, path, size in await asyncio.to_thread(self._scan):
+                self._entries[path] = size
+                self._size += size
+            self._loaded = True
+
+    async def get(self, digest: str, edge: int) -> Optional[Tuple[str, os.stat_result]]:
+        """Return the cached derivative's path and stat, marking it most recently used"""
+        await self._ensure_loaded()
+        path = self.path_for(digest, edge)
+        if path not in self._entries:
+            return None
+        try:
+            stat_result = await asyncio.to_thread(os.stat, path)
+        except FileNotFoundError:
+            self._size -= self._entries.pop(path, 0)
+            return None
+        if path in self._entries:
+            self._entries.move_to_end(path)
+        return path, stat_result
+
+    async def put(self, digest: str, edge: int, data: bytes) -> str:
+        await self._ensure_loaded()
+        path = self.path_for(digest, edge)
+
+        def _write():
+            directory = os.path.dirname(path)
+            os.makedirs(directory, exist_ok=True)
+            # Unique per writer: the same derivative may be written concurrently
+            # (identical uploads, an upload racing a rebuild). Paths are content
+            # addressed, so whichever replace lands last leaves the same bytes.
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix="." + os.path.basename(path) + ".", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    file.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except FileNotFoundError:
+                    pass
+                raise
+
+        await asyncio.to_thread(_write)
+        self._size += len(data) - self._entries.pop(path, 0)
+        self._entries[path] = len(data)
+        await self._evict()
+        return path
+
+    async def _evict(self):
+        victims = []
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            path, size = self._entries.popitem(last=False)
+            self._size -= size
+            victims.append(path)
+        if victims:
+            def _unlink():
+                for path in victims:
+                    try:
+                        os.unlink(path)
+                    except FileNotFoundError:
+                        pass
+            await asyncio.to_thread(_unlink)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "sizeBytes": self._size, "maxBytes": self.max_bytes}
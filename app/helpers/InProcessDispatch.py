@@ -0,0 +1,106 @@
+"""
+In-process dispatch of HTTP requests through the application's router.
+The sub-request skips the network, the middleware stack and (when the
+caller passes a verified token in its state) JWT verification, but runs
+the same routing, validation, dependencies and handlers as a real request.
+"""
+import asyncio
+import json
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+# x-forwarded-for keeps per-IP limits (e.g. sign-in admission) on the real client
+FORWARDED_HEADERS = (b"authorization", b"accept-language", b"user-agent", b"x-forwarded-for")
+
+
+class SubResponse:
+    __slots__ = ("status", "headers", "body", "route_path")
+
+    def __init__(self, status: int, headers: List[Tuple[bytes, bytes]], body: bytes, route_path: Optional[str] = None):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.route_path = route_path  # Matched route template, e.g. /api/v1/companies/{company_id}
+
+    def json(self) -> Any:
+        content_type = next((value for name, value in self.headers if name == b"content-type"), b"")
+        if not self.body:
+            return None
+        if content_type.startswith(b"application/json"):
+            return json.loads(self.body)
+        return self.body.decode("utf-8", "replace")
+
+
+def _error_body(detail: Any) -> bytes:
+    return json.dumps({"detail": detail}).encode()
+
+
+async def dispatch(
+    app,
+    parent_scope: Dict[str, Any],
+    method: str,
+    path: str,
+    body: Any = None,
+    state: Optional[Dict[str, Any]] = None,
+) -> SubResponse:
+    """
+    Run one request through app.router and return the buffered response.
+    Routing errors (404/405) and unhandled exceptions become responses.
+    """
+    url = urlsplit(path)
+    payload = json.dumps(body).encode() if body is not None else b""
+    headers = [(name, value) for name, value in parent_scope["headers"] if name in FORWARDED_HEADERS]
+    if payload:
+        headers += [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())]
+
+    scope = {
+        "type": "http",
+        "asgi": parent_scope.get("asgi", {"version": "3.0"}),
+        "http_version": parent_scope.get("http_version", "1.1"),
+        "method": method,
+        "scheme": parent_scope.get("scheme", "http"),
+        "server": parent_scope.get("server"),
+        "client": parent_scope.get("client"),
+        "root_path": parent_scope.get("root_path", ""),
+        "path": url.path,
+        "raw_path": url.path.encode(),
+        "query_string": url.query.encode(),
+        "headers": headers,
+        "app": app,
+        "state": dict(state or {}),
+        # Set by ExceptionMiddleware for the outer request; route handlers use it
+        # to turn HTTPException and validation errors into responses
+        "starlette.exception_handlers": parent_scope["starlette.exception_handlers"],
+    }
+
+    body_sent = False
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        # The client never disconnects; responses cancel this wait when done
+        await asyncio.Future()
+
+    start: Dict[str, Any] = {}
+    chunks: List[bytes] = []
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            start.update(message)
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await app.router(scope, receive, send)
+    except StarletteHTTPException as e:
+        return SubResponse(e.status_code, [(b"content-type", b"application/json")], _error_body(e.detail))
+    route = scope.get("route")
+    return SubResponse(
+        start.get("status", 500),
+        list(start.get("headers", [])),
+        b"".join(chunks),
+        getattr(route, "path", None)
+    )
@@ -0,0 +1,161 @@
+"""
+Non-blocking structured logging.
+Records are rendered to JSON and written to stdout by a background thread.
+The event loop only does a non-blocking put onto a bounded queue; when the
+queue is full the record is dropped and counted instead of blocking.
+"""
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Iterable, Optional, Tuple
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "request_id"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Render a record as a single JSON line"""
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "requestId": getattr(record, "request_id", None),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class RequestIdFilter(logging.Filter):
+    """Attach the current request ID to every record"""
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Rate-limit high-volume warnings and errors from selected loggers.
+    Each (logger, message template) may emit `burst` records per window;
+    after that only one in `rate` is emitted, carrying the suppressed count.
+    """
+    def __init__(self, loggers: Iterable[str], burst: int = 20, window: float = 10.0, rate: int = 100):
+        super().__init__()
+        self.loggers = tuple(loggers)
+        self.burst = burst
+        self.window = window
+        self.rate = max(rate, 1)
+        self._lock = threading.Lock()
+        # key -> [window_start, seen, suppressed]
+        self._counters: Dict[Tuple[str, str], list] = {}
+
+    def _sampled(self, name: str) -> bool:
+        return any(name == logger or name.startswith(logger + ".") for logger in self.loggers)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING or not self._sampled(record.name):
+            return True
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None or now - counter[0] >= self.window:
+                if len(self._counters) > 1000:
+                    self._counters.clear()
+                counter = [now, 0, 0]
+                self._counters[key] = counter
+            counter[1] += 1
+            if counter[1] <= self.burst or counter[1] % self.rate == 0:
+                if counter[2]:
+                    record.suppressed = counter[2]
+                    counter[2] = 0
+                return True
+            counter[2] += 1
+            return False
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full"""
+    dropped: int = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback here so the record no longer
+        # references frames or arguments; JSON rendering happens on the writer thread.
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            NonBlockingQueueHandler.dropped += 1
+
+
+class Logger:
+    """Process-wide logging pipeline manager"""
+    _listener: Optional[QueueListener] = None
+    _handler: Optional[NonBlockingQueueHandler] = None
+
+    @classmethod
+    def setup(
+        cls,
+        level: str = "INFO",
+        queue_size: int = 10000,
+        sampled_loggers: Iterable[str] = (),
+        sample_burst: int = 20,
+        sample_window: float = 10.0,
+        sample_rate: int = 100,
+    ):
+        """Install the queue handler on the root logger and start the writer thread"""
+        if cls._listener is not None:
+            return
+        log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(JsonFormatter())
+
+        cls._handler = NonBlockingQueueHandler(log_queue)
+        cls._handler.addFilter(RequestIdFilter())
+        cls._handler.addFilter(SamplingFilter(sampled_loggers, sample_burst, sample_window, sample_rate))
+
+        root = logging.getLogger()
+        root.addHandler(cls._handler)
+        root.setLevel(level)
+
+        cls._listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        cls._listener.start()
+
+    @classmethod
+    def shutdown(cls):
+        """Flush queued records and stop the writer thread"""
+        if cls._listener is None:
+            return
+        cls._listener.stop()
+        logging.getLogger().removeHandler(cls._handler)
+        cls._listener = None
+        cls._handler = None
+
+    @classmethod
+    def stats(cls) -> dict:
+        return {
+            "running": cls._listener is not None,
+            "queued": cls._handler.queue.qsize() if cls._handler else 0,
+            "dropped": NonBlockingQueueHandler.dropped,
+        }
@@ -0,0 +1,161 @@
+"""
+Slow-callback detector for the asyncio event loop.
+Times every loop callback, samples the stack of callbacks that run past the
+threshold and aggregates them by the application call site that blocked.
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STACK_LIMIT = 30
+
+
+class LoopMonitor:
+    """Opt-in event loop blocking detector (disabled unless installed)"""
+    threshold: float = 0.1
+    max_sites: int = 200
+    _original_run = None
+    _watchdog: Optional[threading.Thread] = None
+    _stop_event = threading.Event()
+    _lock = threading.Lock()
+    # thread id -> [handle, started_at, sampled_stack]
+    _running: Dict[int, list] = {}
+    _sites: "OrderedDict[str, dict]" = OrderedDict()
+    _installed_at: Optional[float] = None
+
+    @classmethod
+    def is_installed(cls) -> bool:
+        return cls._original_run is not None
+
+    @classmethod
+    def install(cls, threshold_ms: int = 100, max_sites: int = 200):
+        """Wrap loop callbacks and start the stack-sampling watchdog"""
+        if cls.is_installed():
+            return
+        cls.threshold = threshold_ms / 1000
+        cls.max_sites = max_sites
+        cls._original_run = asyncio.events.Handle._run
+        original_run = cls._original_run
+        running = cls._running
+
+        def _run(handle):
+            thread_id = threading.get_ident()
+            current = [handle, time.perf_counter(), None]
+            running[thread_id] = current
+            try:
+                return original_run(handle)
+            finally:
+                running.pop(thread_id, None)
+                elapsed = time.perf_counter() - current[1]
+                if elapsed >= cls.threshold:
+                    cls._record(handle, elapsed, current[2])
+
+        asyncio.events.Handle._run = _run
+        cls._installed_at = time.time()
+        cls._stop_event.clear()
+        cls._watchdog = threading.Thread(target=cls._watch, name="loop-monitor", daemon=True)
+        cls._watchdog.start()
+
+    @classmethod
+    def uninstall(cls):
+        """Restore the original callback runner and stop the watchdog"""
+        if not cls.is_installed():
+            return
+        asyncio.events.Handle._run = cls._original_run
+        cls._original_run = None
+        cls._stop_event.set()
+        if cls._watchdog:
+            cls._watchdog.join(timeout=1)
+        cls._watchdog = None
+        cls._running.clear()
+
+    @classmethod
+    def _watch(cls):
+        """Sample the stack of any callback still running past the threshold"""
+        interval = max(cls.threshold / 2, 0.005)
+        while not cls._stop_event.wait(interval):
+            now = time.perf_counter()
+            frames = None
+            for thread_id, current in list(cls._running.items()):
+                if current[2] is not None or now - current[1] < cls.threshold:
+                    continue
+                frames = frames or sys._current_frames()
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                stack = traceback.extract_stack(frame, limit=STACK_LIMIT)
+                # The callback may have finished while we were sampling
+                if cls._running.get(thread_id) is current:
+                    current[2] = stack
+
+    @classmethod
+    def _describe_callback(cls, handle) -> str:
+        callback = getattr(handle, "_callback", None)
+        owner = getattr(callback, "__self__", None)
+        if isinstance(owner, asyncio.Task):
+            coro = owner.get_coro()
+            return getattr(coro, "__qualname__", repr(coro))
+        return getattr(callback, "__qualname__", repr(callback))
+
+    @classmethod
+    def _call_site(cls, stack: Optional[traceback.StackSummary], handle) -> str:
+        if stack:
+            for frame in reversed(stack):
+                if frame.filename.startswith(APP_DIR) and frame.filename != __file__:
+                    return f"{os.path.relpath(frame.filename, APP_DIR)}:{frame.lineno} in {frame.name}"
+            frame = stack[-1]
+            return f"{frame.filename}:{frame.lineno} in {frame.name}"
+        return cls._describe_callback(handle)
+
+    @classmethod
+    def _record(cls, handle, elapsed: float, stack: Optional[traceback.StackSummary]):
+        site = cls._call_site(stack, handle)
+        elapsed_ms = elapsed * 1000
+        with cls._lock:
+            entry = cls._sites.get(site)
+            if entry is None:
+                if len(cls._sites) >= cls.max_sites:
+                    cls._sites.popitem(last=False)
+                entry = {
+                    "site": site,
+                    "callback": cls._describe_callback(handle),
+                    "count": 0,
+                    "totalMs": 0.0,
+                    "maxMs": 0.0,
+                    "stack": None,
+                }
+                cls._sites[site] = entry
+            else:
+                cls._sites.move_to_end(site)
+            entry["count"] += 1
+            entry["totalMs"] += elapsed_ms
+            entry["lastSeen"] = time.time()
+            if elapsed_ms >= entry["maxMs"]:
+                entry["maxMs"] = elapsed_ms
+                if stack:
+                    entry["stack"] = [
+                        f"{frame.filename}:{frame.lineno} in {frame.name}" for frame in stack
+                    ]
+
+    @classmethod
+    def report(cls, limit: int = 20) -> List[dict]:
+        """Return the call sites that blocked the loop the longest in total"""
+        with cls._lock:
+            entries = [dict(entry) for entry in cls._sites.values()]
+        entries.sort(key=lambda entry: entry["totalMs"], reverse=True)
+        for entry in entries:
+            entry["totalMs"] = round(entry["totalMs"], 3)
+            entry["maxMs"] = round(entry["maxMs"], 3)
+            entry["avgMs"] = round(entry["totalMs"] / entry["count"], 3)
+        return entries[:limit]
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._sites.clear()
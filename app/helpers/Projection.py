@@ -0,0 +1,30 @@
+"""
+Sparse fieldsets for listing routes.
+A "fields" query parameter is validated against a whitelist and pushed down
+to MongoDB as a projection; the projected documents are returned as-is
+instead of being built into full schema objects.
+"""
+from typing import Iterable, List, Optional
+
+
+def parse_fields(value: Optional[str], allowed: Iterable[str]) -> Optional[List[str]]:
+    """
+    Parse a comma-separated field list. Returns None when no fields were
+    requested and raises ValueError for fields outside the whitelist.
+    """
+    if value is None or not value.strip():
+        return None
+    fields = list(dict.fromkeys(field.strip() for field in value.split(",") if field.strip()))
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(sorted(allowed))}")
+    # The id is always returned
+    return [field for field in fields if field != "id"]
+
+
+def projected_document(document: dict) -> dict:
+    """Shape a projected document like a schema dump: _id is returned as id"""
+    document = dict(document)
+    if "_id" in document:
+        document["id"] = document.pop("_id")
+    return document
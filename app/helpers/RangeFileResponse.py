@@ -0,0 +1,109 @@
+"""
+File response with HTTP range support.
+Uses the ASGI zero-copy send extension (sendfile) when the server offers it
+and falls back to positional reads in the threadpool otherwise.
+"""
+import asyncio
+import mimetypes
+import os
+import re
+from email.utils import formatdate
+from typing import Optional, Tuple
+
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+CHUNK_SIZE = 256 * 1024
+
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single byte range into an inclusive (start, end) pair.
+    Returns None for no/unsupported ranges and raises ValueError when the
+    range cannot be satisfied.
+    """
+    if not range_header:
+        return None
+    match = RANGE_PATTERN.match(range_header.strip())
+    if not match:
+        return None  # Multi-range and malformed headers get the full file
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError("Unsatisfiable range")
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("Unsatisfiable range")
+    return start, end
+
+
+class RangeFileResponse(Response):
+    def __init__(self, path: str, stat_result: os.stat_result, range_header: Optional[str] = None,
+                 media_type: Optional[str] = None, method: str = "GET"):
+        self.path = path
+        self.method = method
+        self.status_code = 200
+        self.background = None
+        size = stat_result.st_size
+        self.start, self.end = 0, size - 1
+        headers = {
+            "accept-ranges": "bytes",
+            "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+            "etag": f'"{stat_result.st_mtime_ns:x}-{size:x}"',
+        }
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            self.status_code = 416
+            self.start, self.end = 0, -1
+            headers["content-range"] = f"bytes */{size}"
+            byte_range = None
+        if byte_range:
+            self.start, self.end = byte_range
+            self.status_code = 206
+            headers["content-range"] = f"bytes {self.start}-{self.end}/{size}"
+        headers["content-length"] = str(self.end - self.start + 1)
+        self.media_type = media_type or mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if self.status_code != 416:
+            headers["content-type"] = self.media_type
+        self.init_headers(headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        count = self.end - self.start + 1
+        if self.method == "HEAD" or count <= 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        if "http.response.zerocopysend" in scope.get("extensions", {}):
+            with open(self.path, "rb") as file:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": file,
+                    "offset": self.start,
+                    "count": count,
+                    "more_body": False,
+                })
+            return
+
+        fd = await asyncio.to_thread(os.open, self.path, os.O_RDONLY)
+        try:
+            offset = self.start
+            remaining = count
+            while remaining > 0:
+                chunk = await asyncio.to_thread(os.pread, fd, min(CHUNK_SIZE, remaining), offset)
+                if not chunk:
+                    break
+                offset += len(chunk)
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            os.close(fd)
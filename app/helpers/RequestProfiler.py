@@ -0,0 +1,145 @@
+"""
+Rate-limited cProfile runs for single requests.
+Profiles are summarised into a call-tree digest and kept in a small in-memory
+history so admins can fetch them after the request completes.
+"""
+import cProfile
+import os
+import pstats
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from app.helpers.Utilities import Utils
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVICES_DIR = os.path.join(APP_DIR, "services")
+TOP_FUNCTIONS = 25
+
+
+def _bucket(filename: str, function: str) -> Optional[str]:
+    """Map a profiled function to the request phase it belongs to"""
+    if function == "jwt_validator" or filename.endswith(os.path.join("middleware", "JWTVerification.py")):
+        return "jwt_validator"
+    if filename.startswith(SERVICES_DIR):
+        return "service"
+    if any(part in filename for part in ("/motor/", "/pymongo/", "/bson/")):
+        return "motor"
+    if (
+        filename.endswith(os.path.join("fastapi", "encoders.py"))
+        or function == "serialize_response"
+        or "/pydantic/" in filename
+        or "/pydantic_core/" in filename
+        or (filename.endswith(os.path.join("starlette", "responses.py")) and function == "render")
+    ):
+        return "serialization"
+    return None
+
+
+def _label(key: Tuple[str, int, str]) -> str:
+    filename, line, function = key
+    if filename.startswith(APP_DIR):
+        filename = os.path.relpath(filename, APP_DIR)
+    return f"{filename}:{line}({function})"
+
+
+class RequestProfiler:
+    """Single-slot, rate-limited profiler for requests carrying X-Profile: 1"""
+    enabled: bool = True
+    min_interval: float = 10.0
+    history_size: int = 20
+    _active: bool = False
+    _last_started: float = 0.0
+    _profiles: "OrderedDict[str, dict]" = OrderedDict()
+
+    @classmethod
+    def configure(cls, enabled: bool, min_interval: float, history_size: int):
+        cls.enabled = enabled
+        cls.min_interval = min_interval
+        cls.history_size = history_size
+
+    @classmethod
+    def try_acquire(cls) -> bool:
+        """
+        Claim the profiler slot. Only one request is profiled at a time and
+        at most one per min_interval seconds, so the header cannot be used
+        to keep the whole worker under the profiler.
+        """
+        now = time.monotonic()
+        if cls._active or now - cls._last_started < cls.min_interval:
+            return False
+        cls._active = True
+        cls._last_started = now
+        return True
+
+    @classmethod
+    def release(cls):
+        cls._active = False
+
+    @classmethod
+    def summarize(cls, profiler: cProfile.Profile) -> dict:
+        """
+        Build the call-tree digest. Phase times are inclusive CPU time on the
+        event loop thread, counted from each phase's entry functions so nested
+        calls inside the same phase are not double counted. Other requests
+        running concurrently on the loop are included in the totals.
+        """
+        stats = pstats.Stats(profiler).stats
+        phases: Dict[str, float] = {"jwt_validator": 0.0, "service": 0.0, "motor": 0.0, "serialization": 0.0}
+        total_cpu = 0.0
+        for key, (_, ncalls, tottime, cumtime, callers) in stats.items():
+            total_cpu += tottime
+            phase = _bucket(key[0], key[2])
+            if phase is None:
+                continue
+            if any(_bucket(caller[0], caller[2]) == phase for caller in callers):
+                continue
+            phases[phase] += cumtime
+
+        def _rows(sort_index: int) -> List[dict]:
+            ranked = sorted(stats.items(), key=lambda item: item[1][sort_index], reverse=True)
+            return [
+                {
+                    "function": _label(key),
+                    "calls": ncalls,
+                    "tottimeMs": round(tottime * 1000, 3),
+                    "cumtimeMs": round(cumtime * 1000, 3),
+                    "callers": [_label(caller) for caller in list(callers)[:5]],
+                }
+                for key, (_, ncalls, tottime, cumtime, callers) in ranked[:TOP_FUNCTIONS]
+            ]
+
+        return {
+            "cpuMs": round(total_cpu * 1000, 3),
+            "phasesMs": {phase: round(value * 1000, 3) for phase, value in phases.items()},
+            "topCumulative": _rows(3),
+            "topSelf": _rows(2),
+        }
+
+    @classmethod
+    def store(cls, method: str, path: str, status_code: int, wall_time: float, profiler: cProfile.Profile) -> str:
+        profile_id = Utils.generate_hex_string(16)
+        profile = {
+            "id": profile_id,
+            "method": method,
+            "path": path,
+            "statusCode": status_code,
+            "wallMs": round(wall_time * 1000, 3),
+            "createdAt": time.time(),
+            **cls.summarize(profiler),
+        }
+        cls._profiles[profile_id] = profile
+        while len(cls._profiles) > cls.history_size:
+            cls._profiles.popitem(last=False)
+        return profile_id
+
+    @classmethod
+    def list_profiles(cls) -> List[dict]:
+        return [
+            {key: profile[key] for key in ("id", "method", "path", "statusCode", "wallMs", "cpuMs", "phasesMs", "createdAt")}
+            for profile in reversed(cls._profiles.values())
+        ]
+
+    @classmethod
+    def get_profile(cls, profile_id: str) -> Optional[dict]:
+        return cls._profiles.get(profile_id)
@@ -0,0 +1,84 @@
+"""
+Request coalescing for identical concurrent reads.
+The first caller for a key starts the call; callers that arrive while it
+is in flight await the same result (or exception) instead of issuing their
+own. A waiter that is cancelled leaves the others unaffected; the shared
+call is cancelled only when every waiter has gone.
+"""
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+def normalize_key(*parts: Any) -> str:
+    """Stable key for a query: dict ordering and non-JSON values do not matter"""
+    return json.dumps(parts, sort_keys=True, default=str)
+
+
+class _Call:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.abandoned = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.calls += 1
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            self.executions += 1
+            call.task.add_done_callback(lambda task: self._finished(key, call))
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Nobody is left to use the result. Drop the entry now rather than
+                # in the done callback, so a caller arriving before the task
+                # finishes cancelling starts a fresh call instead of joining it.
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                call.task.cancel()
+                self.abandoned += 1
+
+    def _finished(self, key: Hashable, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if not call.task.cancelled() and call.task.exception() is not None:
+            self.errors += 1
+
+    def forget(self, key: Hashable):
+        """Make later callers start a fresh call, e.g. after a write"""
+        self._calls.pop(key, None)
+
+    def clear(self):
+        self._calls.clear()
+
+    def stats(self) -> dict:
+        return {
+            "inFlight": len(self._calls),
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "abandoned": self.abandoned,
+        }
+
+    def reset_metrics(self):
+        self.calls = self.executions = self.coalesced = self.errors = self.abandoned = 0
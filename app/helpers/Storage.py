@@ -0,0 +1,303 @@
+"""
+Pluggable file storage.
+StorageBackend is the interface services upload through; AzureStorageBackend
+stores blobs via AsyncAzureBlobUploader and LocalStorageBackend writes to the
+local disk (served by the /api/v1/files route) so development, benchmarks and
+on-prem deployments run without a cloud account.
+"""
+import asyncio
+import mimetypes
+import os
+import re
+import time
+import urllib.parse
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, List, Optional, Tuple
+
+from azure.core.exceptions import ResourceNotFoundError
+from app.helpers.AsyncAzureStorage import AsyncAzureBlobUploader, iter_file
+from app.helpers.Utilities import Utils
+
+FILES_ROUTE = "/api/v1/files"
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+async def iter_upload_file(file, chunk_size: int = 256 * 1024) -> AsyncIterator[bytes]:
+    """Read a Starlette UploadFile in chunks"""
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+async def iter_bytes(data: bytes) -> AsyncIterator[bytes]:
+    """Wrap an in-memory payload as a stream for save_stream"""
+    yield data
+
+
+def folder_key(folder_name: str) -> str:
+    """Normalise a folder name the way uploads store it"""
+    return re.sub(r'[^a-zA-Z0-9/_-]', '_', folder_name).strip("/")
+
+
+def _write_all(fd: int, data: bytes):
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+class StorageBackend(ABC):
+    """Interface for file storage used by the services"""
+    name: str = ""
+
+    @abstractmethod
+    async def save_stream(self, chunks: AsyncIterator[bytes], file_extension: str = "", folder_name: str = None,
+                          content_type: str = None, file_name: str = None) -> str:
+        """Store a stream of bytes and return its public URL"""
+
+    async def save_file(self, file_path: str, folder_name: str = None, file_name: str = None) -> str:
+        """Store a local file and return its public URL"""
+        mime_type, _ = mimetypes.guess_type(file_path)
+        return await self.save_stream(
+            iter_file(file_path, WRITE_BUFFER_SIZE),
+            os.path.splitext(file_path)[1],
+            folder_name,
+            mime_type,
+            file_name
+        )
+
+    @abstractmethod
+    async def read(self, key: str) -> bytes:
+        """Read a stored file by its key ("folder/name.ext")"""
+
+    @abstractmethod
+    async def delete(self, file_url: str) -> None:
+        """Delete a stored file by its URL"""
+
+    @abstractmethod
+    async def clear_prefix(self, prefix: str) -> dict:
+        """
+        Delete every file under a folder prefix and return
+        {"deleted": int, "failed": int, "elapsedMs": float}
+        """
+
+    async def close(self) -> None:
+        """Release any held resources"""
+
+
+class AzureStorageBackend(StorageBackend):
+    name = "azure"
+
+    def __init__(self):
+        self.uploader = AsyncAzureBlobUploader()
+
+    async def save_stream(self, chunks, file_extension="", folder_name=None, content_type=None, file_name=None) -> str:
+        return await self.uploader.upload_stream(chunks, file_extension, folder_name, content_type, file_name)
+
+    async def read(self, key: str) -> bytes:
+        try:
+            return await self.uploader.download(key)
+        except ResourceNotFoundError:
+            raise FileNotFoundError(key)
+
+    async def delete(self, file_url: str) -> None:
+        await self.uploader.delete_file(file_url)
+
+    async def clear_prefix(self, prefix: str) -> dict:
+        return await self.uploader.clear_folder(folder_key(prefix))
+
+    async def close(self) -> None:
+        await self.uploader.close()
+
+
+class _FsyncBatcher:
+    """
+    Groups durability work from concurrent writes. Files finishing within the
+    same window are fsynced, renamed into place and have their directories
+    fsynced in a single worker-thread hop.
+    """
+    def __init__(self, window: float):
+        self.window = window
+        self._pending: List[Tuple[int, str, str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def commit(self, fd: int, tmp_path: str, final_path: str):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((fd, tmp_path, final_path, future))
+        if self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        await future
+
+    def _flush(self):
+        batch, self._pending, self._timer = self._pending, [], None
+        asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch):
+        try:
+            errors = await asyncio.to_thread(self._commit_batch, [entry[:3] for entry in batch])
+        except Exception as e:
+            errors = [e] * len(batch)
+        for (_, _, _, future), error in zip(batch, errors):
+            if future.done():
+                continue
+            if error:
+                future.set_exception(error)
+            else:
+                future.set_result(None)
+
+    @staticmethod
+    def _commit_batch(entries) -> List[Optional[Exception]]:
+        errors: List[Optional[Exception]] = []
+        directories = set()
+        for fd, tmp_path, final_path in entries:
+            try:
+                os.fsync(fd)
+                os.close(fd)
+                fd = None
+                os.replace(tmp_path, final_path)
+                directories.add(os.path.dirname(final_path))
+                errors.append(None)
+            except Exception as e:
+                if fd is not None:
+                    os.close(fd)
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                errors.append(e)
+        for directory in directories:
+            try:
+                dir_fd = os.open(directory, os.O_RDONLY)
+                try:
+                    os.fsync(dir_fd)
+                finally:
+                    os.close(dir_fd)
+            except OSError:
+                pass  # Files are already in place; directory fsync is best effort
+        return errors
+
+
+class LocalStorageBackend(StorageBackend):
+    name = "local"
+
+    def __init__(self, root: str, public_base_url: str = "", fsync_window_ms: int = 5):
+        self.root = os.path.realpath(root)
+        self.public_base_url = public_base_url.rstrip("/")
+        self._batcher = _FsyncBatcher(fsync_window_ms / 1000)
+        os.makedirs(self.root, exist_ok=True)
+
+    def _key(self, file_extension: str, folder_name: str = None, file_name: str = None) -> str:
+        base_name = file_name or Utils.generate_hex_string()
+        sanitized_filename = re.sub(r'[^a-zA-Z0-9_.-]', '_', base_name + file_extension)
+        if folder_name:
+            folder_name = re.sub(r'[^a-zA-Z0-9/_-]', '_', folder_name).strip("/")
+            return f"{folder_name}/{sanitized_filename}"
+        return sanitized_filename
+
+    def resolve(self, key: str) -> Optional[str]:
+        """Map a storage key to a path inside the root, rejecting traversal"""
+        path = os.path.realpath(os.path.join(self.root, key))
+        if not path.startswith(self.root + os.sep):
+            return None
+        return path
+
+    def url_for(self, key: str) -> str:
+        return f"{self.public_base_url}{FILES_ROUTE}/{urllib.parse.quote(key)}"
+
+    def key_from_url(self, file_url: str) -> str:
+        path = urllib.parse.unquote(urllib.parse.urlparse(file_url).path)
+        marker = FILES_ROUTE + "/"
+        index = path.find(marker)
+        if index == -1:
+            raise ValueError("File URL does not belong to local storage")
+        return path[index + len(marker):]
+
+    async def save_stream(self, chunks, file_extension="", folder_name=None, content_type=None, file_name=None) -> str:
+        """
+        Write to a temp file next to the target, then fsync and atomically
+        rename it into place; readers never see a partial file.
+        """
+        key = self._key(file_extension, folder_name, file_name)
+        final_path = self.resolve(key)
+        if final_path is None:
+            raise ValueError("Invalid storage key")
+        directory = os.path.dirname(final_path)
+        tmp_path = os.path.join(directory, f".{os.path.basename(final_path)}.{Utils.generate_hex_string(8)}.tmp")
+
+        def _open() -> int:
+            os.makedirs(directory, exist_ok=True)
+            return os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+
+        fd = await asyncio.to_thread(_open)
+        committed = False
+        try:
+            buffer = bytearray()
+            async for chunk in chunks:
+                buffer += chunk
+                if len(buffer) >= WRITE_BUFFER_SIZE:
+                    await asyncio.to_thread(_write_all, fd, bytes(buffer))
+                    buffer.clear()
+            if buffer:
+                await asyncio.to_thread(_write_all, fd, bytes(buffer))
+            committed = True
+            await self._batcher.commit(fd, tmp_path, final_path)
+        finally:
+            if not committed:
+                os.close(fd)
+                await asyncio.to_thread(os.unlink, tmp_path)
+        return self.url_for(key)
+
+    async def read(self, key: str) -> bytes:
+        path = self.resolve(key)
+        if path is None:
+            raise ValueError("Invalid storage key")
+
+        def _read() -> bytes:
+            with open(path, "rb") as file:
+                return file.read()
+
+        return await asyncio.to_thread(_read)
+
+    async def delete(self, file_url: str) -> None:
+        path = self.resolve(self.key_from_url(file_url))
+        if path is None:
+            raise ValueError("Invalid storage key")
+        await asyncio.to_thread(os.unlink, path)
+
+    def _clear_directory(self, directory: str) -> Tuple[int, int]:
+        deleted = failed = 0
+        stack = [directory]
+        visited = []
+        while stack:
+            current = stack.pop()
+            visited.append(current)
+            try:
+                entries = list(os.scandir(current))
+            except FileNotFoundError:
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                    continue
+                try:
+                    os.unlink(entry.path)
+                    deleted += 1
+                except FileNotFoundError:
+                    pass
+                except OSError:
+                    failed += 1
+        for current in reversed(visited):
+            try:
+                os.rmdir(current)
+            except OSError:
+                pass  # Not empty (a failed delete or a concurrent write)
+        return deleted, failed
+
+    async def clear_prefix(self, prefix: str) -> dict:
+        started = time.perf_counter()
+        directory = self.resolve(folder_key(prefix))
+        if directory is None:
+            raise ValueError("Invalid storage key")
+        deleted, failed = await asyncio.to_thread(self._clear_directory, directory)
+        return {"deleted": deleted, "failed": failed, "elapsedMs": round((time.perf_counter() - started) * 1000, 1)}
@@ -0,0 +1,229 @@
+"""
+Streaming multipart upload pipeline.
+Parses a multipart/form-data request body incrementally and forwards the
+file part chunk by chunk to a storage backend, hashing it and sniffing its
+MIME type on the fly. Nothing is spooled to disk and memory per upload is
+bounded by the request chunk size plus the backend's write buffer.
+"""
+import hashlib
+import mimetypes
+import os
+from typing import AsyncIterator, Iterable, List, Optional, Tuple
+
+from starlette.requests import Request
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+SNIFF_BYTES = 16
+MULTIPART_OVERHEAD = 16 * 1024
+SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"%PDF-", "application/pdf"),
+    (b"PK\x03\x04", "application/zip"),
+)
+EXTENSIONS = {
+    "image/png": ".png",
+    "image/jpeg": ".jpg",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+    "application/pdf": ".pdf",
+    "application/zip": ".zip",
+}
+
+
+class UploadRejected(Exception):
+    """The upload is malformed or of a type that is not accepted"""
+
+
+class UploadTooLarge(UploadRejected):
+    """The upload exceeds the configured size limit"""
+
+
+def sniff_mime_type(head: bytes) -> Optional[str]:
+    """Detect the MIME type from the leading bytes of a file"""
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    for signature, mime_type in SIGNATURES:
+        if head.startswith(signature):
+            return mime_type
+    return None
+
+
+class StreamingUpload:
+    def __init__(self, request: Request, field_name: str = "file", max_size: int = 5 * 1024 * 1024,
+                 allowed_types: Optional[Iterable[str]] = None):
+        self.request = request
+        self.field_name = field_name
+        self.max_size = max_size
+        self.allowed_types = set(allowed_types) if allowed_types else None
+        self.filename: Optional[str] = None
+        self.declared_type: Optional[str] = None
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._file_done = False
+        self._events: List[Tuple[str, bytes]] = []
+        self._parser = None
+        self._stream = None
+
+    def _create_parser(self):
+        content_type, params = parse_options_header(self.request.headers.get("content-type", ""))
+        if content_type != b"multipart/form-data":
+            raise UploadRejected("Expected a multipart/form-data request")
+        boundary = params.get(b"boundary")
+        if not boundary:
+            raise UploadRejected("Missing multipart boundary")
+
+        def on_data(event: str):
+            def callback(data: bytes, start: int, end: int):
+                self._events.append((event, data[start:end]))
+            return callback
+
+        def on_notify(event: str):
+            def callback():
+                self._events.append((event, b""))
+            return callback
+
+        callbacks = {
+            "on_part_begin": on_notify("part_begin"),
+            "on_part_data": on_data("part_data"),
+            "on_part_end": on_notify("part_end"),
+            "on_header_field": on_data("header_field"),
+            "on_header_value": on_data("header_value"),
+            "on_header_end": on_notify("header_end"),
+            "on_headers_finished": on_notify("headers_finished"),
+            "on_end": on_notify("end"),
+        }
+        return MultipartParser(boundary, callbacks)
+
+    async def _pull(self) -> bool:
+        """Feed the next body chunk to the parser; False once the body is exhausted"""
+        try:
+            chunk = await self._stream.__anext__()
+        except StopAsyncIteration:
+            self._parser.finalize()
+            return False
+        if chunk:
+            self._parser.write(chunk)
+        return True
+
+    async def _file_data(self) -> AsyncIterator[bytes]:
+        """Yield the raw bytes of the target file part as they arrive"""
+        header_field = b""
+        header_value = b""
+        headers = {}
+        in_file = False
+        while True:
+            more = await self._pull()
+            events, self._events = self._events, []
+            for event, data in events:
+                if event == "part_begin":
+                    headers = {}
+                    in_file = False
+                elif event == "header_field":
+                    header_field += data
+                elif event == "header_value":
+                    header_value += data
+                elif event == "header_end":
+                    headers[header_field.lower()] = header_value
+                    header_field = header_value = b""
+                elif event == "headers_finished":
+                    _, options = parse_options_header(headers.get(b"content-disposition", b""))
+                    name = options.get(b"name", b"").decode("utf-8", "replace")
+                    filename = options.get(b"filename")
+                    if name == self.field_name and filename is not None:
+                        in_file = True
+                        self.filename = filename.decode("utf-8", "replace")
+                        self.declared_type = headers.get(b"content-type", b"").decode("latin-1") or None
+                elif event == "part_data" and in_file:
+                    yield data
+                elif event == "part_end" and in_file:
+                    self._file_done = True
+                    return
+            if not more:
+                return
+
+    def _account(self, chunk: bytes) -> bytes:
+        self.size += len(chunk)
+        if self.size > self.max_size:
+            raise UploadTooLarge(f"File is too large (limit {self.max_size} bytes)")
+        self._hash.update(chunk)
+        return chunk
+
+    async def _validated_chunks(self) -> Tuple[AsyncIterator[bytes], str, str]:
+        """
+        Start parsing the body and return the file's chunk stream (size-checked
+        and hashed as it is consumed), its content type and file extension.
+        """
+        content_length = self.request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_size + MULTIPART_OVERHEAD:
+            raise UploadTooLarge(f"File is too large (limit {self.max_size} bytes)")
+
+        self._parser = self._create_parser()
+        self._stream = self.request.stream().__aiter__()
+        data = self._file_data()
+
+        head = bytearray()
+        async for chunk in data:
+            head += chunk
+            if len(head) >= SNIFF_BYTES:
+                break
+        if self.filename is None:
+            raise UploadRejected(f"No file found in form field '{self.field_name}'")
+        if not head:
+            raise UploadRejected("Uploaded file is empty")
+
+        sniffed_type = sniff_mime_type(bytes(head))
+        if self.allowed_types is not None:
+            # The client-declared type is not trusted when types are restricted
+            if sniffed_type not in self.allowed_types:
+                raise UploadRejected(f"Unsupported file type '{sniffed_type or self.declared_type}'")
+        content_type = (
+            sniffed_type
+            or self.declared_type
+            or mimetypes.guess_type(self.filename)[0]
+            or "application/octet-stream"
+        )
+        extension = EXTENSIONS.get(content_type) or os.path.splitext(self.filename)[1]
+
+        async def chunks() -> AsyncIterator[bytes]:
+            yield self._account(bytes(head))
+            async for chunk in data:
+                yield self._account(chunk)
+            if not self._file_done:
+                raise UploadRejected("Upload ended before the file was complete")
+
+        return chunks(), content_type, extension
+
+    def _result(self, content_type: str) -> dict:
+        return {
+            "size": self.size,
+            "sha256": self._hash.hexdigest(),
+            "contentType": content_type,
+            "filename": self.filename,
+        }
+
+    async def save_to(self, storage, folder_name: str = None) -> dict:
+        """
+        Stream the file part into the storage backend and return its URL,
+        size, SHA-256 digest and detected content type.
+        """
+        chunks, content_type, extension = await self._validated_chunks()
+        url = await storage.save_stream(chunks, extension, folder_name, content_type)
+        return {"url": url, **self._result(content_type)}
+
+    async def read(self) -> dict:
+        """
+        Read the whole file part into memory (at most max_size bytes) for
+        callers that need the complete content, e.g. to decode an image.
+        """
+        chunks, content_type, _ = await self._validated_chunks()
+        buffer = bytearray()
+        async for chunk in chunks:
+            buffer += chunk
+        return {"data": bytes(buffer), **self._result(content_type)}
@@ -0,0 +1,73 @@
+"""
+Bounded in-memory cache with per-entry expiry.
+Entries expire ttl seconds after they are set and the least recently used
+entry is evicted once max_size is reached. Each worker process has its own
+cache, so the TTL bounds how stale another worker's copy can be.
+
+A value loaded while the key is invalidated would put the stale copy back,
+so loaders read generation(key) before loading and pass it to set(), which
+skips the write if the key was invalidated in between.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        # Generation of each recently invalidated key, bounded like the entries;
+        # keys dropped from it report the highest generation dropped so far
+        self._generation = 0
+        self._invalidated: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._generation_floor = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def generation(self, key: Hashable) -> int:
+        return self._invalidated.get(key, self._generation_floor)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, generation: Optional[int] = None):
+        if generation is not None and generation != self.generation(key):
+            return  # Invalidated since the value was loaded
+        self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        self._entries.pop(key, None)
+        self._generation += 1
+        self._invalidated[key] = self._generation
+        self._invalidated.move_to_end(key)
+        while len(self._invalidated) > self.max_size:
+            _, dropped = self._invalidated.popitem(last=False)
+            self._generation_floor = max(self._generation_floor, dropped)
+
+    def clear(self):
+        self._entries.clear()
+        self._generation += 1
+        self._invalidated.clear()
+        self._generation_floor = self._generation
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "maxSize": self.max_size,
+            "ttlSeconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
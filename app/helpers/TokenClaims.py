@@ -0,0 +1,47 @@
+"""
+Access token claims.
+Tokens carry only what authorization needs: the user id (sub), role,
+adminId, a token id (jti, used for revocation) and the standard iat/exp. Handlers that need the rest of the user
+record get it from the profile cache through the user_claims dependency.
+Legacy tokens, which embed the whole user document, are accepted while
+JWT_ACCEPT_LEGACY_TOKENS is on.
+"""
+import secrets
+from typing import Any, Dict
+
+ACCESS_TOKEN_VERSION = 2
+
+
+class LegacyTokenRejected(Exception):
+    """A pre-compact token was presented after the migration window closed"""
+
+
+def compact_claims(user) -> Dict[str, Any]:
+    """Claims to sign into an access token for a UserSchema"""
+    claims = {
+        "sub": str(user.id),
+        "role": getattr(user.userType, "value", user.userType),
+        "v": ACCESS_TOKEN_VERSION,
+        "jti": secrets.token_hex(16),
+    }
+    if user.adminId:
+        claims["adminId"] = user.adminId
+    return claims
+
+
+def normalize_claims(payload: Dict[str, Any], accept_legacy: bool = True) -> Dict[str, Any]:
+    """
+    Map a verified token payload to the principal handlers read: "id",
+    "userType" and "adminId" for both token formats.
+    """
+    if payload.get("v") == ACCESS_TOKEN_VERSION:
+        return {
+            **payload,
+            "id": payload.get("sub"),
+            "userType": payload.get("role"),
+            "adminId": payload.get("adminId"),
+        }
+    if not accept_legacy:
+        raise LegacyTokenRejected("Legacy access tokens are no longer accepted")
+    user_id = payload.get("user_id") or payload.get("id") or payload.get("_id")
+    return {**payload, "sub": str(user_id) if user_id else None, "id": user_id}
@@ -0,0 +1,143 @@
+"""
+In-memory token revocation list.
+Revoked token ids and per-user "not before" times are held in a dict each,
+so jwt_validator checks a token in constant time without touching MongoDB.
+Each worker polls the revocation version counter (one small read) and pulls
+only newer revocations; entries are dropped locally once they expire.
+"""
+import asyncio
+import hashlib
+import heapq
+import logging
+import time
+from datetime import timezone
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+GAP_TIMEOUT_SECONDS = 10.0  # Versions still missing after this were never written or have expired
+
+
+def token_fingerprint(token: str) -> str:
+    """Stable id for tokens issued without a jti"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:32]
+
+
+class RevocationList:
+    _tokens: Dict[str, float] = {}  # jti -> exp
+    _not_before: Dict[str, Tuple[int, float]] = {}  # user id -> (notBefore, expires)
+    _expiries: List[Tuple[float, str, str]] = []  # (expires, kind, key) heap for pruning
+    version = 0
+    _missing_since: Dict[int, float] = {}
+    _task: Optional[asyncio.Task] = None
+    polls = 0
+    last_sync: Optional[float] = None
+
+    @classmethod
+    def is_revoked(cls, payload: dict) -> bool:
+        """Constant-time check of a verified, normalized token payload"""
+        jti = payload.get("jti")
+        if jti is not None and jti in cls._tokens:
+            return True
+        entry = cls._not_before.get(payload.get("sub"))
+        return entry is not None and (payload.get("iat") or 0) < entry[0]
+
+    @classmethod
+    def apply(cls, revocation: dict):
+        """Add a revocation record (as stored by TokenRevocationModel)"""
+        # MongoDB returns naive UTC datetimes
+        expire_at = revocation.get("expireAt")
+        expires = expire_at.replace(tzinfo=timezone.utc).timestamp() if expire_at else time.time()
+        if revocation["type"] == "token":
+            if cls._tokens.get(revocation["jti"]) == expires:
+                return  # Re-read while a version gap was held open
+            cls._tokens[revocation["jti"]] = expires
+            heapq.heappush(cls._expiries, (expires, "token", revocation["jti"]))
+        elif revocation["type"] == "user":
+            current = cls._not_before.get(revocation["userId"])
+            if current == (revocation["notBefore"], expires):
+                return
+            if current is None or revocation["notBefore"] >= current[0]:
+                cls._not_before[revocation["userId"]] = (revocation["notBefore"], expires)
+                heapq.heappush(cls._expiries, (expires, "user", revocation["userId"]))
+
+    @classmethod
+    def prune(cls, now: Optional[float] = None):
+        """Forget revocations whose tokens can no longer be valid"""
+        now = now or time.time()
+        while cls._expiries and cls._expiries[0][0] <= now:
+            expires, kind, key = heapq.heappop(cls._expiries)
+            if kind == "token" and cls._tokens.get(key) == expires:
+                del cls._tokens[key]
+            elif kind == "user" and cls._not_before.get(key, (None, None))[1] == expires:
+                del cls._not_before[key]
+
+    @classmethod
+    async def sync(cls, model):
+        """
+        Pull revocations newer than the local version. Versions that are
+        allocated but not visible yet (a concurrent insert) hold the local
+        version back so they are fetched on a later poll. Every missing
+        version starts its timeout on the poll that first sees it, so a run of
+        versions deleted by the TTL index is skipped after one timeout.
+        """
+        current = await model.get_current_version()
+        cls.polls += 1
+        if current > cls.version:
+            revocations = await model.get_revocations_since(cls.version)
+            seen = set()
+            for revocation in revocations:
+                cls.apply(revocation)
+                seen.add(revocation["version"])
+            now = time.time()
+            floor = cls.version
+            held = False
+            for version in range(cls.version + 1, max([current, *seen]) + 1):
+                if version in seen:
+                    cls._missing_since.pop(version, None)
+                elif now - cls._missing_since.setdefault(version, now) < GAP_TIMEOUT_SECONDS:
+                    held = True
+                elif not held:
+                    del cls._missing_since[version]
+                if not held:
+                    floor = version
+            cls.version = floor
+        cls.prune()
+        cls.last_sync = time.time()
+
+    @classmethod
+    async def _poll(cls, model, interval: float):
+        while True:
+            try:
+                await cls.sync(model)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Token revocation sync failed: %s", e)
+            await asyncio.sleep(interval)
+
+    @classmethod
+    def start(cls, model, interval: float):
+        if cls._task is None:
+            cls._task = asyncio.ensure_future(cls._poll(model, interval))
+
+    @classmethod
+    async def stop(cls):
+        if cls._task is not None:
+            cls._task.cancel()
+            try:
+                await cls._task
+            except asyncio.CancelledError:
+                pass
+            cls._task = None
+
+    @classmethod
+    def stats(cls) -> dict:
+        return {
+            "version": cls.version,
+            "revokedTokens": len(cls._tokens),
+            "revokedUsers": len(cls._not_before),
+            "polls": cls.polls,
+            "lastSync": cls.last_sync,
+            "polling": cls._task is not None,
+        }
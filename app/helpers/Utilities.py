@@ -1,12 +1,16 @@
 import secrets
 from app.schemas.ServerResponse import ServerResponse
 from bson import ObjectId
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 from datetime import datetime, timedelta
 import jwt
 import json
 import os
 import bcrypt 
+import statistics
+import time
+import unicodedata
+from app.config import get_settings
 
 from dotenv import load_dotenv
 
@@ -106,17 +110,76 @@ class Utils:
     
         )
     @staticmethod
-    def hash_password(password: str) -> str:
+    def normalize_match_value(value: Optional[str]) -> Optional[str]:
+        """
+        Canonical form for case-insensitive exact matching: Unicode NFKC,
+        case-folded, surrounding whitespace stripped and inner runs collapsed.
+        """
+        if value is None:
+            return None
+        return " ".join(unicodedata.normalize("NFKC", value).casefold().split())
+
+    @staticmethod
+    def hash_password(password: str, rounds: Optional[int] = None) -> str:
         """
         Hash the password using bcrypt.
 
         :param password: The plain-text password to hash.
+        :param rounds: bcrypt cost factor; defaults to BCRYPT_ROUNDS.
         :return: The hashed password.
         """
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds or get_settings().BCRYPT_ROUNDS)
         hashed_password = bcrypt.hashpw(password.encode('utf-8'), salt)
         return hashed_password.decode('utf-8')
 
+    @staticmethod
+    def hash_passwords(passwords: List[str], rounds: int) -> List[str]:
+        """
+        Hash a batch of passwords; picklable so it can run in a process pool.
+        """
+        return [
+            bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+            for password in passwords
+        ]
+
+    @staticmethod
+    def password_hash_rounds(hashed_password: str) -> Optional[int]:
+        """
+        Read the cost factor from a bcrypt hash ("$2b$12$...").
+
+        :return: The cost factor, or None if the hash is not bcrypt.
+        """
+        parts = hashed_password.split("$")
+        if len(parts) < 4 or not parts[2].isdigit():
+            return None
+        return int(parts[2])
+
+    @staticmethod
+    def measure_bcrypt_verify_ms(rounds: int, samples: int = 3) -> float:
+        """
+        Median time of one bcrypt verification at the given cost on this machine.
+        """
+        hashed_password = bcrypt.hashpw(b"calibration-password", bcrypt.gensalt(rounds))
+        timings = []
+        for _ in range(samples):
+            started = time.perf_counter()
+            bcrypt.checkpw(b"calibration-password", hashed_password)
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
+
+    @staticmethod
+    def calibrate_bcrypt_rounds(target_ms: float, min_rounds: int = 10, max_rounds: int = 16) -> int:
+        """
+        Pick the highest bcrypt cost whose verification stays within target_ms
+        on this machine, never going below min_rounds.
+        """
+        chosen = min_rounds
+        for rounds in range(min_rounds, max_rounds + 1):
+            if Utils.measure_bcrypt_verify_ms(rounds) > target_ms:
+                break
+            chosen = rounds
+        return chosen
+
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
         """
@@ -3,14 +3,29 @@ from dotenv import load_dotenv
 from fastapi import FastAPI, Depends
 from starlette.responses import RedirectResponse
 from app.helpers.Database import MongoDB
+from app.models.User import UserModel
+from app.models.TokenRevocation import TokenRevocationModel
+from app.models.Company import CompanyModel
+from app.models.CompanyFacet import CompanyFacetModel
+from app.helpers.TokenRevocation import RevocationList
+from app.helpers.AllocationTracker import AllocationTracker
+from app.helpers.Logger import Logger
+from app.helpers.LoopMonitor import LoopMonitor
+from app.helpers.RequestProfiler import RequestProfiler
+from app.config import get_settings
 from app.middleware.Cors import add_cors_middleware
 from app.middleware.GlobalErrorHandling import GlobalErrorHandlingMiddleware
-from app.controllers import Auth, Profile, Company
+from app.middleware.DbMetrics import DbMetricsMiddleware
+from app.middleware.Profiling import ProfilingMiddleware
+from app.middleware.RequestContext import RequestContextMiddleware
+from app.controllers import Auth, Profile, Company, Diagnostics, Files, Images, CopyJobs, Batch
 from app.middleware.JWTVerification import jwt_validator
 import logging
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 app = FastAPI(
     title="User Management System",
     description="General User Management System API",
@@ -20,29 +35,84 @@ app = FastAPI(
 )
 
 # Middleware
+app.add_middleware(DbMetricsMiddleware)
+app.add_middleware(ProfilingMiddleware)
 app.add_middleware(GlobalErrorHandlingMiddleware)
 add_cors_middleware(app)
+app.add_middleware(RequestContextMiddleware)
 
 # Routes - User Management and Companies
 app.include_router(Auth.router)
 app.include_router(Profile.router, dependencies=[Depends(jwt_validator)])
 app.include_router(Company.router, dependencies=[Depends(jwt_validator)])
+app.include_router(Diagnostics.router, dependencies=[Depends(jwt_validator)])
+app.include_router(CopyJobs.router, dependencies=[Depends(jwt_validator)])
+app.include_router(Batch.router, dependencies=[Depends(jwt_validator)])
+app.include_router(Files.router)
+app.include_router(Images.router)
 
 @app.on_event("startup")
 async def startup_event():
+    settings = get_settings()
+    Logger.setup(
+        level=settings.LOG_LEVEL,
+        queue_size=settings.LOG_QUEUE_SIZE,
+        sampled_loggers=[name.strip() for name in settings.LOG_SAMPLED_LOGGERS.split(",") if name.strip()],
+        sample_burst=settings.LOG_SAMPLE_BURST,
+        sample_window=settings.LOG_SAMPLE_WINDOW_SECONDS,
+        sample_rate=settings.LOG_SAMPLE_RATE
+    )
+
     connection_string = os.getenv("MONGODB_CONNECTION_STRING")
     # Connect async MongoDB (Motor)
     MongoDB.connect(connection_string)
-    print("MongoDB connected (async with Motor)")
+    logger.info("MongoDB connected (async with Motor)")
+    try:
+        await UserModel().ensure_indexes()
+    except Exception as e:
+        # Typically existing duplicate emails; signup cannot detect duplicates until they are resolved
+        logger.error("Failed to create user indexes: %s", e)
+
+    revocation_model = TokenRevocationModel()
+    try:
+        await revocation_model.ensure_indexes()
+        # Load outstanding revocations before serving, then keep polling for new ones
+        await RevocationList.sync(revocation_model)
+    except Exception as e:
+        logger.error("Failed to load token revocations: %s", e)
+    RevocationList.start(revocation_model, settings.REVOCATION_POLL_SECONDS)
+
+    from app.dependencies import get_company_service
+    try:
+        await CompanyModel().ensure_indexes()
+        await CompanyFacetModel().ensure_indexes()
+    except Exception as e:
+        logger.error("Failed to create company indexes: %s", e)
+    get_company_service().start_facet_rebuilds(settings.COMPANY_FACET_REBUILD_SECONDS)
+
+    RequestProfiler.configure(
+        settings.PROFILING_ENABLED,
+        settings.PROFILE_MIN_INTERVAL_SECONDS,
+        settings.PROFILE_HISTORY_SIZE
+    )
+    AllocationTracker.max_snapshots = settings.TRACEMALLOC_MAX_SNAPSHOTS
+    if settings.LOOP_MONITOR_ENABLED:
+        LoopMonitor.install(settings.LOOP_SLOW_CALLBACK_MS, settings.LOOP_MONITOR_MAX_SITES)
+        logger.info("Slow-callback detection enabled (>%sms)", settings.LOOP_SLOW_CALLBACK_MS)
 
 @app.on_event("shutdown") 
 async def shutdown_event():
     """Cleanup resources on shutdown"""
-    from app.dependencies import cleanup_resources
+    from app.dependencies import cleanup_resources, close_clients, get_company_service
+    await RevocationList.stop()
+    await get_company_service().stop_facet_rebuilds()
+    await close_clients()
     cleanup_resources()
+    LoopMonitor.uninstall()
     if MongoDB.client:
         MongoDB.client.close()
-    print("App shutdown complete - resources cleaned up")
+    logger.info("App shutdown complete - resources cleaned up")
+    Logger.shutdown()
 
 @app.get("/")
 def api_docs():
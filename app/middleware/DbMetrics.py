@@ -0,0 +1,39 @@
+import logging
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from app.config import get_settings
+from app.helpers.DbMetrics import DbMetrics, RequestDbStats, db_stats_var
+
+logger = logging.getLogger(__name__)
+
+
+class DbMetricsMiddleware(BaseHTTPMiddleware):
+    """
+    Counts MongoDB round trips per request, records them in the per-route
+    histogram and warns when a route exceeds its declared budget.
+    """
+    async def dispatch(self, request: Request, call_next):
+        stats = RequestDbStats()
+        token = db_stats_var.set(stats)
+        try:
+            response = await call_next(request)
+        finally:
+            db_stats_var.reset(token)
+
+        route = request.scope.get("route")
+        route_path = f"{request.method} {getattr(route, 'path', 'unmatched')}"
+        DbMetrics.observe(route_path, stats)
+
+        if get_settings().DEBUG:
+            response.headers["X-DB-Round-Trips"] = str(stats.round_trips)
+            response.headers["X-DB-Time-Ms"] = f"{stats.duration_ms:.3f}"
+
+        if stats.budget is not None and stats.round_trips > stats.budget:
+            logger.warning(
+                "DB round-trip budget exceeded",
+                extra={"route": route_path, "roundTrips": stats.round_trips, "budget": stats.budget}
+            )
+        repeated = stats.repeated_commands()
+        if repeated:
+            logger.warning("Repeated DB commands in one request (possible N+1)", extra={"route": route_path, "commands": repeated})
+        return response
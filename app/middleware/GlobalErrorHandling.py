@@ -1,7 +1,9 @@
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse
-import traceback
+import logging
+
+logger = logging.getLogger(__name__)
 
 class GlobalErrorHandlingMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
@@ -9,9 +11,8 @@ class GlobalErrorHandlingMiddleware(BaseHTTPMiddleware):
             response = await call_next(request)
             return response
         except Exception as e:
-            print(f"Unhandled exception: {e}")
-            traceback.print_exc()
+            logger.exception("Unhandled exception", extra={"method": request.method, "path": request.url.path})
             return JSONResponse(
                 status_code=500,
                 content={"data": None, "error":str(e),"success": False}
-            )
\ No newline at end of file
+            )
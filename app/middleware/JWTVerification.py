@@ -1,19 +1,78 @@
-from fastapi import HTTPException, Security
+from fastapi import Depends, HTTPException, Request, Security
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
+import logging
 import os
 from typing import Dict, Any
+from app.config import get_settings
+from app.helpers.TokenClaims import LegacyTokenRejected, normalize_claims
+from app.helpers.TokenRevocation import RevocationList, token_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """
+    Decode and verify an access token and normalize its claims.
+    Raises JWTError when invalid.
+    """
+    secret_key: str = os.getenv("JWT_SECRET")
+    algorithm: str = "HS256"  # Changed from RS256 to HS256 for consistency
+    payload = jwt.decode(token, secret_key, algorithms=[algorithm])
+    try:
+        claims = normalize_claims(payload, get_settings().JWT_ACCEPT_LEGACY_TOKENS)
+    except LegacyTokenRejected as e:
+        raise JWTError(str(e))
+    # Legacy tokens have no jti; a hash of the token identifies them for sign-out
+    claims.setdefault("jti", token_fingerprint(token))
+    return claims
+
 
 def jwt_validator(
+    request: Request,
     auth: HTTPAuthorizationCredentials = Security(HTTPBearer()),
 ) -> Dict[str, Any]:
-    secret_key: str = os.getenv("JWT_SECRET")
-    algorithm: str = "HS256"  # Changed from RS256 to HS256 for consistency
     token = auth.credentials
+    # Sub-requests of a batch carry the token their parent already verified;
+    # an earlier operation in the batch may have revoked it since
+    verified = getattr(request.state, "verified_token", None)
+    if verified is not None and verified[0] == token:
+        if RevocationList.is_revoked(verified[1]):
+            logger.warning("JWT validation failed: Token has been revoked")
+            raise HTTPException(status_code=401, detail="Invalid or expired token.")
+        return verified[1]
     try:
-        payload = jwt.decode(token, secret_key, algorithms=[algorithm])
+        payload = decode_access_token(token)
+        if RevocationList.is_revoked(payload):
+            raise JWTError("Token has been revoked")
+        request.state.verified_token = (token, payload)
         return payload
 
     except JWTError as e:
-        print(e)
-        raise HTTPException(status_code=401, detail="Invalid or expired token.")
\ No newline at end of file
+        logger.warning("JWT validation failed: %s", e)
+        raise HTTPException(status_code=401, detail="Invalid or expired token.")
+
+
+def admin_validator(
+    jwt_payload: Dict[str, Any] = Depends(jwt_validator),
+) -> Dict[str, Any]:
+    if jwt_payload.get("userType") != "admin":
+        raise HTTPException(
+            status_code=403,
+            detail={"data": None, "error": "Only admins can access this resource", "success": False}
+        )
+    return jwt_payload
+
+
+async def user_claims(
+    jwt_payload: Dict[str, Any] = Depends(jwt_validator),
+) -> Dict[str, Any]:
+    """
+    Full claims for handlers that need more than the compact token carries
+    (email, name, ...), served from the bounded profile cache.
+    """
+    from app.dependencies import get_profile_service
+    result = await get_profile_service().get_current_user(str(jwt_payload.get("id")))
+    if not result["success"]:
+        raise HTTPException(status_code=401, detail="Invalid or expired token.")
+    return {**result["data"]["user"], **jwt_payload}
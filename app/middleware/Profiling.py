@@ -0,0 +1,52 @@
+import cProfile
+import time
+from jose import JWTError
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from app.helpers.RequestProfiler import RequestProfiler
+from app.middleware.JWTVerification import decode_access_token
+
+
+class ProfilingMiddleware(BaseHTTPMiddleware):
+    """
+    Runs a single request under cProfile when an admin sends X-Profile: 1.
+    The profile id is returned in X-Profile-Id and the digest is available
+    from /api/v1/diagnostics/profiles.
+    """
+    async def dispatch(self, request: Request, call_next):
+        if not RequestProfiler.enabled or request.headers.get("X-Profile") != "1":
+            return await call_next(request)
+
+        authorization = request.headers.get("Authorization", "")
+        if not authorization.startswith("Bearer "):
+            return await call_next(request)
+        try:
+            payload = decode_access_token(authorization.split("Bearer ")[1])
+        except JWTError:
+            return await call_next(request)
+        if payload.get("userType") != "admin":
+            return await call_next(request)
+
+        if not RequestProfiler.try_acquire():
+            response = await call_next(request)
+            response.headers["X-Profile-Status"] = "rate-limited"
+            return response
+
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        try:
+            profiler.enable()
+            try:
+                response = await call_next(request)
+            finally:
+                profiler.disable()
+            wall_time = time.perf_counter() - started
+            profile_id = RequestProfiler.store(
+                request.method, request.url.path, response.status_code, wall_time, profiler
+            )
+        finally:
+            RequestProfiler.release()
+
+        response.headers["X-Profile-Status"] = "profiled"
+        response.headers["X-Profile-Id"] = profile_id
+        return response
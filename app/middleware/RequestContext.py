@@ -0,0 +1,25 @@
+import re
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from app.helpers.Logger import request_id_var
+from app.helpers.Utilities import Utils
+
+REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+
+class RequestContextMiddleware(BaseHTTPMiddleware):
+    """
+    Assigns a request ID (reusing a well-formed incoming X-Request-ID) that is
+    attached to every log record and echoed back in the response.
+    """
+    async def dispatch(self, request: Request, call_next):
+        request_id = request.headers.get("X-Request-ID", "")
+        if not REQUEST_ID_PATTERN.match(request_id):
+            request_id = Utils.generate_hex_string(32)
+        token = request_id_var.set(request_id)
+        try:
+            response = await call_next(request)
+        finally:
+            request_id_var.reset(token)
+        response.headers["X-Request-ID"] = request_id
+        return response
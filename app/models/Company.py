@@ -1,6 +1,8 @@
 from typing import List, Optional
 from app.helpers.Database import MongoDB
+from app.helpers.Utilities import Utils
 from bson import ObjectId
+from pymongo import UpdateOne
 import os
 from app.schemas.Company import CompanySchema
 from datetime import datetime
@@ -9,10 +11,30 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Indexed shadow fields holding Utils.normalize_match_value of the source field
+NORMALIZED_FIELDS = {"country": "countryNorm", "jurisdiction": "jurisdictionNorm"}
+
+
+def with_normalized_fields(data: dict) -> dict:
+    """Add the shadow field for every normalized field present in data"""
+    shadow = {
+        normalized: Utils.normalize_match_value(data[field])
+        for field, normalized in NORMALIZED_FIELDS.items() if field in data
+    }
+    return {**data, **shadow}
+
+
 class CompanyModel:
     def __init__(self, db_name=os.getenv('DB_NAME'), collection_name="companies"):
         self.collection = MongoDB.get_database(db_name)[collection_name]
 
+    async def ensure_indexes(self):
+        # The compound index also serves countryNorm-only filters (its prefix)
+        await self.collection.create_index("jurisdictionNorm", name="jurisdictionNorm")
+        await self.collection.create_index(
+            [("countryNorm", 1), ("jurisdictionNorm", 1)], name="countryNorm_jurisdictionNorm"
+        )
+
     async def get_company(self, filters: dict) -> Optional[CompanySchema]:
         """
         Retrieve a single company matching the given filters.
@@ -41,6 +63,17 @@ class CompanyModel:
             companies.append(CompanySchema(**doc))
         return companies
 
+    async def get_companies_by_ids(self, company_ids: List[ObjectId]) -> List[CompanySchema]:
+        """
+        Retrieve the companies with the given IDs in one query (order is not preserved).
+        """
+        # One batch for the whole result, so a large id list is still a single round trip
+        cursor = self.collection.find({"_id": {"$in": company_ids}}).batch_size(max(len(company_ids), 1))
+        companies = []
+        async for doc in cursor:
+            companies.append(CompanySchema(**doc))
+        return companies
+
     async def get_companies_with_projection(self, filters: dict = {}, skip: int = 0, limit: int = 10, fields: List[str] = None) -> List[dict]:
         """
         Retrieve a list of companies matching the given filters with pagination and projection.
@@ -48,7 +81,8 @@ class CompanyModel:
         if fields is None:
             projection = {}
         else:
-            projection = {field: 1 for field in fields}
+            # An empty list still projects: only _id is returned
+            projection = {field: 1 for field in fields} or {"_id": 1}
 
         cursor = self.collection.find(filters, projection).skip(skip).limit(limit)
         result = []
@@ -62,7 +96,7 @@ class CompanyModel:
         """
         data["createdAt"] = datetime.utcnow()
         company = CompanySchema(**data)
-        result = await self.collection.insert_one(company.dict(by_alias=True))
+        result = await self.collection.insert_one(with_normalized_fields(company.dict(by_alias=True)))
         return result.inserted_id
 
     async def update_company(self, company_id: str, updates: dict) -> bool:
@@ -71,7 +105,7 @@ class CompanyModel:
         """
         filters = {"_id": ObjectId(company_id)}
         updates["updatedAt"] = datetime.utcnow()
-        result = await self.collection.update_one(filters, {"$set": updates})
+        result = await self.collection.update_one(filters, {"$set": with_normalized_fields(updates)})
         return result.modified_count > 0
 
 
@@ -82,9 +116,61 @@ class CompanyModel:
         result = await self.collection.delete_one({"_id": ObjectId(company_id)})
         return result.deleted_count > 0
 
-    async def update_many(self, filters: dict, update: dict) -> bool:
+    async def update_many(self, filters: dict, update: dict) -> dict:
         """
         Update multiple documents matching the given filters.
         """
-        await self.collection.update_many(filters, update)
-        return True
+        if "$set" in update:
+            update = {**update, "$set": with_normalized_fields(update["$set"])}
+        result = await self.collection.update_many(filters, update)
+        return {"matched": result.matched_count, "modified": result.modified_count}
+
+    async def delete_many(self, filters: dict) -> int:
+        """
+        Permanently delete every document matching the given filters.
+        """
+        result = await self.collection.delete_many(filters)
+        return result.deleted_count
+
+    async def get_company_ids_after(self, filters: dict, after_id: Optional[ObjectId], limit: int) -> List[ObjectId]:
+        """
+        Retrieve up to limit matching IDs greater than after_id, in _id order (keyset pagination).
+        """
+        if after_id is not None:
+            filters = {"$and": [filters, {"_id": {"$gt": after_id}}]}
+        cursor = self.collection.find(filters, {"_id": 1}).sort("_id", 1).limit(limit).batch_size(limit)
+        return [doc["_id"] async for doc in cursor]
+
+    async def backfill_normalized_fields(self, batch_size: int = 1000) -> dict:
+        """
+        Set missing or stale shadow fields on existing documents, batch_size
+        documents per bulk write. Documents are paged by _id, so the backfill
+        can run while the collection is being written to.
+        """
+        updated = 0
+        scanned = 0
+        last_id = None
+        projection = {field: 1 for field in (*NORMALIZED_FIELDS, *NORMALIZED_FIELDS.values())}
+        while True:
+            filters = {"_id": {"$gt": last_id}} if last_id is not None else {}
+            cursor = self.collection.find(filters, projection).sort("_id", 1).limit(batch_size).batch_size(batch_size)
+            documents = [doc async for doc in cursor]
+            if not documents:
+                break
+            scanned += len(documents)
+            last_id = documents[-1]["_id"]
+
+            operations = []
+            for doc in documents:
+                shadow = {
+                    normalized: Utils.normalize_match_value(doc.get(field))
+                    for field, normalized in NORMALIZED_FIELDS.items()
+                }
+                if any(normalized not in doc or doc[normalized] != value for normalized, value in shadow.items()):
+                    # Skip documents whose source fields changed since they were read
+                    unchanged = {field: doc.get(field) for field in NORMALIZED_FIELDS}
+                    operations.append(UpdateOne({"_id": doc["_id"], **unchanged}, {"$set": shadow}))
+            if operations:
+                result = await self.collection.bulk_write(operations, ordered=False)
+                updated += result.modified_count
+        return {"scanned": scanned, "updated": updated}
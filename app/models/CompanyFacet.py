@@ -0,0 +1,60 @@
+from typing import Dict, List, Optional, Tuple
+from app.helpers.Database import MongoDB
+from pymongo import UpdateOne
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+FACET_FIELDS = ("country", "jurisdiction")
+
+class CompanyFacetModel:
+    """
+    Rollup of company counts per facet value: one document per
+    (facet, value) bucket, so facet queries read only the buckets.
+    """
+    def __init__(self, db_name=os.getenv('DB_NAME'), collection_name="company_facets", source_collection_name="companies"):
+        database = MongoDB.get_database(db_name)
+        self.collection = database[collection_name]
+        self.source = database[source_collection_name]
+
+    async def ensure_indexes(self):
+        await self.collection.create_index([("facet", 1), ("value", 1)], unique=True, name="facet_value_unique")
+        await self.collection.create_index([("facet", 1), ("count", -1)], name="facet_count")
+
+    async def increment(self, deltas: Dict[Tuple[str, Optional[str]], int]):
+        """
+        Apply count changes per (facet, value) in one unordered bulk write.
+        """
+        operations = [
+            UpdateOne({"facet": facet, "value": value}, {"$inc": {"count": delta}}, upsert=True)
+            for (facet, value), delta in deltas.items() if delta
+        ]
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+
+    async def get_buckets(self, facet: str, limit: int) -> List[dict]:
+        """
+        Retrieve the largest non-empty buckets of a facet.
+        """
+        cursor = self.collection.find(
+            {"facet": facet, "count": {"$gt": 0}},
+            {"_id": 0, "value": 1, "count": 1}
+        ).sort("count", -1).limit(limit)
+        return [document async for document in cursor]
+
+    async def rebuild(self):
+        """
+        Recount every bucket from the companies collection. $out replaces the
+        rollup atomically and keeps its indexes.
+        """
+        pipeline = [
+            {"$project": {"_id": 0, "buckets": [
+                {"facet": facet, "value": {"$ifNull": [f"${facet}", None]}} for facet in FACET_FIELDS
+            ]}},
+            {"$unwind": "$buckets"},
+            {"$group": {"_id": "$buckets", "count": {"$sum": 1}}},
+            {"$project": {"_id": 0, "facet": "$_id.facet", "value": "$_id.value", "count": 1}},
+            {"$out": self.collection.name}
+        ]
+        await self.source.aggregate(pipeline).to_list(None)
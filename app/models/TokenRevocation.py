@@ -0,0 +1,69 @@
+from typing import List
+from app.helpers.Database import MongoDB
+from pymongo import ReturnDocument
+import os
+from datetime import datetime
+from dotenv import load_dotenv
+
+load_dotenv()
+
+COUNTER_ID = "token_revocations"
+
+class TokenRevocationModel:
+    """
+    Revocations are stored with a monotonically increasing version taken
+    from a counter document, so workers can fetch only what they have not
+    seen. Entries expire (TTL index) once no token they affect can still be valid.
+    """
+    def __init__(self, db_name=os.getenv('DB_NAME'), collection_name="token_revocations"):
+        database = MongoDB.get_database(db_name)
+        self.collection = database[collection_name]
+        self.counters = database["counters"]
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("version", name="version")
+        await self.collection.create_index("expireAt", expireAfterSeconds=0, name="expire_at_ttl")
+
+    async def _next_version(self) -> int:
+        counter = await self.counters.find_one_and_update(
+            {"_id": COUNTER_ID},
+            {"$inc": {"seq": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return counter["seq"]
+
+    async def revoke_token(self, jti: str, expire_at: datetime) -> dict:
+        """
+        Revoke a single token by its id until it expires.
+        """
+        document = {"type": "token", "jti": jti, "expireAt": expire_at, "createdOn": datetime.utcnow()}
+        document["version"] = await self._next_version()
+        await self.collection.insert_one(document)
+        return document
+
+    async def revoke_user(self, user_id: str, not_before: int, expire_at: datetime) -> dict:
+        """
+        Revoke every token issued to a user before not_before (epoch seconds).
+        """
+        document = {
+            "type": "user",
+            "userId": user_id,
+            "notBefore": not_before,
+            "expireAt": expire_at,
+            "createdOn": datetime.utcnow()
+        }
+        document["version"] = await self._next_version()
+        await self.collection.insert_one(document)
+        return document
+
+    async def get_current_version(self) -> int:
+        counter = await self.counters.find_one({"_id": COUNTER_ID})
+        return counter["seq"] if counter else 0
+
+    async def get_revocations_since(self, version: int) -> List[dict]:
+        """
+        Retrieve revocations newer than the given version, oldest first.
+        """
+        cursor = self.collection.find({"version": {"$gt": version}}, {"_id": 0}).sort("version", 1)
+        return [document async for document in cursor]
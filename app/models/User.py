@@ -1,6 +1,8 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from app.helpers.Database import MongoDB
 from bson import ObjectId
+from pymongo import InsertOne
+from pymongo.errors import BulkWriteError
 import os
 from app.schemas.User import UserSchema
 from datetime import datetime
@@ -13,6 +15,13 @@ class UserModel:
     def __init__(self, db_name=os.getenv('DB_NAME'), collection_name="users"):
         self.collection = MongoDB.get_database(db_name)[collection_name]
 
+    async def ensure_indexes(self):
+        """
+        Create the indexes the user queries rely on. The unique email index is
+        what makes signup a single write: duplicates raise DuplicateKeyError.
+        """
+        await self.collection.create_index("email", unique=True, name="email_unique")
+
     async def get_user(self, filters: dict) -> Optional[UserSchema]:
         """
         Retrieve a single user matching the given filters.
@@ -56,7 +65,8 @@ class UserModel:
         if fields is None:
             projection = {}
         else:
-            projection = {field: 1 for field in fields}
+            # An empty list still projects: only _id is returned
+            projection = {field: 1 for field in fields} or {"_id": 1}
 
         cursor = self.collection.find(filters, projection).skip(skip).limit(limit)
         result = []
@@ -73,6 +83,17 @@ class UserModel:
         result = await self.collection.insert_one(user.dict(by_alias=True))
         return result.inserted_id
 
+    async def insert_users_unordered(self, documents: List[dict]) -> Dict[int, dict]:
+        """
+        Insert prepared user documents with one unordered bulk write.
+        Returns the write errors keyed by document index; the rest were inserted.
+        """
+        try:
+            await self.collection.bulk_write([InsertOne(document) for document in documents], ordered=False)
+            return {}
+        except BulkWriteError as e:
+            return {error["index"]: error for error in e.details.get("writeErrors", [])}
+
     async def update_user(self, user_id: str, updates: dict) -> bool:
         """
         Update an existing user by its ID.
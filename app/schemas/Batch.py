@@ -0,0 +1,12 @@
+from pydantic import BaseModel, Field
+from typing import Any, List, Literal, Optional
+
+class BatchOperationSchema(BaseModel):
+    id: Optional[str] = Field(None, max_length=100)
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"]
+    path: str = Field(..., max_length=2048)
+    body: Optional[Any] = None
+
+class BatchRequestSchema(BaseModel):
+    operations: List[BatchOperationSchema] = Field(..., min_length=1)
+    stopOnError: bool = False
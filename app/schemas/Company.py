@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from bson import ObjectId
 from datetime import datetime
 from app.schemas.PyObjectId import PyObjectId
@@ -26,6 +26,28 @@ class UpdateCompanySchema(BaseModel):
     companyActivities: Optional[str] = Field(None, max_length=1000)
     secCode: Optional[str] = Field(None, max_length=50)
 
+class BatchGetCompaniesSchema(BaseModel):
+    ids: List[str] = Field(..., min_length=1)
+
+class CompanyBulkFilterSchema(BaseModel):
+    """Exact-match filter on indexed-friendly company fields"""
+    jurisdiction: Optional[str] = Field(None, max_length=100)
+    companyName: Optional[str] = Field(None, max_length=200)
+    zip: Optional[str] = Field(None, max_length=20)
+    country: Optional[str] = Field(None, max_length=100)
+    secCode: Optional[str] = Field(None, max_length=50)
+
+class BulkUpdateCompaniesSchema(BaseModel):
+    ids: Optional[List[str]] = None
+    filter: Optional[CompanyBulkFilterSchema] = None
+    update: UpdateCompanySchema
+    dryRun: bool = False
+
+class BulkDeleteCompaniesSchema(BaseModel):
+    ids: Optional[List[str]] = None
+    filter: Optional[CompanyBulkFilterSchema] = None
+    dryRun: bool = False
+
 class CompanySchema(BaseModel):
     id: Optional[PyObjectId] = Field(default_factory=ObjectId, alias="_id")
     jurisdiction: Optional[str] = Field(None, max_length=100)
@@ -43,3 +65,6 @@ class CompanySchema(BaseModel):
     class Config:
         populate_by_name = True
         json_encoders = {ObjectId: str}
+
+# Fields a listing may be narrowed to with ?fields=
+COMPANY_LIST_FIELDS = frozenset(field for field in CompanySchema.model_fields)
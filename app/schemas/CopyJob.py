@@ -0,0 +1,8 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class StartCopyJobSchema(BaseModel):
+    sourceUrl: str = Field(..., max_length=2048)
+    containerName: Optional[str] = Field(None, max_length=63)
+    folderName: Optional[str] = Field(None, max_length=200)
+    fileType: str = Field(".png", max_length=10)
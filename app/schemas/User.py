@@ -58,6 +58,9 @@ class UserSchema(BaseModel):
         populate_by_name = True
         json_encoders = {ObjectId: str}
 
+# Fields a listing may be narrowed to with ?fields= (never the password hash)
+USER_LIST_FIELDS = frozenset(field for field in UserSchema.model_fields if field != "password")
+
 #Get user Schema 
 class GetUserSchema(BaseModel):
     email: EmailStr
@@ -1,17 +1,31 @@
-from app.schemas.User import UserSchema
+from app.schemas.User import USER_LIST_FIELDS, AdminCreateUserSchema, UserSchema
 from app.models.User import UserModel
+from app.models.TokenRevocation import TokenRevocationModel
 from app.helpers.Utilities import Utils
 from pydantic import ValidationError
 from datetime import datetime, timedelta
 from fastapi import HTTPException, UploadFile
-# from app.helpers.AzureStorage import AzureBlobUploader  # Disabled: Azure blob not in use
+from fastapi.concurrency import run_in_threadpool
+from app.helpers.AdmissionControl import AdmissionRejected
+from app.helpers.TokenClaims import compact_claims
+from app.helpers.TokenRevocation import RevocationList
+from app.helpers.Projection import parse_fields, projected_document
+from app.helpers.Storage import iter_upload_file
+from app.dependencies import get_process_pool, get_profile_cache, get_signin_admission, get_storage_backend
 import os 
+import asyncio
+import logging
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
 class AuthService:
     
     def __init__(self):
         self.user_model = UserModel()
-        # self.uploader = AzureBlobUploader()  # Disabled: Azure blob not in use
+        self.revocation_model = TokenRevocationModel()
             
     async def get_user(self, email, password):
         """
@@ -27,8 +41,12 @@ class AuthService:
                     "error": "User does not exist"
                 }
 
-            # Verify password
-            password_match = Utils.verify_password(password, user.password)
+            # Verify password off the event loop, within the global verification cap
+            async with get_signin_admission().verification():
+                password_match = await run_in_threadpool(Utils.verify_password, password, user.password)
+                rounds = get_settings().BCRYPT_ROUNDS
+                if password_match and Utils.password_hash_rounds(user.password) != rounds:
+                    await self._rehash_password(user, password, rounds)
             if not password_match:
                 return {
                     "success": False,
@@ -36,12 +54,8 @@ class AuthService:
                     "error": "Invalid email or password"
                 }
 
-            # Create user response data
-            user_dict = user.dict()
-            user_dict.pop("password", None)  # Remove password from response
-            
-            # Create JWT token
-            token = Utils.create_jwt_token(user_dict)
+            # Create JWT token with compact claims; the rest comes from the profile cache
+            token = Utils.create_jwt_token(compact_claims(user))
             
             return {
                 "success": True,
@@ -56,6 +70,8 @@ class AuthService:
                 "data": None,
                 "error": f"Validation error: {error_details}"
             }
+        except AdmissionRejected:
+            raise
         except Exception as e:
             return {
                 "success": False,
@@ -63,30 +79,31 @@ class AuthService:
                 "error": str(e)
             }
     
+    async def _rehash_password(self, user, password: str, rounds: int):
+        """
+        Move a stored hash to the configured cost factor; we only have the
+        plain password at sign-in. Failure is logged and retried next sign-in.
+        """
+        try:
+            new_hash = await run_in_threadpool(Utils.hash_password, password, rounds)
+            await self.user_model.update_user(str(user.id), {"password": new_hash})
+        except Exception as e:
+            logger.warning("Failed to rehash password for user %s: %s", user.id, e)
+
     async def signup(self, user_data) -> dict:
         """
         Handle the signup process with enhanced validation and response.
-        - Checks if user exists
         - Validates and sanitizes input data
         - Hashes password
-        - Creates user record
+        - Creates user record (the unique email index rejects existing users)
         - Returns user data with JWT token
         """
         try:
-            # Check if user exists
-            existing_user = await self.user_model.get_user({"email": user_data.email})
-            if existing_user:
-                return {
-                    "success": False,
-                    "data": None,
-                    "error": "User Already Exists."
-                }
-
             # Prepare user data
             user_data_dict = user_data.dict()
             
             # Hash password
-            hashed_password = Utils.hash_password(user_data.password)
+            hashed_password = await run_in_threadpool(Utils.hash_password, user_data.password)
             user_data_dict["password"] = hashed_password
             
             # Set timestamps
@@ -95,7 +112,14 @@ class AuthService:
             user_data_dict["updatedOn"] = current_time
             
             # Create user
-            user_id = await self.user_model.create_user(user_data_dict)
+            try:
+                user_id = await self.user_model.create_user(user_data_dict)
+            except DuplicateKeyError:
+                return {
+                    "success": False,
+                    "data": None,
+                    "error": "User Already Exists."
+                }
             
             # Prepare response data
             user_data_dict["_id"] = str(user_id)
@@ -125,31 +149,46 @@ class AuthService:
             }
 
     
-    def upload_profile_picture(self, file: UploadFile):
+    async def upload_profile_picture(self, file: UploadFile):
         try:
-            raise Exception("Azure Blob upload is disabled")
+            file_extension = os.path.splitext(file.filename or "")[1]
+            return await get_storage_backend().save_stream(
+                iter_upload_file(file),
+                file_extension,
+                folder_name="profile-pictures",
+                content_type=file.content_type
+            )
         except Exception as e:
             raise Exception(f"Error uploading profile picture: {str(e)}")
         
-    async def get_all_users(self, page: int = 1, limit: int = 10):
+    async def get_all_users(self, page: int = 1, limit: int = 10, fields: str = None):
         try:
             import asyncio
             filters = {}
             number_to_skip = (page - 1) * limit
-            
-            # Run queries in parallel for better performance
-            total, users = await asyncio.gather(
-                self.user_model.get_documents_count(filters),
-                self.user_model.get_users(filters, number_to_skip, limit)
-            )
+            projection = parse_fields(fields, USER_LIST_FIELDS)
+
+            if projection is not None:
+                # Projected documents never include the password and skip UserSchema construction
+                total, users = await asyncio.gather(
+                    self.user_model.get_documents_count(filters),
+                    self.user_model.get_users_with_projection(filters, number_to_skip, limit, projection)
+                )
+                users_data = [projected_document(user) for user in users]
+            else:
+                # Run queries in parallel for better performance
+                total, users = await asyncio.gather(
+                    self.user_model.get_documents_count(filters),
+                    self.user_model.get_users(filters, number_to_skip, limit)
+                )
+
+                # Remove password from user dicts
+                users_data = []
+                for user in users:
+                    user_dict = user.dict()
+                    user_dict.pop('password', None)
+                    users_data.append(user_dict)
             total_pages = (total + limit - 1) // limit
-            
-            # Remove password from user dicts
-            users_data = []
-            for user in users:
-                user_dict = user.dict()
-                user_dict.pop('password', None)
-                users_data.append(user_dict)
             return {
                 "success": True,
                 "data": {
@@ -171,6 +210,7 @@ class AuthService:
     async def delete_user(self, user_id: str):
         try:
             deleted = await self.user_model.delete_user(user_id)
+            get_profile_cache().invalidate(user_id)
             if deleted:
                 return {"success": True, "data": "User deleted successfully."}
             else:
@@ -178,6 +218,41 @@ class AuthService:
         except Exception as e:
             return {"success": False, "data": None, "error": str(e)}
         
+    async def signout(self, jwt_payload: dict) -> dict:
+        """
+        Revoke the presented token until it expires.
+        Applied locally at once; other workers pick it up on their next poll.
+        """
+        try:
+            expire_at = datetime.utcfromtimestamp(jwt_payload["exp"]) if jwt_payload.get("exp") else datetime.utcnow()
+            revocation = await self.revocation_model.revoke_token(jwt_payload["jti"], expire_at)
+            RevocationList.apply(revocation)
+            return {"success": True, "data": {"message": "Signed out successfully"}}
+        except Exception as e:
+            return {"success": False, "data": None, "error": str(e)}
+
+    async def revoke_user_tokens(self, user_id: str) -> dict:
+        """
+        Revoke every token issued to a user so far.
+        Tokens issued from the next second on are unaffected, so the user can sign in again.
+        """
+        try:
+            user = await self.user_model.get_user({"_id": ObjectId(user_id)})
+            if not user:
+                return {"success": False, "data": None, "error": "User not found"}
+
+            # Same clock and resolution as the token's iat claim
+            not_before = int(datetime.utcnow().timestamp()) + 1
+            expire_at = datetime.utcnow() + timedelta(seconds=int(os.getenv("JWT_EXPIRY", 3600)) + 1)
+            # Canonical form, as in the token's sub claim; the path may use uppercase hex
+            user_id = str(user.id)
+            revocation = await self.revocation_model.revoke_user(user_id, not_before, expire_at)
+            RevocationList.apply(revocation)
+            get_profile_cache().invalidate(user_id)
+            return {"success": True, "data": {"message": "All tokens revoked", "notBefore": not_before}}
+        except Exception as e:
+            return {"success": False, "data": None, "error": str(e)}
+
     async def update_user(self, user_id: str, update_data: dict) -> dict:
         """
         Update user information by user_id.
@@ -186,6 +261,7 @@ class AuthService:
             if not update_data:
                 return {"success": False, "data": None, "error": "No data provided for update."}
             updated = await self.user_model.update_user(user_id, update_data)
+            get_profile_cache().invalidate(user_id)
             if not updated:
                 return {"success": True, "data": "No new changes in data."}
             return {"success": True, "data": "User info updated successfully."}
@@ -261,7 +337,11 @@ class AuthService:
             update_data["updatedOn"] = datetime.utcnow()
             
             # Update user
-            updated = await self.user_model.update_user(user_id, update_data)
+            try:
+                updated = await self.user_model.update_user(user_id, update_data)
+            except DuplicateKeyError:
+                return {"success": False, "data": None, "error": "User with this email already exists."}
+            get_profile_cache().invalidate(user_id)
             if not updated:
                 return {"success": True, "data": "No new changes in data."}
             
@@ -280,28 +360,153 @@ class AuthService:
         except Exception as e:
             return {"success": False, "data": None, "error": str(e)}
 
-    async def get_users_by_admin(self, admin_id: str, page: int = 1, limit: int = 10) -> dict:
+    async def _hash_in_process_pool(self, passwords: list, rounds: int) -> list:
+        """
+        Hash passwords across the process pool in small chunks, leaving one
+        worker free so other pool users are not starved by a large batch.
+        """
+        settings = get_settings()
+        chunk_size = settings.BULK_HASH_CHUNK_SIZE
+        max_in_flight = max(1, (settings.PROCESS_POOL_WORKERS or os.cpu_count() or 1) - 1)
+        loop = asyncio.get_running_loop()
+        pool = get_process_pool()
+        hashes = [None] * len(passwords)
+        pending = set()
+
+        async def hash_chunk(start: int):
+            chunk = await loop.run_in_executor(pool, Utils.hash_passwords, passwords[start:start + chunk_size], rounds)
+            hashes[start:start + len(chunk)] = chunk
+
+        try:
+            for start in range(0, len(passwords), chunk_size):
+                if len(pending) >= max_in_flight:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        task.result()
+                pending.add(asyncio.ensure_future(hash_chunk(start)))
+            if pending:
+                await asyncio.gather(*pending)
+                pending = set()
+        finally:
+            for task in pending:
+                task.cancel()
+        return hashes
+
+    async def bulk_create_users_by_admin(self, rows: list, admin_id: str) -> dict:
+        """
+        Create many users for an admin in one request.
+        - Validates every row independently against AdminCreateUserSchema
+        - Rejects repeated emails within the request
+        - Hashes passwords in parallel in the process pool
+        - Inserts with one unordered bulk write; the unique email index
+          rejects existing users without failing the other rows
+        - Returns a result per row, in input order
+        """
+        try:
+            results = [None] * len(rows)
+            valid = []
+            seen_emails = set()
+            for index, row in enumerate(rows):
+                if isinstance(row, dict) and any(not isinstance(key, str) for key in row):
+                    # csv.DictReader files cells beyond the header under the key None
+                    results[index] = {"row": index, "success": False, "error": "Row has more values than the header"}
+                    continue
+                try:
+                    user_data = AdminCreateUserSchema(**row) if isinstance(row, dict) else None
+                except ValidationError as e:
+                    errors = "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors())
+                    results[index] = {"row": index, "success": False, "error": f"Validation error: {errors}"}
+                    continue
+                if user_data is None:
+                    results[index] = {"row": index, "success": False, "error": "Row must be an object"}
+                    continue
+                if user_data.email in seen_emails:
+                    results[index] = {"row": index, "email": user_data.email, "success": False,
+                                      "error": "Duplicate email in request"}
+                    continue
+                seen_emails.add(user_data.email)
+                valid.append((index, user_data))
+
+            hashes = await self._hash_in_process_pool(
+                [user_data.password for _, user_data in valid],
+                get_settings().BCRYPT_ROUNDS
+            )
+
+            current_time = datetime.utcnow()
+            documents = []
+            for (_, user_data), hashed_password in zip(valid, hashes):
+                user_data_dict = user_data.dict()
+                user_data_dict.update({
+                    "password": hashed_password,
+                    "userType": "user",
+                    "adminId": admin_id,
+                    "createdOn": current_time,
+                    "updatedOn": current_time
+                })
+                documents.append(UserSchema(**user_data_dict).dict(by_alias=True))
+
+            write_errors = await self.user_model.insert_users_unordered(documents) if documents else {}
+            for position, ((index, user_data), document) in enumerate(zip(valid, documents)):
+                error = write_errors.get(position)
+                if error is None:
+                    results[index] = {"row": index, "email": user_data.email, "success": True,
+                                      "userId": str(document["_id"])}
+                elif error.get("code") == 11000:
+                    results[index] = {"row": index, "email": user_data.email, "success": False,
+                                      "error": "User with this email already exists."}
+                else:
+                    results[index] = {"row": index, "email": user_data.email, "success": False,
+                                      "error": error.get("errmsg", "Insert failed")}
+
+            created = sum(1 for result in results if result["success"])
+            return {
+                "success": True,
+                "data": {
+                    "total": len(rows),
+                    "created": created,
+                    "failed": len(rows) - created,
+                    "results": results
+                }
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+
+    async def get_users_by_admin(self, admin_id: str, page: int = 1, limit: int = 10, fields: str = None) -> dict:
         """
         Get all users created by a specific admin with pagination.
+        fields is an optional comma-separated list; only those fields (and id) are read and returned.
         """
         try:
             import asyncio
             filters = {"adminId": admin_id}
             number_to_skip = (page - 1) * limit
-            
-            # Run queries in parallel for better performance
-            total, users = await asyncio.gather(
-                self.user_model.get_documents_count(filters),
-                self.user_model.get_users(filters, number_to_skip, limit)
-            )
+            projection = parse_fields(fields, USER_LIST_FIELDS)
+
+            if projection is not None:
+                # Projected documents never include the password and skip UserSchema construction
+                total, users = await asyncio.gather(
+                    self.user_model.get_documents_count(filters),
+                    self.user_model.get_users_with_projection(filters, number_to_skip, limit, projection)
+                )
+                users_data = [projected_document(user) for user in users]
+            else:
+                # Run queries in parallel for better performance
+                total, users = await asyncio.gather(
+                    self.user_model.get_documents_count(filters),
+                    self.user_model.get_users(filters, number_to_skip, limit)
+                )
+
+                # Remove password from user dicts
+                users_data = []
+                for user in users:
+                    user_dict = user.dict()
+                    user_dict.pop('password', None)
+                    users_data.append(user_dict)
             total_pages = (total + limit - 1) // limit
-            
-            # Remove password from user dicts
-            users_data = []
-            for user in users:
-                user_dict = user.dict()
-                user_dict.pop('password', None)
-                users_data.append(user_dict)
                 
             return {
                 "success": True,
@@ -325,28 +530,18 @@ class AuthService:
     async def create_user_by_admin(self, user_data, admin_id: str) -> dict:
         """
         Create a new user by admin with admin ID tracking.
-        - Checks if user exists
         - Validates and sanitizes input data
         - Hashes password
         - Sets userType to USER
         - Saves admin ID who created the user
-        - Creates user record
+        - Creates user record (the unique email index rejects existing users)
         """
         try:
-            # Check if user exists
-            existing_user = await self.user_model.get_user({"email": user_data.email})
-            if existing_user:
-                return {
-                    "success": False,
-                    "data": None,
-                    "error": "User with this email already exists."
-                }
-
             # Prepare user data
             user_data_dict = user_data.dict()
             
             # Hash password
-            hashed_password = Utils.hash_password(user_data.password)
+            hashed_password = await run_in_threadpool(Utils.hash_password, user_data.password)
             user_data_dict["password"] = hashed_password
             
             # Set user type to USER (cannot create admin via this endpoint)
@@ -361,7 +556,14 @@ class AuthService:
             user_data_dict["updatedOn"] = current_time
             
             # Create user
-            user_id = await self.user_model.create_user(user_data_dict)
+            try:
+                user_id = await self.user_model.create_user(user_data_dict)
+            except DuplicateKeyError:
+                return {
+                    "success": False,
+                    "data": None,
+                    "error": "User with this email already exists."
+                }
             
             # Prepare response data
             response_data = {
@@ -0,0 +1,98 @@
+import asyncio
+import logging
+from typing import List
+from urllib.parse import urlsplit
+from app.helpers.DbMetrics import DbMetrics, RequestDbStats, db_stats_var
+from app.helpers.InProcessDispatch import dispatch
+from app.schemas.Batch import BatchOperationSchema
+
+logger = logging.getLogger(__name__)
+
+BATCHABLE_PREFIXES = ("/api/v1/auth", "/api/v1/profile", "/api/v1/companies")
+
+
+def is_batchable(path: str) -> bool:
+    path = urlsplit(path).path
+    return any(path == prefix or path.startswith(prefix + "/") for prefix in BATCHABLE_PREFIXES)
+
+
+class BatchService:
+    async def _run(self, request, operation: BatchOperationSchema, state: dict) -> dict:
+        """
+        Dispatch one operation with its own round-trip accounting, so route
+        budgets and histograms see the sub-request rather than the whole batch.
+        """
+        parent_stats = db_stats_var.get()
+        stats = RequestDbStats()
+        token = db_stats_var.set(stats)
+        try:
+            response = await dispatch(request.app, request.scope, operation.method, operation.path, operation.body, state)
+            result = {"id": operation.id, "status": response.status, "body": response.json()}
+        except Exception as e:
+            logger.exception("Batch operation %s %s failed", operation.method, operation.path)
+            response = None
+            result = {
+                "id": operation.id,
+                "status": 500,
+                "body": {"detail": {"data": None, "error": "Internal server error", "success": False}}
+            }
+        finally:
+            db_stats_var.reset(token)
+
+        if response is not None and response.route_path:
+            DbMetrics.observe(f"{operation.method} {response.route_path}", stats)
+        if parent_stats is not None:
+            parent_stats.round_trips += stats.round_trips
+            parent_stats.duration_ms += stats.duration_ms
+        return result
+
+    async def execute(self, request, operations: List[BatchOperationSchema], stop_on_error: bool = False):
+        """
+        Run the operations in order. Consecutive GETs do not depend on each
+        other and run concurrently; every other method runs alone, after the
+        operations before it have finished.
+        """
+        try:
+            invalid = [operation.path for operation in operations if not is_batchable(operation.path)]
+            if invalid:
+                return {
+                    "success": False,
+                    "data": None,
+                    "error": f"Only auth, profile and company routes can be batched: {', '.join(invalid)}"
+                }
+
+            state = {"verified_token": getattr(request.state, "verified_token", None)}
+            results = []
+            index = 0
+            while index < len(operations):
+                group = [operations[index]]
+                if group[0].method == "GET":
+                    while index + len(group) < len(operations) and operations[index + len(group)].method == "GET":
+                        group.append(operations[index + len(group)])
+                index += len(group)
+
+                if len(group) == 1:
+                    results.append(await self._run(request, group[0], state))
+                else:
+                    results.extend(await asyncio.gather(*(self._run(request, operation, state) for operation in group)))
+
+                if stop_on_error and any(result["status"] >= 400 for result in results):
+                    results.extend(
+                        {"id": operation.id, "status": 424, "body": None}
+                        for operation in operations[index:]
+                    )
+                    break
+
+            return {
+                "success": True,
+                "data": {
+                    "results": results,
+                    "failed": sum(1 for result in results if result["status"] >= 400)
+                }
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
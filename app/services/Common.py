@@ -1,28 +1,66 @@
-# from app.helpers.AzureStorage import AzureBlobUploader  # Disabled: Azure blob not in use
-import os
+from app.dependencies import get_storage_backend
 
 
 class CommonService:
-    def __init__(self):
-        # self.azure_uploader = AzureBlobUploader()  # Disabled: Azure blob not in use
-        
+    @property
+    def storage(self):
+        return get_storage_backend()
+
     async def upload_file(self, file_path, folder_name="general-storage", file_type=".png"):
         """
-        Upload a file to Azure Blob Storage
+        Upload a file to the configured storage backend
         
         Args:
             file_path: Path to the file to upload
-            folder_name: Azure blob container folder name
+            folder_name: Storage folder name
             file_type: File extension/type
             
         Returns:
             dict: Success status and file URL or error message
         """
         try:
+            file_url = await self.storage.save_file(file_path, folder_name=folder_name)
+            return {
+                "success": True,
+                "data": {
+                    "url": file_url
+                }
+            }
+        except Exception as e:
             return {
                 "success": False,
                 "data": None,
-                "error": "Azure Blob upload is disabled"
+                "error": str(e)
+            }
+    
+    async def upload_file_to_operator_folder(self, file_path, operator_id: str, folder_name: str = None) -> dict:
+        """
+        Upload a file into an operator's folder, replacing whatever the folder held
+        
+        Args:
+            file_path: Path to the file to upload
+            operator_id: Operator the folder belongs to
+            folder_name: Sub-folder to clear and upload into; without it the file
+                is added to the operator's root folder and nothing is deleted
+            
+        Returns:
+            dict: Success status, file URL and folder clear stats, or error message
+        """
+        try:
+            cleared = None
+            if folder_name:
+                full_folder_path = f"{operator_id}/{folder_name}"
+                cleared = await self.storage.clear_prefix(full_folder_path)
+            else:
+                full_folder_path = operator_id
+
+            file_url = await self.storage.save_file(file_path, folder_name=full_folder_path)
+            return {
+                "success": True,
+                "data": {
+                    "url": file_url,
+                    "cleared": cleared
+                }
             }
         except Exception as e:
             return {
@@ -30,10 +68,10 @@ class CommonService:
                 "data": None,
                 "error": str(e)
             }
-    
+
     async def delete_file(self, file_url: str) -> dict:
         """
-        Delete a file from Azure Blob Storage
+        Delete a file from the configured storage backend
         
         Args:
             file_url: URL of the file to delete
@@ -42,14 +80,16 @@ class CommonService:
             dict: Success status and message or error
         """
         try:
+            await self.storage.delete(file_url)
             return {
-                "success": False,
-                "data": None,
-                "error": "Azure Blob delete is disabled"
+                "success": True,
+                "data": {
+                    "message": "File deleted successfully"
+                }
             }
         except Exception as e:
             return {
                 "success": False,
                 "data": None,
                 "error": str(e)
-            }
\ No newline at end of file
+            }
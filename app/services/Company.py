@@ -1,11 +1,32 @@
+import asyncio
+import logging
+import time
 from datetime import datetime
+from typing import List, Optional
 from bson import ObjectId
 from app.models.Company import CompanyModel
-from app.schemas.Company import CreateCompanySchema, UpdateCompanySchema
+from app.models.CompanyFacet import FACET_FIELDS, CompanyFacetModel
+from app.helpers.SingleFlight import SingleFlight, normalize_key
+from app.helpers.Projection import parse_fields, projected_document
+from app.schemas.Company import COMPANY_LIST_FIELDS, CompanyBulkFilterSchema, CreateCompanySchema, UpdateCompanySchema
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+FACET_REBUILD_MIN_GAP_SECONDS = 30.0
 
 class CompanyService:
     def __init__(self):
         self.company_model = CompanyModel()
+        self.facet_model = CompanyFacetModel()
+        # Identical reads in flight at the same time share one database call
+        self.reads = SingleFlight()
+        self._facet_rebuilds: Optional[asyncio.Task] = None
+        self._facet_rebuild_requested = asyncio.Event()
+        self.facets_rebuilt_at: Optional[datetime] = None
+        # Bumped when a rebuild starts and when it ends; see _adjust_facets
+        self._facet_epoch = 0
+        self._facet_rebuilds_running = 0
     
     async def create_company(self, data: CreateCompanySchema):
         """
@@ -16,7 +37,10 @@ class CompanyService:
             company_data = data.model_dump(exclude_unset=True)
             
             # Create company
+            facet_epoch = self._facet_epoch
             company_id = await self.company_model.create_company(company_data)
+            self._forget_reads()
+            await self._adjust_facets(None, company_data, facet_epoch)
             
             # Get the created company
             created_company = await self.company_model.get_company({"_id": company_id})
@@ -53,7 +77,10 @@ class CompanyService:
                     "error": "Invalid company ID format"
                 }
 
-            company = await self.company_model.get_company({"_id": ObjectId(company_id)})
+            company = await self.reads.do(
+                ("company", company_id),
+                lambda: self.company_model.get_company({"_id": ObjectId(company_id)})
+            )
             if not company:
                 return {
                     "success": False,
@@ -74,18 +101,25 @@ class CompanyService:
                 "error": str(e)
             }
 
-    async def get_companies(self, skip: int = 0, limit: int = 10, filters: dict = None):
+    async def get_companies(self, skip: int = 0, limit: int = 10, filters: dict = None, fields: str = None):
         """
-        Get list of companies with pagination
+        Get list of companies with pagination.
+        fields is an optional comma-separated list; only those fields (and id) are read and returned.
         """
         try:
             if filters is None:
                 filters = {}
+            projection = parse_fields(fields, COMPANY_LIST_FIELDS)
 
-            companies = await self.company_model.get_companies(filters, skip, limit)
-            total_count = await self.company_model.get_companies_count(filters)
+            companies, total_count = await self.reads.do(
+                ("companies", normalize_key(filters, skip, limit, projection)),
+                lambda: self._fetch_companies(filters, skip, limit, projection)
+            )
 
-            companies_data = [company.dict() for company in companies]
+            if projection is None:
+                companies_data = [company.dict() for company in companies]
+            else:
+                companies_data = [projected_document(company) for company in companies]
 
             return {
                 "success": True,
@@ -106,6 +140,77 @@ class CompanyService:
                 "error": str(e)
             }
 
+    async def get_companies_by_ids(self, company_ids: List[str]):
+        """
+        Get several companies by ID with one query, in the requested order.
+        Unknown IDs are reported as missing and malformed ones as invalid.
+        """
+        try:
+            invalid = [company_id for company_id in company_ids if not ObjectId.is_valid(company_id)]
+            requested = list(dict.fromkeys(
+                str(ObjectId(company_id)) for company_id in company_ids if ObjectId.is_valid(company_id)
+            ))
+
+            companies = []
+            if requested:
+                companies = await self.reads.do(
+                    ("companies-by-id", normalize_key(sorted(requested))),
+                    lambda: self.company_model.get_companies_by_ids([ObjectId(company_id) for company_id in requested])
+                )
+            found = {str(company.id): company for company in companies}
+
+            return {
+                "success": True,
+                "data": {
+                    "companies": [found[company_id].dict() for company_id in requested if company_id in found],
+                    "missing": [company_id for company_id in requested if company_id not in found],
+                    "invalid": invalid
+                }
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+
+    async def _fetch_companies(self, filters: dict, skip: int, limit: int, fields: Optional[List[str]] = None):
+        if fields is None:
+            companies = await self.company_model.get_companies(filters, skip, limit)
+        else:
+            # Projected documents skip CompanySchema construction
+            companies = await self.company_model.get_companies_with_projection(filters, skip, limit, fields)
+        total_count = await self.company_model.get_companies_count(filters)
+        return companies, total_count
+
+    async def _adjust_facets(self, before: Optional[dict], after: Optional[dict], facet_epoch: int):
+        """
+        Move a company between facet buckets. A failure is only logged: the
+        periodic rebuild corrects the counts.
+        facet_epoch is self._facet_epoch read before the company was written.
+        If a rebuild overlapped the write or the delta, the delta may have gone
+        into the collection the rebuild replaces, or be counted twice, so
+        another rebuild is requested.
+        """
+        deltas = {}
+        for facet in FACET_FIELDS:
+            if before is not None:
+                key = (facet, before.get(facet))
+                deltas[key] = deltas.get(key, 0) - 1
+            if after is not None:
+                key = (facet, after.get(facet))
+                deltas[key] = deltas.get(key, 0) + 1
+        try:
+            await self.facet_model.increment(deltas)
+        except Exception as e:
+            logger.warning("Failed to update company facet counts: %s", e)
+        if self._facet_rebuilds_running or self._facet_epoch != facet_epoch:
+            self.request_facet_rebuild()
+
+    def _forget_reads(self):
+        """Reads already in flight may predate a write; later callers must not join them"""
+        self.reads.clear()
+
     async def update_company(self, company_id: str, data: UpdateCompanySchema):
         """
         Update an existing company
@@ -138,7 +243,12 @@ class CompanyService:
                 }
 
             # Update company
+            facet_epoch = self._facet_epoch
             updated = await self.company_model.update_company(company_id, update_data)
+            self._forget_reads()
+            if updated:
+                before = existing_company.dict()
+                await self._adjust_facets(before, {**before, **update_data}, facet_epoch)
             if not updated:
                 return {
                     "success": True,
@@ -190,7 +300,11 @@ class CompanyService:
                 }
 
             # Delete company permanently
+            facet_epoch = self._facet_epoch
             deleted = await self.company_model.delete_company(company_id)
+            self._forget_reads()
+            if deleted:
+                await self._adjust_facets(existing_company.dict(), None, facet_epoch)
             if not deleted:
                 return {
                     "success": False,
@@ -210,3 +324,254 @@ class CompanyService:
                 "data": None,
                 "error": str(e)
             }
+
+    def _bulk_target(self, ids: Optional[List[str]], filter: Optional[CompanyBulkFilterSchema]):
+        """
+        Build the query for a bulk operation from exactly one of an ID list or an exact-match filter.
+        Returns (filters, object_ids, error).
+        """
+        if (ids is None) == (filter is None):
+            return None, None, "Provide either ids or filter"
+        if ids is not None:
+            if not ids:
+                return None, None, "ids must not be empty"
+            if len(ids) > get_settings().COMPANY_BULK_MAX_IDS:
+                return None, None, f"Too many ids (limit {get_settings().COMPANY_BULK_MAX_IDS})"
+            invalid = [company_id for company_id in ids if not ObjectId.is_valid(company_id)]
+            if invalid:
+                return None, None, f"Invalid company ID format: {', '.join(invalid[:10])}"
+            object_ids = list(dict.fromkeys(ObjectId(company_id) for company_id in ids))
+            return {"_id": {"$in": object_ids}}, object_ids, None
+
+        filters = filter.model_dump(exclude_none=True)
+        if not filters:
+            return None, None, "filter must set at least one field"
+        return filters, None, None
+
+    async def _bulk_chunks(self, filters: dict, object_ids: Optional[List[ObjectId]]):
+        """
+        Yield one query per chunk of COMPANY_BULK_CHUNK_SIZE documents. Filter
+        matches are paged by _id, and each chunk re-applies the filter so
+        documents changed in the meantime are not touched.
+        """
+        chunk_size = get_settings().COMPANY_BULK_CHUNK_SIZE
+        if object_ids is not None:
+            for start in range(0, len(object_ids), chunk_size):
+                yield {"_id": {"$in": object_ids[start:start + chunk_size]}}
+            return
+
+        last_id = None
+        while True:
+            chunk_ids = await self.company_model.get_company_ids_after(filters, last_id, chunk_size)
+            if not chunk_ids:
+                return
+            yield {"$and": [filters, {"_id": {"$in": chunk_ids}}]}
+            if len(chunk_ids) < chunk_size:
+                return
+            last_id = chunk_ids[-1]
+
+    async def bulk_update_companies(self, ids: Optional[List[str]], filter: Optional[CompanyBulkFilterSchema],
+                                    data: UpdateCompanySchema, dry_run: bool = False):
+        """
+        Apply one update to every company selected by ids or filter, chunk by chunk.
+        With dry_run only the number of matching companies is returned.
+        """
+        try:
+            filters, object_ids, error = self._bulk_target(ids, filter)
+            if error:
+                return {"success": False, "data": None, "error": error}
+
+            update_data = data.model_dump(exclude_unset=True)
+            if not update_data:
+                return {"success": False, "data": None, "error": "No data provided for update"}
+
+            if dry_run:
+                matched = await self.company_model.get_companies_count(filters)
+                return {"success": True, "data": {"dryRun": True, "matched": matched}}
+
+            update_data["updatedAt"] = datetime.utcnow()
+            changes_facets = any(field in update_data for field in FACET_FIELDS)
+            chunks = []
+            async for chunk_filters in self._bulk_chunks(filters, object_ids):
+                started = time.perf_counter()
+                result = await self.company_model.update_many(chunk_filters, {"$set": update_data})
+                chunks.append({
+                    "chunk": len(chunks),
+                    "matched": result["matched"],
+                    "modified": result["modified"],
+                    "elapsedMs": round((time.perf_counter() - started) * 1000, 3)
+                })
+                self._forget_reads()
+                logger.info("Bulk company update chunk %d: %d modified", len(chunks) - 1, result["modified"])
+
+            if changes_facets:
+                # Per-document old values are not read in bulk; recount instead
+                self.request_facet_rebuild()
+
+            return {
+                "success": True,
+                "data": {
+                    "dryRun": False,
+                    "matched": sum(chunk["matched"] for chunk in chunks),
+                    "modified": sum(chunk["modified"] for chunk in chunks),
+                    "chunks": chunks
+                }
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+
+    async def bulk_delete_companies(self, ids: Optional[List[str]], filter: Optional[CompanyBulkFilterSchema],
+                                    dry_run: bool = False):
+        """
+        Permanently delete every company selected by ids or filter, chunk by chunk.
+        With dry_run only the number of matching companies is returned.
+        """
+        try:
+            filters, object_ids, error = self._bulk_target(ids, filter)
+            if error:
+                return {"success": False, "data": None, "error": error}
+
+            if dry_run:
+                matched = await self.company_model.get_companies_count(filters)
+                return {"success": True, "data": {"dryRun": True, "matched": matched}}
+
+            chunks = []
+            async for chunk_filters in self._bulk_chunks(filters, object_ids):
+                started = time.perf_counter()
+                deleted = await self.company_model.delete_many(chunk_filters)
+                chunks.append({
+                    "chunk": len(chunks),
+                    "deleted": deleted,
+                    "elapsedMs": round((time.perf_counter() - started) * 1000, 3)
+                })
+                self._forget_reads()
+                logger.info("Bulk company delete chunk %d: %d deleted", len(chunks) - 1, deleted)
+
+            if chunks:
+                self.request_facet_rebuild()
+
+            return {
+                "success": True,
+                "data": {
+                    "dryRun": False,
+                    "deleted": sum(chunk["deleted"] for chunk in chunks),
+                    "chunks": chunks
+                }
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+
+    async def backfill_normalized_fields(self):
+        """
+        Set the normalized shadow fields on companies written before they existed
+        """
+        try:
+            started = time.perf_counter()
+            result = await self.company_model.backfill_normalized_fields(get_settings().COMPANY_BULK_CHUNK_SIZE)
+            self._forget_reads()
+            return {
+                "success": True,
+                "data": {**result, "elapsedMs": round((time.perf_counter() - started) * 1000, 3)}
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+
+    async def get_facets(self, facets: List[str], limit: int = 50):
+        """
+        Get company counts per value of each facet, largest first, from the rollup
+        """
+        try:
+            unknown = [facet for facet in facets if facet not in FACET_FIELDS]
+            if unknown:
+                return {
+                    "success": False,
+                    "data": None,
+                    "error": f"Unknown facets: {', '.join(unknown)}. Allowed: {', '.join(FACET_FIELDS)}"
+                }
+
+            buckets = await asyncio.gather(*(self.facet_model.get_buckets(facet, limit) for facet in facets))
+            return {
+                "success": True,
+                "data": {
+                    "facets": dict(zip(facets, buckets)),
+                    "rebuiltAt": self.facets_rebuilt_at
+                }
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+
+    async def rebuild_facets(self):
+        """
+        Recount the facet rollup from the companies collection
+        """
+        self._facet_rebuilds_running += 1
+        self._facet_epoch += 1
+        try:
+            started = time.perf_counter()
+            await self.facet_model.rebuild()
+            self.facets_rebuilt_at = datetime.utcnow()
+            return {
+                "success": True,
+                "data": {
+                    "message": "Company facets rebuilt",
+                    "elapsedMs": round((time.perf_counter() - started) * 1000, 3)
+                }
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+        finally:
+            self._facet_rebuilds_running -= 1
+            self._facet_epoch += 1
+
+    def request_facet_rebuild(self):
+        """Ask the background task to rebuild the rollup now"""
+        self._facet_rebuild_requested.set()
+
+    async def _rebuild_facets_periodically(self, interval: float):
+        while True:
+            # Cleared first, so a request made during the rebuild triggers another one
+            self._facet_rebuild_requested.clear()
+            result = await self.rebuild_facets()
+            if not result["success"]:
+                logger.warning("Company facet rebuild failed: %s", result["error"])
+            # Writes during a rebuild request another one; space them out under steady writes
+            gap = min(FACET_REBUILD_MIN_GAP_SECONDS, interval)
+            await asyncio.sleep(gap)
+            try:
+                await asyncio.wait_for(self._facet_rebuild_requested.wait(), interval - gap)
+            except asyncio.TimeoutError:
+                pass
+
+    def start_facet_rebuilds(self, interval: float):
+        """Rebuild the rollup now and then every interval seconds (or when requested)"""
+        if self._facet_rebuilds is None:
+            self._facet_rebuilds = asyncio.ensure_future(self._rebuild_facets_periodically(interval))
+
+    async def stop_facet_rebuilds(self):
+        if self._facet_rebuilds is not None:
+            self._facet_rebuilds.cancel()
+            try:
+                await self._facet_rebuilds
+            except asyncio.CancelledError:
+                pass
+            self._facet_rebuilds = None
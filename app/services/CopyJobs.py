@@ -0,0 +1,119 @@
+import asyncio
+import json
+from app.helpers.CopyJobs import TERMINAL_STATUSES, CopyJobNotFound
+from app.dependencies import get_blob_uploader
+
+
+class CopyJobService:
+    @property
+    def uploader(self):
+        return get_blob_uploader()
+
+    async def start_copy(self, source_url: str, container_name: str = None, folder_name: str = None,
+                         file_type: str = ".png"):
+        """
+        Start a server-side copy into blob storage and return the tracked job
+        """
+        try:
+            uploader = self.uploader
+            job = await uploader.copy_jobs.start(
+                source_url,
+                container_name or uploader.container_name,
+                uploader.copy_destination_blob_name(folder_name, file_type)
+            )
+            return {
+                "success": True,
+                "data": job.to_dict()
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+
+    async def list_copy_jobs(self, status: str = None):
+        """
+        List tracked copy jobs, newest first
+        """
+        try:
+            return {
+                "success": True,
+                "data": {
+                    "jobs": self.uploader.copy_jobs.list_jobs(status)
+                }
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+
+    async def get_copy_job(self, job_id: str, wait_seconds: float = 0):
+        """
+        Get a copy job, optionally waiting up to wait_seconds for it to finish
+        """
+        try:
+            copy_jobs = self.uploader.copy_jobs
+            job = copy_jobs.get(job_id)
+            if wait_seconds and not job.finished:
+                try:
+                    await copy_jobs.wait(job_id, wait_seconds)
+                except asyncio.TimeoutError:
+                    pass
+            return {
+                "success": True,
+                "data": job.to_dict()
+            }
+        except CopyJobNotFound:
+            return {
+                "success": False,
+                "data": None,
+                "error": "Copy job not found"
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+
+    async def abort_copy_job(self, job_id: str):
+        """
+        Abort a running copy job
+        """
+        try:
+            job = await self.uploader.copy_jobs.abort(job_id)
+            return {
+                "success": True,
+                "data": job.to_dict()
+            }
+        except CopyJobNotFound:
+            return {
+                "success": False,
+                "data": None,
+                "error": "Copy job not found"
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+
+    def copy_job_events(self, job_id: str):
+        """
+        Server-sent events stream of a job's status changes.
+        Raises CopyJobNotFound for unknown jobs.
+        """
+        copy_jobs = self.uploader.copy_jobs
+        copy_jobs.get(job_id)
+        updates = copy_jobs.subscribe(job_id)
+
+        async def events():
+            async for snapshot in updates:
+                event = "done" if snapshot["status"] in TERMINAL_STATUSES else "status"
+                yield f"event: {event}\ndata: {json.dumps(snapshot)}\n\n"
+
+        return events()
@@ -0,0 +1,413 @@
+from fastapi.concurrency import run_in_threadpool
+from app.helpers.AllocationTracker import AllocationTracker
+from app.helpers.DbMetrics import DbMetrics
+from app.helpers.Logger import Logger
+from app.helpers.LoopMonitor import LoopMonitor
+from app.helpers.RequestProfiler import RequestProfiler
+from app.helpers.TokenRevocation import RevocationList
+from app.dependencies import get_company_service, get_signin_admission
+
+
+class DiagnosticsService:
+    async def get_slow_callbacks(self, limit: int = 20):
+        """
+        Get the call sites that blocked the event loop the longest
+        """
+        try:
+            if not LoopMonitor.is_installed():
+                return {
+                    "success": False,
+                    "data": None,
+                    "error": "Slow-callback detection is disabled"
+                }
+
+            return {
+                "success": True,
+                "data": {
+                    "thresholdMs": LoopMonitor.threshold * 1000,
+                    "offenders": LoopMonitor.report(limit)
+                }
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+
+    async def reset_slow_callbacks(self):
+        """
+        Clear the aggregated slow-callback report
+        """
+        try:
+            if not LoopMonitor.is_installed():
+                return {
+                    "success": False,
+                    "data": None,
+                    "error": "Slow-callback detection is disabled"
+                }
+
+            LoopMonitor.reset()
+            return {
+                "success": True,
+                "data": {
+                    "message": "Slow-callback report cleared"
+                }
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+
+    async def get_profiles(self):
+        """
+        List the stored request profiles, newest first
+        """
+        try:
+            return {
+                "success": True,
+                "data": {
+                    "enabled": RequestProfiler.enabled,
+                    "profiles": RequestProfiler.list_profiles()
+                }
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+
+    async def get_profile(self, profile_id: str):
+        """
+        Get the full call-tree digest of a stored request profile
+        """
+        try:
+            profile = RequestProfiler.get_profile(profile_id)
+            if not profile:
+                return {
+                    "success": False,
+                    "data": None,
+                    "error": "Profile not found"
+                }
+
+            return {
+                "success": True,
+                "data": {
+                    "profile": profile
+                }
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+
+    async def get_allocation_status(self):
+        """
+        Get tracemalloc status and the stored snapshots
+        """
+        try:
+            return {
+                "success": True,
+                "data": AllocationTracker.status()
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+
+    async def start_allocation_tracing(self, frames: int = 25):
+        """
+        Start tracemalloc with the given traceback depth
+        """
+        try:
+            if AllocationTracker.is_tracing():
+                return {
+                    "success": False,
+                    "data": None,
+                    "error": "Allocation tracing is already running"
+                }
+
+            AllocationTracker.start(frames)
+            return {
+                "success": True,
+                "data": AllocationTracker.status()
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+
+    async def stop_allocation_tracing(self):
+        """
+        Stop tracemalloc, keeping stored snapshots
+        """
+        try:
+            if not AllocationTracker.is_tracing():
+                return {
+                    "success": False,
+                    "data": None,
+                    "error": "Allocation tracing is not running"
+                }
+
+            AllocationTracker.stop()
+            return {
+                "success": True,
+                "data": AllocationTracker.status()
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+
+    async def take_allocation_snapshot(self, label: str = None):
+        """
+        Take a tracemalloc snapshot and keep it for later reports
+        """
+        try:
+            if not AllocationTracker.is_tracing():
+                return {
+                    "success": False,
+                    "data": None,
+                    "error": "Allocation tracing is not running"
+                }
+
+            snapshot_id = await run_in_threadpool(AllocationTracker.take_snapshot, label)
+            return {
+                "success": True,
+                "data": {
+                    "snapshotId": snapshot_id
+                }
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+
+    async def get_allocation_top(self, snapshot_id: str, limit: int = 20, group_by: str = "module"):
+        """
+        Get the largest allocation sites of a snapshot
+        """
+        try:
+            if not AllocationTracker.has_snapshot(snapshot_id):
+                return {
+                    "success": False,
+                    "data": None,
+                    "error": "Snapshot not found"
+                }
+
+            sites = await run_in_threadpool(AllocationTracker.top, snapshot_id, limit, group_by)
+            return {
+                "success": True,
+                "data": {
+                    "snapshotId": snapshot_id,
+                    "groupBy": group_by,
+                    "sites": sites
+                }
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+
+    async def get_allocation_diff(self, base_id: str, target_id: str, limit: int = 20, group_by: str = "module"):
+        """
+        Compare two snapshots and return the largest allocation changes
+        """
+        try:
+            for snapshot_id in (base_id, target_id):
+                if not AllocationTracker.has_snapshot(snapshot_id):
+                    return {
+                        "success": False,
+                        "data": None,
+                        "error": f"Snapshot {snapshot_id} not found"
+                    }
+
+            sites = await run_in_threadpool(AllocationTracker.diff, base_id, target_id, limit, group_by)
+            return {
+                "success": True,
+                "data": {
+                    "base": base_id,
+                    "target": target_id,
+                    "groupBy": group_by,
+                    "sites": sites
+                }
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+
+    async def clear_allocation_snapshots(self):
+        """
+        Drop all stored snapshots
+        """
+        try:
+            AllocationTracker.clear_snapshots()
+            return {
+                "success": True,
+                "data": {
+                    "message": "Snapshots cleared"
+                }
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+
+    async def get_logging_stats(self):
+        """
+        Get log pipeline queue depth and dropped record count
+        """
+        try:
+            return {
+                "success": True,
+                "data": Logger.stats()
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+
+    async def get_db_round_trips(self):
+        """
+        Get the per-route histogram of MongoDB round trips per request
+        """
+        try:
+            return {
+                "success": True,
+                "data": {
+                    "routes": DbMetrics.snapshot()
+                }
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+
+    async def reset_db_round_trips(self):
+        """
+        Clear the round-trip histogram
+        """
+        try:
+            DbMetrics.reset()
+            return {
+                "success": True,
+                "data": {
+                    "message": "Round-trip metrics cleared"
+                }
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+
+    async def get_signin_admission(self):
+        """
+        Get sign-in admission counters: admitted and shed attempts, in-flight verifications
+        """
+        try:
+            return {
+                "success": True,
+                "data": get_signin_admission().stats()
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+
+    async def reset_signin_admission(self):
+        """
+        Reset the sign-in admission counters (rate limit state is kept)
+        """
+        try:
+            get_signin_admission().reset_metrics()
+            return {
+                "success": True,
+                "data": {
+                    "message": "Sign-in admission metrics cleared"
+                }
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+
+    async def get_token_revocations(self):
+        """
+        Get the local token revocation list: synced version and entry counts
+        """
+        try:
+            return {
+                "success": True,
+                "data": RevocationList.stats()
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+
+    async def get_read_coalescing(self):
+        """
+        Get company read coalescing counters: calls, database executions and calls that joined one in flight
+        """
+        try:
+            return {
+                "success": True,
+                "data": {"companies": get_company_service().reads.stats()}
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
+
+    async def reset_read_coalescing(self):
+        """
+        Reset the company read coalescing counters
+        """
+        try:
+            get_company_service().reads.reset_metrics()
+            return {
+                "success": True,
+                "data": {
+                    "message": "Read coalescing metrics cleared"
+                }
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "data": None,
+                "error": str(e)
+            }
@@ -1,25 +1,137 @@
+import asyncio
+import logging
 from datetime import datetime
-from app.helpers.Utilities import Utils
-# from app.helpers.AzureStorage import AzureBlobUploader  # Disabled: Azure blob not in use
+from PIL import Image
+from app.config import get_settings
+from app.helpers.StreamingUpload import StreamingUpload
+from app.helpers.Storage import iter_bytes
+from app.helpers.ImageProcessing import (
+    DERIVATIVE_CONTENT_TYPE, DERIVATIVE_EXTENSION, IMAGES_ROUTE, parse_edges, render_variants_async
+)
+from app.dependencies import get_derivative_cache, get_process_pool, get_profile_cache, get_storage_backend
 from bson import ObjectId
 from app.models.User import UserModel
 
+logger = logging.getLogger(__name__)
+
+PICTURE_FOLDER = "profile-pictures"
+
 class ProfileService:
     def __init__(self):
-        # self.azure_uploader = AzureBlobUploader()  # Disabled: Azure blob not in use
         self.user_model=UserModel()
+        self._renders = {}
     
-    async def change_profile_picture(self, user_id: str, file):
-        """Replace existing profile picture with a new one using the existing upload function."""
+    def _picture_edges(self):
+        settings = get_settings()
+        return tuple(sorted(set(parse_edges(settings.IMG_THUMBNAIL_SIZES)) | {settings.IMG_MAX_EDGE}))
+
+    async def _render(self, data: bytes, edges) -> dict:
+        return await render_variants_async(get_process_pool(), data, edges, get_settings().IMG_MAX_PIXELS)
+
+    async def _cache_variants(self, digest: str, variants: dict):
+        cache = get_derivative_cache()
+        await asyncio.gather(*(cache.put(digest, edge, data) for edge, data in variants.items()))
+
+    async def change_profile_picture(self, user_id: str, upload: StreamingUpload):
+        """
+        Replace a user's profile picture. The upload is downscaled to
+        IMG_MAX_EDGE and its thumbnails are rendered in the process pool; the
+        display image goes to storage under its content hash and every
+        variant is written to the derivative cache.
+        """
         try:
             if not ObjectId.is_valid(user_id):
                 return {"success": False, "data": None, "error": "Invalid ObjectId format."}
-            existing_profile = await self.profile_model.get_profile(ObjectId(user_id))
-            # Azure blob operations disabled
-            return {"success": False, "data": None, "error": "Profile picture upload is disabled"}
+            existing_profile = await self.user_model.get_user({"_id": ObjectId(user_id)})
+            if not existing_profile:
+                return {"success": False, "data": None, "error": "User not found"}
+
+            uploaded = await upload.read()
+            digest = uploaded["sha256"]
+            try:
+                variants = await self._render(uploaded["data"], self._picture_edges())
+            except (OSError, ValueError, Image.DecompressionBombError) as e:
+                logger.warning("Failed to decode profile picture: %s", e)
+                return {"success": False, "data": None, "error": "Unsupported or corrupt image file"}
+
+            storage = get_storage_backend()
+            display_edge = get_settings().IMG_MAX_EDGE
+            picture_url = await storage.save_stream(
+                iter_bytes(variants[display_edge]),
+                DERIVATIVE_EXTENSION,
+                PICTURE_FOLDER,
+                DERIVATIVE_CONTENT_TYPE,
+                file_name=digest
+            )
+            await self._cache_variants(digest, variants)
+            await self.user_model.update_user(user_id, {"profilePicture": picture_url, "updatedOn": datetime.utcnow()})
+            get_profile_cache().invalidate(user_id)
+
+            # Pictures are content addressed, so another user may share the old one
+            previous_url = existing_profile.profilePicture
+            if previous_url and previous_url != picture_url:
+                try:
+                    if not await self.user_model.get_documents_count({"profilePicture": previous_url}):
+                        await storage.delete(previous_url)
+                except Exception as e:
+                    logger.warning("Failed to delete previous profile picture: %s", e)
+
+            return {
+                "success": True,
+                "data": {
+                    "profilePicture": picture_url,
+                    "thumbnails": {
+                        str(edge): f"{IMAGES_ROUTE}/{digest}?size={edge}"
+                        for edge in sorted(variants) if edge != display_edge
+                    },
+                    "size": uploaded["size"],
+                    "sha256": digest,
+                    "contentType": DERIVATIVE_CONTENT_TYPE
+                }
+            }
         except Exception as e:
             return {"success": False, "data": None, "error": str(e)}
-        
+
+    async def get_picture_variant(self, digest: str, size: int = None):
+        """
+        Resolve a profile picture derivative to a file in the derivative cache.
+        On a miss the stored display image is re-rendered once, shared by all
+        concurrent requests for the same picture.
+        """
+        try:
+            edges = self._picture_edges()
+            size = size or get_settings().IMG_MAX_EDGE
+            if size not in edges:
+                return {"success": False, "data": None, "error": f"Unsupported size. Use one of {list(edges)}"}
+
+            cache = get_derivative_cache()
+            cached = await cache.get(digest, size)
+            if cached is None:
+                render = self._renders.get(digest)
+                if render is None:
+                    render = asyncio.ensure_future(self._rebuild_variants(digest, edges))
+                    self._renders[digest] = render
+                    render.add_done_callback(lambda _: self._renders.pop(digest, None))
+                try:
+                    await asyncio.shield(render)
+                except FileNotFoundError:
+                    return {"success": False, "data": None, "error": "Image not found"}
+                cached = await cache.get(digest, size)
+                if cached is None:
+                    return {"success": False, "data": None, "error": "Image not found"}
+
+            path, stat_result = cached
+            return {"success": True, "data": {"path": path, "stat": stat_result}}
+        except Exception as e:
+            return {"success": False, "data": None, "error": str(e)}
+
+    async def _rebuild_variants(self, digest: str, edges):
+        source = await get_storage_backend().read(f"{PICTURE_FOLDER}/{digest}{DERIVATIVE_EXTENSION}")
+        display_edge = get_settings().IMG_MAX_EDGE
+        variants = await self._render(source, [edge for edge in edges if edge != display_edge])
+        variants[display_edge] = source
+        await self._cache_variants(digest, variants)
+
     async def update_user_info(self, user_id: str, data: dict):
         """
         Update user information with enhanced validation
@@ -47,6 +159,7 @@ class ProfileService:
 
             # Update user
             updated = await self.user_model.update_user(user_id, data)
+            get_profile_cache().invalidate(user_id)
             if not updated:
                 return {
                     "success": True,
@@ -80,46 +193,40 @@ class ProfileService:
                 "error": str(e)
             }
         
-    async def get_current_user(self, token: str):
+    async def get_current_user(self, user_id: str):
         """
-        Get current user information from JWT token with enhanced validation
+        Get the current user's profile by the id from the verified token,
+        served from the profile cache when fresh
         """
         try:
-            # Decode and validate token
-            payload = Utils.decode_jwt_token(token)
-            if not payload:
-                return {
-                    "success": False,
-                    "data": None,
-                    "error": "Invalid token"
-                }
-
-            # Extract user identifiers
-            email = payload.get("email")
-            if not email:
+            if not ObjectId.is_valid(user_id):
                 return {
                     "success": False,
                     "data": None,
-                    "error": "Email missing in token"
+                    "error": "Invalid user id in token"
                 }
 
-            # Get user from database
-            user = await self.user_model.get_user({"email": email})
-            if not user:
-                return {
-                    "success": False,
-                    "data": None,
-                    "error": "User not found"
-                }
+            cache = get_profile_cache()
+            user_data = cache.get(user_id)
+            if user_data is None:
+                generation = cache.generation(user_id)
+                user = await self.user_model.get_user({"_id": ObjectId(user_id)})
+                if not user:
+                    return {
+                        "success": False,
+                        "data": None,
+                        "error": "User not found"
+                    }
 
-            # Prepare user data for response
-            user_data = user.dict()
-            user_data.pop("password", None)  # Remove sensitive data
+                # Prepare user data for response
+                user_data = user.dict()
+                user_data.pop("password", None)  # Remove sensitive data
+                cache.set(user_id, user_data, generation=generation)
 
             return {
                 "success": True,
                 "data": {
-                    "user": user_data
+                    "user": dict(user_data)
                 }
             }
         except Exception as e:
@@ -128,4 +235,3 @@ class ProfileService:
                 "data": None,
                 "error": str(e)
             }
-                 
\ No newline at end of file
@@ -0,0 +1,49 @@
+"""
+bcrypt cost benchmark.
+Reports verification latency and sign-ins per second per core at each cost
+factor, and the cost to put in BCRYPT_ROUNDS for a target verification time.
+
+    python -m benchmarks.bcrypt_cost --target-ms 250 --min-rounds 10 --max-rounds 14
+"""
+import argparse
+import time
+
+import bcrypt
+
+from app.helpers.Utilities import Utils
+
+PASSWORD = b"benchmark-password"
+
+
+def verifications_per_second(rounds: int, duration: float) -> float:
+    """Sequential verifications in one thread, i.e. throughput of one core"""
+    hashed_password = bcrypt.hashpw(PASSWORD, bcrypt.gensalt(rounds))
+    count = 0
+    started = time.perf_counter()
+    while True:
+        bcrypt.checkpw(PASSWORD, hashed_password)
+        count += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= duration:
+            return count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Target verification time")
+    parser.add_argument("--min-rounds", type=int, default=10)
+    parser.add_argument("--max-rounds", type=int, default=14)
+    parser.add_argument("--duration", type=float, default=2.0, help="Seconds to measure each cost")
+    args = parser.parse_args()
+
+    print(f"{'cost':>4}  {'verify ms':>10}  {'sign-ins/s/core':>15}")
+    for rounds in range(args.min_rounds, args.max_rounds + 1):
+        rate = verifications_per_second(rounds, args.duration)
+        print(f"{rounds:>4}  {1000 / rate:>10.1f}  {rate:>15.2f}")
+
+    chosen = Utils.calibrate_bcrypt_rounds(args.target_ms, args.min_rounds, args.max_rounds)
+    print(f"\nRecommended for a {args.target_ms:.0f} ms target on this machine: BCRYPT_ROUNDS={chosen}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Country/jurisdiction filter plans: regex vs. normalized exact match.
+Seeds a scratch collection with companies written without the normalized
+fields, runs the backfill, then prints the explain() execution stats of the
+list and count queries behind GET /api/v1/companies for both filter modes.
+
+    MONGODB_CONNECTION_STRING=mongodb://localhost:27017 DB_NAME=bench \\
+        python -m benchmarks.company_filters --companies 200000
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+COLLECTION = "companies_filter_bench"
+COUNTRIES = ["Germany", "France", "United Kingdom", "Netherlands", "Spain", "Italy", "Poland", "Sweden", "Ireland", "Cyprus"]
+
+
+def plan_stages(plan: dict) -> str:
+    plan = plan.get("queryPlan", plan)  # Slot-based engine wraps the plan
+    stages = []
+    while plan:
+        stages.append(plan["stage"])
+        plan = plan.get("inputStage")
+    return " <- ".join(stages)
+
+
+def summary(explain: dict) -> str:
+    stats = explain["executionStats"]
+    return (f"{plan_stages(explain['queryPlanner']['winningPlan']):<28} "
+            f"keys={stats['totalKeysExamined']:<8} docs={stats['totalDocsExamined']:<8} "
+            f"returned={stats['nReturned']:<6} {stats['executionTimeMillis']}ms")
+
+
+async def run(companies: int, keep: bool):
+    from app.helpers.Database import MongoDB
+    MongoDB.connect(os.getenv("MONGODB_CONNECTION_STRING"))
+
+    from app.helpers.Utilities import Utils
+    from app.models.Company import CompanyModel
+
+    model = CompanyModel(collection_name=COLLECTION)
+    collection = model.collection
+    await collection.drop()
+
+    started = time.perf_counter()
+    rng = random.Random(42)
+    batch = []
+    for index in range(companies):
+        batch.append({
+            "companyName": f"Company {index}",
+            "country": rng.choice(COUNTRIES),
+            "jurisdiction": f"Region {rng.randrange(200)}",
+        })
+        if len(batch) == 10000:
+            await collection.insert_many(batch)
+            batch = []
+    if batch:
+        await collection.insert_many(batch)
+    print(f"seeded {companies} companies in {time.perf_counter() - started:.1f}s")
+
+    await model.ensure_indexes()
+    started = time.perf_counter()
+    backfill = await model.backfill_normalized_fields()
+    print(f"backfill scanned={backfill['scanned']} updated={backfill['updated']} "
+          f"in {time.perf_counter() - started:.1f}s")
+
+    database = collection.database
+    queries = {
+        "contains": {
+            "country": {"$regex": "germany", "$options": "i"},
+            "jurisdiction": {"$regex": "region 7", "$options": "i"},
+        },
+        "exact": {
+            "countryNorm": Utils.normalize_match_value("GERMANY"),
+            "jurisdictionNorm": Utils.normalize_match_value(" Region  7 "),
+        },
+    }
+    for mode, filters in queries.items():
+        list_explain = await collection.find(filters).skip(0).limit(10).explain()
+        count_explain = await database.command(
+            "explain", {"count": COLLECTION, "query": filters}, verbosity="executionStats"
+        )
+        print(f"\nmatch={mode}")
+        print(f"  list : {summary(list_explain)}")
+        print(f"  count: {summary(count_explain)}")
+
+    if not keep:
+        await collection.drop()
+    MongoDB.client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--companies", type=int, default=200000)
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch collection")
+    args = parser.parse_args()
+    asyncio.run(run(args.companies, args.keep))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Parallel signup race check.
+Fires many concurrent signups for the same email through AuthService against
+a real MongoDB and verifies exactly one succeeds and one document exists.
+
+    MONGODB_CONNECTION_STRING=mongodb://localhost:27017 DB_NAME=race_test \\
+        python -m benchmarks.signup_race --concurrency 50
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+async def run(concurrency: int) -> bool:
+    from app.helpers.Database import MongoDB
+    MongoDB.connect(os.getenv("MONGODB_CONNECTION_STRING"))
+
+    from app.helpers.DbMetrics import track_round_trips
+    from app.models.User import UserModel
+    from app.schemas.User import CreateUserSchema
+    from app.services.Auth import AuthService
+
+    user_model = UserModel()
+    await user_model.ensure_indexes()
+    email = f"race-{int(time.time() * 1000)}@example.com"
+    user_data = CreateUserSchema(fullName="Race Test", email=email, password="race-password")
+    service = AuthService()
+
+    async def signup():
+        with track_round_trips() as stats:
+            result = await service.signup(user_data)
+        return result, stats.round_trips
+
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(signup() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    succeeded = sum(1 for result, _ in outcomes if result["success"])
+    duplicates = sum(1 for result, _ in outcomes if result.get("error") == "User Already Exists.")
+    max_round_trips = max(round_trips for _, round_trips in outcomes)
+    stored = await user_model.get_documents_count({"email": email})
+    await user_model.collection.delete_many({"email": email})
+    MongoDB.client.close()
+
+    print(f"{concurrency} parallel signups in {elapsed:.2f}s")
+    print(f"succeeded={succeeded} rejected_as_duplicate={duplicates} documents={stored} "
+          f"max_round_trips_per_signup={max_round_trips}")
+    ok = succeeded == 1 and stored == 1 and duplicates == concurrency - 1 and max_round_trips == 1
+    print("OK" if ok else "FAILED")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    raise SystemExit(0 if asyncio.run(run(args.concurrency)) else 1)
+
+
+if __name__ == "__main__":
+    main()